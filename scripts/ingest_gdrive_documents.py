@@ -76,8 +76,9 @@ def load_ontology_from_template(template_name: str) -> Tuple[List[Type[BaseModel
         module_name = f"src.ontology_templates.{template_name}_ontology"
         ontology_module = importlib.import_module(module_name)
         
-        nodes = getattr(ontology_module, "NODES", [])
-        relationships = getattr(ontology_module, "RELATIONSHIPS", [])
+        # The template modules declare their types as tuples; callers get lists as before
+        nodes = list(getattr(ontology_module, "NODES", []))
+        relationships = list(getattr(ontology_module, "RELATIONSHIPS", []))
         
         if not nodes and not relationships:
             logger.warning(f"Ontology template '{template_name}' loaded, but NODES or RELATIONSHIPS lists are empty or missing. Please review the template file '{template_name}_ontology.py'.")
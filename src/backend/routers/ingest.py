@@ -12,7 +12,8 @@ from src.ingestion.orchestrator import IngestionOrchestrator
 router = APIRouter()
 
 # The IngestionOrchestrator will be initialized on-demand within each endpoint
-# to avoid requiring all environment variables to be set at server startup.
+# to avoid requiring all environment variables to be set at server startup,
+# and closed when the request finishes so its worker threads are released.
 
 class GDriveIngestionRequest(BaseModel):
     folder_id: str
@@ -23,6 +24,7 @@ class YouTubeIngestionRequest(BaseModel):
 @router.post("/ingest/document")
 async def ingest_document(file: UploadFile = File(...)):
     """Receives a local document, saves it temporarily, and ingests it via the orchestrator."""
+    orchestrator = None
     try:
         orchestrator = IngestionOrchestrator()
         # Use a temporary file to handle the upload, ensuring it's available for parsing
@@ -48,6 +50,8 @@ async def ingest_document(file: UploadFile = File(...)):
         logger.exception(f"An unexpected error occurred during ingestion for document {file.filename}")
         raise HTTPException(status_code=500, detail={"message": "An unexpected server error occurred", "error": str(e)})
     finally:
+        if orchestrator is not None:
+            orchestrator.close()
         # Clean up the temporary file
         if 'tmp_path' in locals() and os.path.exists(tmp_path):
             os.unlink(tmp_path)
@@ -57,6 +61,7 @@ async def ingest_document(file: UploadFile = File(...)):
 async def ingest_gdrive_documents(request_data: GDriveIngestionRequest = Body(...)):
     """Receives a GDrive folder ID and ingests its contents via the orchestrator."""
     logger.info(f"Received request to ingest from Google Drive folder: {request_data.folder_id}")
+    orchestrator = None
     try:
         orchestrator = IngestionOrchestrator()
         # The orchestrator now handles the entire GDrive logic
@@ -74,11 +79,15 @@ async def ingest_gdrive_documents(request_data: GDriveIngestionRequest = Body(..
     except Exception as e:
         logger.exception(f"An unexpected error occurred during GDrive ingestion for folder {request_data.folder_id}")
         raise HTTPException(status_code=500, detail={"message": "An unexpected server error occurred", "error": str(e)})
+    finally:
+        if orchestrator is not None:
+            orchestrator.close()
 
 @router.post("/ingest/youtube")
 async def ingest_youtube_transcript(request_data: YouTubeIngestionRequest = Body(...)):
     """Receives a YouTube URL and ingests its transcript via the orchestrator."""
     logger.info(f"Received request to ingest from YouTube URL: {request_data.youtube_url}")
+    orchestrator = None
     try:
         orchestrator = IngestionOrchestrator()
         result = await orchestrator.run_youtube_ingestion(youtube_url=request_data.youtube_url)
@@ -95,3 +104,6 @@ async def ingest_youtube_transcript(request_data: YouTubeIngestionRequest = Body
     except Exception as e:
         logger.exception(f"An unexpected error occurred during YouTube ingestion for URL {request_data.youtube_url}")
         raise HTTPException(status_code=500, detail={"message": "An unexpected server error occurred", "error": str(e)})
+    finally:
+        if orchestrator is not None:
+            orchestrator.close()
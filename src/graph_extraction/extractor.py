@@ -1,8 +1,9 @@
 # src/graph_extraction/extractor.py
 import uuid
 import asyncio
+import functools
 import logging # Added for logging
-from typing import List, Type, Dict, Any
+from typing import List, Type, Dict, Any, Tuple
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -25,6 +26,51 @@ logger = logging.getLogger(__name__) # Added
 import inspect
 from loguru import logger
 
+
+@functools.lru_cache(maxsize=32)
+def _build_prompt_ontology(ontology: Tuple[Type[BaseModel], ...]) -> Dict[str, Type[BaseModel]]:
+    """
+    Builds the name -> type mapping passed to Graphiti, with minimal __doc__ strings
+    to avoid bloating LLM prompts.
+
+    Creating the subclasses makes pydantic rebuild each model's schema, so the result
+    is cached per ontology and reused across extract calls.
+    """
+    temp_dict = {}
+    for model_type in ontology:
+        # Create a new, temporary type that inherits from the original model_type
+        # but has a minimal __doc__ string (just the class name).
+        temp_model = type(
+            model_type.__name__,
+            (model_type,),
+            {'__doc__': model_type.__name__}
+        )
+        temp_dict[model_type.__name__] = temp_model
+    return temp_dict
+
+
+@functools.lru_cache(maxsize=32)
+def _type_map(ontology: Tuple[Type[BaseModel], ...]) -> Dict[str, Type[BaseModel]]:
+    """Returns the name -> type mapping of an ontology, computed once per ontology tuple."""
+    return {model_type.__name__: model_type for model_type in ontology}
+
+
+@functools.lru_cache(maxsize=4)
+def get_graph_extractor(neo4j_uri: str, neo4j_user: str, neo4j_pass: str, model_id: str) -> "GraphExtractor":
+    """
+    Returns a GraphExtractor shared across callers with the same connection and model.
+
+    Each extractor owns a Graphiti instance (and its Neo4j driver) plus Gemini clients,
+    so reusing it avoids re-establishing those connections for every orchestrator.
+    """
+    return GraphExtractor(
+        neo4j_uri=neo4j_uri,
+        neo4j_user=neo4j_user,
+        neo4j_pass=neo4j_pass,
+        pro_model_config=GeminiModelInstanceConfig(model_id=model_id)
+    )
+
+
 class GraphExtractor:
     """
     Orchestrates the knowledge graph extraction process using graphiti-core.
@@ -131,22 +177,9 @@ class GraphExtractor:
         logger.info(f"Starting graph extraction for group_id: {group_id} with prefix: {episode_name_prefix}")
 
         # Create dictionaries for entity and edge types with minimal __doc__ strings
-        # to avoid bloating LLM prompts.
-        def create_temp_ontology_dict(ontology_list: List[Type[BaseModel]]) -> dict:
-            temp_dict = {}
-            for model_type in ontology_list:
-                # Create a new, temporary type that inherits from the original model_type
-                # but has a minimal __doc__ string (just the class name).
-                temp_model = type(
-                    model_type.__name__,
-                    (model_type,),
-                    {'__doc__': model_type.__name__}
-                )
-                temp_dict[model_type.__name__] = temp_model
-            return temp_dict
-
-        entity_types_dict = create_temp_ontology_dict(ontology_nodes)
-        edge_types_dict = create_temp_ontology_dict(ontology_edges)
+        # to avoid bloating LLM prompts. Copies keep the cached mappings untouched.
+        entity_types_dict = dict(_build_prompt_ontology(tuple(ontology_nodes)))
+        edge_types_dict = dict(_build_prompt_ontology(tuple(ontology_edges)))
 
         logger.debug(f"Ontology Node Types for extraction: {list(entity_types_dict.keys())}")
         logger.debug(f"Ontology Edge Types for extraction: {list(edge_types_dict.keys())}")
@@ -162,7 +195,7 @@ class GraphExtractor:
             self.ontology_entity_types = ontology_nodes
             self.ontology_edge_types = ontology_edges
             # For compatibility, we still store the edge map separately if needed elsewhere
-            self.ontology_edge_type_map = {edge_model.__name__: edge_model for edge_model in ontology_edges}
+            self.ontology_edge_type_map = _type_map(tuple(ontology_edges))
 
             # Add retry logic for NoneType errors
             max_retries = 1  # Try once more after initial failure
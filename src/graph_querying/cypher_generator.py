@@ -2,6 +2,7 @@
 Handles the generation of Cypher queries from natural language using Google Gemini LLM
 with structured output.
 """
+import functools
 import os
 import json
 from google import genai # Main SDK import
@@ -35,6 +36,16 @@ class CypherGenerationError(Exception):
     """Custom exception for errors during Cypher generation."""
     pass
 
+@functools.lru_cache(maxsize=1)
+def get_genai_client() -> genai.Client:
+    """
+    Returns the google-genai client shared by all Cypher generation calls.
+
+    Creating a client resolves credentials (ADC or API key) and sets up its own
+    connection pool, so it is built once per process rather than per query.
+    """
+    return genai.Client(http_options=HttpOptions(api_version="v1"))
+
 def load_config(model_type: str = "pro") -> tuple[str, int]:
     """Loads model ID and thinking budget from config.yaml for the given model type."""
     config_path = Path(__file__).resolve().parent.parent.parent / "config.yaml"
@@ -177,7 +188,7 @@ class CypherQueryResult(BaseModel):
     print(f"Using model configuration: '{model_config_key}' (ID: {effective_model_name}, Budget: {thinking_budget})")
 
     try:
-        client = genai.Client(http_options=HttpOptions(api_version="v1"))
+        client = get_genai_client()
 
         gen_config_params = {"response_mime_type": "application/json"}
         if thinking_budget > 0:
@@ -5,8 +5,9 @@ instead of manually crafting Cypher queries.
 """
 import os
 import asyncio
+import functools
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 import dotenv
 from loguru import logger
 
@@ -28,10 +29,25 @@ from graphiti_core.search.search_config_recipes import (
     COMBINED_HYBRID_SEARCH_CROSS_ENCODER
 )
 from graphiti_core.search.search_filters import SearchFilters
-from utils.embedding import CustomGeminiEmbedding
+from utils.embedding import get_embedding_model
 from utils.config import Config
 from graphiti_core.edges import EntityEdge
 from graphiti_core.nodes import EntityNode
+from src.graph_querying.semantic_cache import SemanticSearchCache
+
+# Loaded once at import; searchers are created per request by the API routers
+dotenv.load_dotenv()
+
+
+@functools.lru_cache(maxsize=None)
+def get_search_cache(neo4j_uri: str) -> SemanticSearchCache:
+    """
+    Returns the search result cache shared by every searcher on the same database.
+
+    Searchers are created per request, so a per-instance cache would be dropped
+    before it could ever serve a repeated query.
+    """
+    return SemanticSearchCache(max_entries=1000, similarity_threshold=0.97, ttl_seconds=300.0)
 
 
 class GraphitiNativeSearcher:
@@ -41,8 +57,6 @@ class GraphitiNativeSearcher:
     """
     
     def __init__(self):
-        dotenv.load_dotenv()
-        
         # Neo4j connection parameters
         self.neo4j_uri = os.getenv('NEO4J_URI')
         self.neo4j_user = os.getenv('NEO4J_USERNAME')
@@ -59,6 +73,9 @@ class GraphitiNativeSearcher:
             raise ValueError("GOOGLE_CLOUD_PROJECT must be set for Vertex AI authentication")
         
         self.graphiti = None
+        # Repeated and near-duplicate queries are served from memory for a few minutes,
+        # across all searchers connected to the same database
+        self.search_cache = get_search_cache(self.neo4j_uri)
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -74,8 +91,9 @@ class GraphitiNativeSearcher:
         )
         llm_client = GeminiClient(config=llm_config)
         
-        # Initialize custom embedding client (same as used in ingestion)
-        self.embedding_client = CustomGeminiEmbedding(
+        # Custom embedding client (same as used in ingestion), shared across searchers
+        # so every request reuses one genai.Client and its connection pool
+        self.embedding_client = get_embedding_model(
             model_name="gemini-embedding-001",  # Use same model as ingestion
             output_dimensionality=1536  # Match existing database dimensions
         )
@@ -104,6 +122,36 @@ class GraphitiNativeSearcher:
         if self.graphiti:
             await self.graphiti.close()
     
+    async def _lookup_cache(self, namespace: str, query: str) -> Tuple[Optional[Dict[str, Any]], Optional[List[float]]]:
+        """
+        Check the search cache for a query, embedding it only if the exact lookup misses.
+        
+        The embedding is requested asynchronously, so concurrent searches do not block
+        the event loop and their query embeddings are coalesced into batched API calls.
+        
+        Args:
+            namespace: Cache namespace identifying the search method and its parameters
+            query: Search query string
+            
+        Returns:
+            Tuple of (cached result or None, query embedding or None if never computed)
+        """
+        cached = self.search_cache.get_exact(namespace, query)
+        if cached is not None:
+            logger.info(f"Exact cache hit for query: '{query}'")
+            return dict(cached, query=query), None
+        
+        # Generate custom 1536-dimensional embedding for the query
+        query_embedding = await self.embedding_client._aget_query_embedding(query)
+        logger.info(f"Generated {len(query_embedding)}-dimensional query embedding")
+        
+        cached = self.search_cache.get_similar(namespace, query_embedding)
+        if cached is not None:
+            logger.info(f"Semantic cache hit for query: '{query}'")
+            return dict(cached, query=query), query_embedding
+        
+        return None, query_embedding
+    
     async def hybrid_search(
         self, 
         query: str, 
@@ -122,9 +170,10 @@ class GraphitiNativeSearcher:
         try:
             logger.info(f"Starting hybrid search for query: '{query}'")
             
-            # Generate custom 1536-dimensional embedding for the query
-            query_embedding = self.embedding_client._get_query_embedding(query)
-            logger.info(f"Generated {len(query_embedding)}-dimensional query embedding")
+            cache_namespace = f"hybrid_search:{num_results}"
+            cached, query_embedding = await self._lookup_cache(cache_namespace, query)
+            if cached is not None:
+                return cached
             
             # Prepare search configuration for internal search
             core_clients = self.graphiti.clients
@@ -167,12 +216,14 @@ class GraphitiNativeSearcher:
                 }
                 formatted_results.append(result)
             
-            return {
+            response = {
                 'query': query,
                 'num_results': len(formatted_results),
                 'custom_embedding_dim': len(query_embedding),
                 'results': formatted_results
             }
+            self.search_cache.put(cache_namespace, query, query_embedding, response)
+            return response
             
         except Exception as e:
             logger.error(f"Error in hybrid search: {str(e)}")
@@ -200,9 +251,10 @@ class GraphitiNativeSearcher:
             if center_node_uuid:
                 logger.info(f"Using center node UUID: {center_node_uuid}")
             
-            # Generate custom 1536-dimensional embedding for the query
-            query_embedding = self.embedding_client._get_query_embedding(query)
-            logger.info(f"Generated {len(query_embedding)}-dimensional query embedding")
+            cache_namespace = f"entity_focused_search:{center_node_uuid}:{num_results}"
+            cached, query_embedding = await self._lookup_cache(cache_namespace, query)
+            if cached is not None:
+                return cached
             
             # Use Graphiti's search method with center node for reranking
             # Note: We don't pass query_vector here as it's not supported
@@ -230,13 +282,15 @@ class GraphitiNativeSearcher:
                 }
                 formatted_results.append(result)
             
-            return {
+            response = {
                 'query': query,
                 'center_node_uuid': center_node_uuid,
                 'num_results': len(formatted_results),
                 'custom_embedding_dim': len(query_embedding),
                 'results': formatted_results
             }
+            self.search_cache.put(cache_namespace, query, query_embedding, response)
+            return response
             
         except Exception as e:
             logger.error(f"Error in entity-focused search: {str(e)}")
@@ -262,9 +316,10 @@ class GraphitiNativeSearcher:
         try:
             logger.info(f"Starting advanced search with recipe '{recipe_name}' for query: '{query}'")
             
-            # Generate custom 1536-dimensional embedding for the query
-            query_embedding = self.embedding_client._get_query_embedding(query)
-            logger.info(f"Generated {len(query_embedding)}-dimensional query embedding")
+            cache_namespace = f"advanced_search:{recipe_name}:{num_results}"
+            cached, query_embedding = await self._lookup_cache(cache_namespace, query)
+            if cached is not None:
+                return cached
             
             # Select search configuration based on recipe name
             if recipe_name == "edge_hybrid":
@@ -319,7 +374,7 @@ class GraphitiNativeSearcher:
                 }
                 formatted_nodes.append(result)
             
-            return {
+            response = {
                 'query': query,
                 'recipe': recipe_name,
                 'custom_embedding_dim': len(query_embedding),
@@ -328,6 +383,8 @@ class GraphitiNativeSearcher:
                 'num_edges': len(formatted_edges),
                 'num_nodes': len(formatted_nodes)
             }
+            self.search_cache.put(cache_namespace, query, query_embedding, response)
+            return response
             
         except Exception as e:
             logger.error(f"Error in advanced search with recipe: {str(e)}")
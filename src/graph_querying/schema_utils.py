@@ -14,8 +14,8 @@ try:
 except ImportError:
     # This allows the module to be imported in environments where the full project structure isn't available,
     # e.g., for unit testing components in isolation, though get_ontology_schema_string will fail.
-    NODES = []
-    RELATIONSHIPS = [] 
+    NODES = ()
+    RELATIONSHIPS = ()
 
 def _get_field_type_str(field_info: FieldInfo) -> str:
     """Helper function to get a string representation of a Pydantic field's type."""
@@ -0,0 +1,136 @@
+"""
+Semantic cache for search results.
+
+Lookups first try an exact match on the cache key, which avoids computing a
+query embedding at all, and then fall back to a cosine-similarity scan over the
+embeddings of recently cached queries so near-duplicate phrasings are served
+from memory instead of hitting Neo4j again.
+"""
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from loguru import logger
+
+from utils.sim import int8_cosine_scores, l2_normalize, quantize_int8
+
+
+class SemanticSearchCache:
+    """
+    Bounded, TTL-based cache keyed by exact query key and by query embedding.
+
+    Embeddings are stored L2-normalized and int8-quantized (with a per-row scale) in a
+    preallocated matrix used as a ring buffer, so a similarity lookup is a single
+    matrix-vector product over a quarter of the float32 footprint.
+    Entries are partitioned by namespace (e.g. search method and its parameters)
+    so results for different search configurations never satisfy each other.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        similarity_threshold: float = 0.97,
+        ttl_seconds: float = 300.0
+    ):
+        """
+        Args:
+            max_entries: Maximum number of cached results; the oldest entry is evicted first.
+            similarity_threshold: Minimum cosine similarity for a semantic hit.
+            ttl_seconds: How long an entry stays valid after insertion.
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+
+        self._matrix: Optional[np.ndarray] = None  # Allocated on first put, once the dimension is known
+        self._scales = np.ones(max_entries, dtype=np.float32)
+        self._expires_at = np.zeros(max_entries, dtype=np.float64)
+        self._namespace_ids = np.full(max_entries, -1, dtype=np.int32)
+        self._namespaces: Dict[str, int] = {}
+        self._keys: List[Optional[str]] = [None] * max_entries
+        self._values: List[Any] = [None] * max_entries
+        self._slots_by_key: Dict[str, int] = {}
+        self._next_slot = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._slots_by_key)
+
+    def clear(self) -> None:
+        """Drops every cached entry."""
+        self._expires_at.fill(0.0)
+        self._namespace_ids.fill(-1)
+        self._keys = [None] * self.max_entries
+        self._values = [None] * self.max_entries
+        self._slots_by_key.clear()
+        self._next_slot = 0
+        self._size = 0
+
+    def get_exact(self, namespace: str, key: str) -> Optional[Any]:
+        """Returns the cached value for an exact key match, or None."""
+        slot = self._slots_by_key.get(self._full_key(namespace, key))
+        if slot is None or self._expires_at[slot] < time.monotonic():
+            return None
+        return self._values[slot]
+
+    def get_similar(self, namespace: str, embedding: Sequence[float]) -> Optional[Any]:
+        """Returns the cached value whose embedding is most similar to `embedding`, if above threshold."""
+        namespace_id = self._namespaces.get(namespace)
+        if namespace_id is None or self._matrix is None or self._size == 0:
+            return None
+
+        query = self._normalize(embedding)
+        if query is None or query.shape[0] != self._matrix.shape[1]:
+            return None
+
+        query_int8, query_scale = quantize_int8(query)
+        similarities = int8_cosine_scores(self._matrix[:self._size], self._scales[:self._size], query_int8, float(query_scale))
+        valid = (self._namespace_ids[:self._size] == namespace_id) & (self._expires_at[:self._size] >= time.monotonic())
+        similarities[~valid] = -np.inf
+
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+        logger.debug(f"Semantic cache hit in '{namespace}' with similarity {similarities[best]:.4f}")
+        return self._values[best]
+
+    def put(self, namespace: str, key: str, embedding: Sequence[float], value: Any) -> None:
+        """Caches `value` under both the exact key and the query embedding."""
+        query = self._normalize(embedding)
+        if query is None:
+            return
+        if self._matrix is None:
+            self._matrix = np.zeros((self.max_entries, query.shape[0]), dtype=np.int8)
+        elif query.shape[0] != self._matrix.shape[1]:
+            logger.warning(
+                f"Not caching result: embedding dimension {query.shape[0]} does not match cache dimension {self._matrix.shape[1]}"
+            )
+            return
+
+        full_key = self._full_key(namespace, key)
+        slot = self._slots_by_key.get(full_key)
+        if slot is None:
+            slot = self._next_slot
+            self._next_slot = (self._next_slot + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+            evicted_key = self._keys[slot]
+            if evicted_key is not None:
+                self._slots_by_key.pop(evicted_key, None)
+
+        self._matrix[slot], self._scales[slot] = quantize_int8(query)
+        self._expires_at[slot] = time.monotonic() + self.ttl_seconds
+        self._namespace_ids[slot] = self._namespaces.setdefault(namespace, len(self._namespaces))
+        self._keys[slot] = full_key
+        self._values[slot] = value
+        self._slots_by_key[full_key] = slot
+
+    @staticmethod
+    def _full_key(namespace: str, key: str) -> str:
+        return f"{namespace}\x00{key}"
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.ndim != 1 or not vector.any():
+            return None
+        return l2_normalize(vector)
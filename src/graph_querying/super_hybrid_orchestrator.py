@@ -7,7 +7,7 @@ from loguru import logger
 
 from utils.config_models import ChromaDBConfig
 from utils.chroma_ingester import ChromaIngester
-from utils.embedding import CustomGeminiEmbedding
+from utils.embedding import get_embedding_model
 from src.graph_querying.graphiti_native_search import GraphitiNativeSearcher
 
 class SuperHybridOrchestrator:
@@ -22,7 +22,7 @@ class SuperHybridOrchestrator:
         try:
             # Load only the configuration needed for this orchestrator
             chroma_config = ChromaDBConfig()
-            embedding_model = CustomGeminiEmbedding()
+            embedding_model = get_embedding_model()
             
             # Initialize ChromaDB client via ChromaIngester
             self.chroma_ingester = ChromaIngester(chroma_config, embedding_model)
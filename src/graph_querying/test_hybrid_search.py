@@ -5,9 +5,11 @@ This verifies that the hybrid search pipeline works end-to-end.
 """
 
 import asyncio
+import json
 import logging
 import sys
 import os
+import time
 from pathlib import Path
 
 # Add src to path for imports
@@ -21,6 +23,156 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+
+    def dump_payload(payload) -> str:
+        return orjson.dumps(payload, default=str).decode()
+except ImportError:
+    def dump_payload(payload) -> str:
+        return json.dumps(payload, default=str)
+
+# Upper bound on queries in flight, to stay within the Graphiti/Neo4j connection pool
+MAX_CONCURRENT_QUERIES = 5
+# Sustained search calls per second (each call embeds the query with Gemini)
+MAX_SEARCHES_PER_SECOND = 5.0
+
+
+class AsyncRateLimiter:
+    """
+    Token-bucket rate limiter usable as `async with limiter:`.
+
+    Allows bursts of up to `max_rate` calls and refills at `max_rate` per `time_period`
+    seconds, so calls only wait when they would actually exceed the quota.
+    """
+
+    def __init__(self, max_rate: float, time_period: float = 1.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = max_rate
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.max_rate, self._tokens + elapsed * self.max_rate / self.time_period)
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        # The lock makes waiters take tokens in arrival order
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) * self.time_period / self.max_rate)
+                self._refill()
+            self._tokens -= 1
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class QueryLogAdapter(logging.LoggerAdapter):
+    """Prefixes log lines with the test number so interleaved concurrent output stays readable."""
+
+    def process(self, msg, kwargs):
+        return f"[TEST {self.extra['test']}] {msg}", kwargs
+
+
+async def run_one(
+    i: int,
+    query: str,
+    searcher: GraphitiNativeSearcher,
+    semaphore: asyncio.Semaphore,
+    limiter: AsyncRateLimiter
+):
+    """Run the hybrid, recipe and entity-focused searches for a single test query."""
+    log = QueryLogAdapter(logger, {"test": i})
+    
+    async with semaphore:
+        log.info("=" * 80)
+        log.info("TEST %d: %s", i, query)
+        log.info("=" * 80)
+        
+        try:
+            # Test 1: Standard hybrid search
+            log.info("--- Standard Hybrid Search ---")
+            async with limiter:
+                hybrid_results = await searcher.hybrid_search(query, num_results=5)
+            
+            log.info("Query: %s", hybrid_results['query'])
+            log.info("Custom embedding dimensionality: %s", hybrid_results['custom_embedding_dim'])
+            log.info("Number of results: %s", hybrid_results['num_results'])
+            # Full payloads are only serialized when DEBUG is on
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Hybrid search payload: %s", dump_payload(hybrid_results))
+            
+            # The per-result listings are skipped entirely when INFO is disabled
+            verbose = log.isEnabledFor(logging.INFO)
+            if verbose and hybrid_results['results']:
+                log.info("Top results:")
+                for j, result in enumerate(hybrid_results['results'][:3], 1):
+                    log.info("  %d. %s", j, result['fact'])
+                    log.info("     UUID: %s", result['uuid'])
+                    log.info("     Valid: %s to %s", result['valid_at'], result['invalid_at'])
+            elif verbose:
+                log.info("No results found for hybrid search")
+            
+            # Test 2: Advanced search with recipe
+            log.info("--- Advanced Search with Recipe ---")
+            async with limiter:
+                advanced_results = await searcher.advanced_search_with_recipe(
+                    query, 
+                    recipe_name="combined_hybrid", 
+                    num_results=3
+                )
+            
+            log.info("Recipe: %s", advanced_results['recipe'])
+            log.info("Custom embedding dimensionality: %s", advanced_results['custom_embedding_dim'])
+            log.info("Edges found: %s", advanced_results['num_edges'])
+            log.info("Nodes found: %s", advanced_results['num_nodes'])
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Advanced search payload: %s", dump_payload(advanced_results))
+            
+            if verbose and advanced_results['edges']:
+                log.info("Top edge results:")
+                for j, edge in enumerate(advanced_results['edges'][:2], 1):
+                    log.info("  %d. %s", j, edge['fact'])
+            
+            if verbose and advanced_results['nodes']:
+                log.info("Top node results:")
+                for j, node in enumerate(advanced_results['nodes'][:2], 1):
+                    log.info("  %d. %s: %s", j, node['name'], node['summary'])
+            
+            # Test 3: Entity-focused search (if we have results from previous searches)
+            if advanced_results['nodes']:
+                log.info("--- Entity-Focused Search ---")
+                center_node_uuid = advanced_results['nodes'][0]['uuid']
+                
+                async with limiter:
+                    entity_results = await searcher.entity_focused_search(
+                        query, 
+                        center_node_uuid=center_node_uuid, 
+                        num_results=3
+                    )
+                
+                log.info("Center node UUID: %s", entity_results['center_node_uuid'])
+                log.info("Entity-focused results: %s", entity_results['num_results'])
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug("Entity-focused payload: %s", dump_payload(entity_results))
+                
+                if verbose and entity_results['results']:
+                    log.info("Entity-focused facts:")
+                    for j, result in enumerate(entity_results['results'], 1):
+                        log.info("  %d. %s", j, result['fact'])
+            
+        except Exception as e:
+            log.error("Error testing query '%s': %s", query, e)
+
 async def test_hybrid_search():
     """Test the hybrid search functionality with various queries."""
     
@@ -38,80 +190,19 @@ async def test_hybrid_search():
         async with GraphitiNativeSearcher() as searcher:
             logger.info("Successfully initialized GraphitiNativeSearcher")
             
-            for i, query in enumerate(test_queries, 1):
-                logger.info(f"\n{'='*80}")
-                logger.info(f"TEST {i}: {query}")
-                logger.info(f"{'='*80}")
-                
-                try:
-                    # Test 1: Standard hybrid search
-                    logger.info("\n--- Standard Hybrid Search ---")
-                    hybrid_results = await searcher.hybrid_search(query, num_results=5)
-                    
-                    logger.info(f"Query: {hybrid_results['query']}")
-                    logger.info(f"Custom embedding dimensionality: {hybrid_results['custom_embedding_dim']}")
-                    logger.info(f"Number of results: {hybrid_results['num_results']}")
-                    
-                    if hybrid_results['results']:
-                        logger.info("Top results:")
-                        for j, result in enumerate(hybrid_results['results'][:3], 1):
-                            logger.info(f"  {j}. {result['fact']}")
-                            logger.info(f"     UUID: {result['uuid']}")
-                            logger.info(f"     Valid: {result['valid_at']} to {result['invalid_at']}")
-                    else:
-                        logger.info("No results found for hybrid search")
-                    
-                    # Test 2: Advanced search with recipe
-                    logger.info("\n--- Advanced Search with Recipe ---")
-                    advanced_results = await searcher.advanced_search_with_recipe(
-                        query, 
-                        recipe_name="combined_hybrid", 
-                        num_results=3
-                    )
-                    
-                    logger.info(f"Recipe: {advanced_results['recipe']}")
-                    logger.info(f"Custom embedding dimensionality: {advanced_results['custom_embedding_dim']}")
-                    logger.info(f"Edges found: {advanced_results['num_edges']}")
-                    logger.info(f"Nodes found: {advanced_results['num_nodes']}")
-                    
-                    if advanced_results['edges']:
-                        logger.info("Top edge results:")
-                        for j, edge in enumerate(advanced_results['edges'][:2], 1):
-                            logger.info(f"  {j}. {edge['fact']}")
-                    
-                    if advanced_results['nodes']:
-                        logger.info("Top node results:")
-                        for j, node in enumerate(advanced_results['nodes'][:2], 1):
-                            logger.info(f"  {j}. {node['name']}: {node['summary']}")
-                    
-                    # Test 3: Entity-focused search (if we have results from previous searches)
-                    if advanced_results['nodes']:
-                        logger.info("\n--- Entity-Focused Search ---")
-                        center_node_uuid = advanced_results['nodes'][0]['uuid']
-                        
-                        entity_results = await searcher.entity_focused_search(
-                            query, 
-                            center_node_uuid=center_node_uuid, 
-                            num_results=3
-                        )
-                        
-                        logger.info(f"Center node UUID: {entity_results['center_node_uuid']}")
-                        logger.info(f"Entity-focused results: {entity_results['num_results']}")
-                        
-                        if entity_results['results']:
-                            logger.info("Entity-focused facts:")
-                            for j, result in enumerate(entity_results['results'], 1):
-                                logger.info(f"  {j}. {result['fact']}")
-                    
-                except Exception as e:
-                    logger.error(f"Error testing query '{query}': {str(e)}")
-                    continue
-                
-                # Add a small delay between queries
-                await asyncio.sleep(1)
+            # Run all queries concurrently; wall time is bounded by the slowest query
+            # rather than the sum of all of them.
+            # The semaphore bounds queries in flight; the limiter paces the search calls
+            # to the API quota without a fixed delay between them.
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+            limiter = AsyncRateLimiter(MAX_SEARCHES_PER_SECOND)
+            await asyncio.gather(*[
+                run_one(i, query, searcher, semaphore, limiter)
+                for i, query in enumerate(test_queries, 1)
+            ])
     
     except Exception as e:
-        logger.error(f"Failed to initialize or run tests: {str(e)}")
+        logger.error("Failed to initialize or run tests: %s", e)
         raise
 
 async def test_embedding_compatibility():
@@ -127,10 +218,10 @@ async def test_embedding_compatibility():
             test_text = "This is a test query for embedding generation"
             embedding = searcher.embedding_client._get_text_embedding(test_text)
             
-            logger.info(f"Test text: {test_text}")
-            logger.info(f"Generated embedding dimensionality: {len(embedding)}")
-            logger.info(f"Expected dimensionality: 1536")
-            logger.info(f"Embedding compatibility: {'✓ PASS' if len(embedding) == 1536 else '✗ FAIL'}")
+            logger.info("Test text: %s", test_text)
+            logger.info("Generated embedding dimensionality: %d", len(embedding))
+            logger.info("Expected dimensionality: 1536")
+            logger.info("Embedding compatibility: %s", '✓ PASS' if len(embedding) == 1536 else '✗ FAIL')
             
             if len(embedding) != 1536:
                 logger.error("Embedding dimensionality mismatch! This will cause Neo4j vector search errors.")
@@ -140,7 +231,7 @@ async def test_embedding_compatibility():
             return True
             
     except Exception as e:
-        logger.error(f"Embedding compatibility test failed: {str(e)}")
+        logger.error("Embedding compatibility test failed: %s", e)
         return False
 
 async def main():
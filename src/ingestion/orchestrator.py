@@ -2,28 +2,36 @@
 # Main orchestrator for the modular ingestion pipeline.
 
 from loguru import logger
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional
 
-from src.ingestion.pipeline import IngestionPipeline, IngestionStep
+from src.ingestion.pipeline import IngestionPipeline, IngestionStep, ParallelSteps
+from src.ingestion.result_cache import IngestionResultCache, hash_file
 from utils.config_loader import get_config
 from utils.config_models import IngestionOrchestratorConfig
-from utils.embedding import CustomGeminiEmbedding
+from utils.embedding import get_embedding_model
 from utils.chroma_ingester import ChromaIngester
-from utils.neo4j_ingester import Neo4jIngester
-from src.graph_extraction.extractor import GraphExtractor
+from utils.neo4j_ingester import Neo4jIngester, get_neo4j_driver
+from src.graph_extraction.extractor import get_graph_extractor
 from src.ingestion.steps import (
     LoadDocumentsFromGDrive, 
     ParseDocuments, 
     ExtractGraph, 
     IngestToChromaDB, 
     IngestToNeo4j,
-    GetYoutubeTranscript,
-    ChunkDocument
+    GetYoutubeTranscript
 )
 from src.ontology_templates.universal_ontology import NODES as UniversalNodes, RELATIONSHIPS as UniversalRelationships
 from llama_index.core.schema import Document as LlamaDocument
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import asyncio
+import os
+import tempfile
 import uuid
 
+# Upper bound on concurrent Neo4j write transactions issued by a single orchestrator.
+NEO4J_WRITE_WORKERS = min(4, os.cpu_count() or 1)
+
 class IngestionOrchestrator:
     """
     Configures and runs ingestion pipelines based on the application's configuration.
@@ -33,91 +41,136 @@ class IngestionOrchestrator:
         """Initializes the orchestrator with necessary configurations."""
         logger.info("Initializing IngestionOrchestrator...")
         self.config = config or get_config()
-        self.embedding_model = CustomGeminiEmbedding(
+        # Shared across orchestrator instances; the model wraps a genai.Client.
+        self.embedding_model = get_embedding_model(
             model_name=self.config.embedding.embedding_model_name,
-            google_api_key=self.config.embedding.google_api_key,
             output_dimensionality=self.config.embedding.dimensions
         )
         
         # Initialize clients/ingesters that will be used by pipeline steps
         self.chroma_ingester = ChromaIngester(self.config.chromadb, self.embedding_model)
-        self.neo4j_ingester = Neo4jIngester(self.config.neo4j)
-        self.graph_extractor = GraphExtractor(
-            neo4j_uri=self.config.neo4j.uri,
-            neo4j_user=self.config.neo4j.user,
-            neo4j_pass=self.config.neo4j.password,
-            gemini_api_key=None # GraphExtractor uses ADC by default when key is None
+        self.neo4j_ingester = Neo4jIngester(get_neo4j_driver(
+            self.config.neo4j.uri,
+            self.config.neo4j.user,
+            self.config.neo4j.password
+        ))
+        # Dedicated pool so large graph writes can run independent batches in parallel
+        # without competing with the event loop's default executor.
+        self.neo4j_write_executor = ThreadPoolExecutor(
+            max_workers=NEO4J_WRITE_WORKERS,
+            thread_name_prefix="neo4j-writer"
+        )
+        # Shared across orchestrator instances; GraphExtractor uses ADC for Gemini.
+        self.graph_extractor = get_graph_extractor(
+            self.config.neo4j.uri,
+            self.config.neo4j.user,
+            self.config.neo4j.password,
+            self.config.gemini_suite.pro_model.model_id
         )
         
-        # Load ontology
+        # Summaries of completed local file runs, so unchanged files are not re-ingested
+        self.result_cache = IngestionResultCache()
+        # Pipelines are built once per orchestrator; their steps hold no per-run state
+        # (state buffered across a stream lives in that stream's batch, not on the step).
+        self._pipelines: Dict[str, IngestionPipeline] = {}
+
+        # Load ontology (module-level tuples, shared across orchestrator instances)
         self.ontology_nodes = UniversalNodes
         self.ontology_edges = UniversalRelationships
 
         logger.info("IngestionOrchestrator initialized.")
 
+    def close(self) -> None:
+        """Shuts down the Neo4j write pool. Call once the orchestrator is no longer used."""
+        self.neo4j_write_executor.shutdown(wait=True)
+
     async def _initialize_ingesters(self):
         """Initializes all asynchronous ingester clients."""
         logger.info("Initializing async ingester clients...")
         if self.chroma_ingester and not self.chroma_ingester.client:
             await self.chroma_ingester.async_init()
-        # Can add other async inits here, e.g., for Neo4j if it were async
+        # Create the uuid index up front so the first bulk MERGE is already index-backed
+        await asyncio.to_thread(self.neo4j_ingester.ensure_node_key_index)
         logger.info("Async ingester clients initialized.")
 
+    def _get_pipeline(self, name: str, build_steps: Callable[[], List[IngestionStep]]) -> IngestionPipeline:
+        """Returns the named pipeline, constructing its steps on first use."""
+        pipeline = self._pipelines.get(name)
+        if pipeline is None:
+            logger.info(f"Constructing {name} ingestion pipeline...")
+            pipeline = self._pipelines[name] = IngestionPipeline(steps=build_steps())
+        return pipeline
+
+    def _store_writes(self) -> ParallelSteps:
+        """Builds the final ingestion steps; ChromaDB and Neo4j are written concurrently."""
+        return ParallelSteps([
+            IngestToChromaDB(self.chroma_ingester),
+            IngestToNeo4j(self.neo4j_ingester, executor=self.neo4j_write_executor)
+        ])
+
     def get_gdrive_pipeline(self) -> IngestionPipeline:
         """
-        Constructs the specific pipeline for ingesting documents from Google Drive.
+        Returns the specific pipeline for ingesting documents from Google Drive.
         This will be expanded to include parsing, graph extraction, and Neo4j ingestion.
         """
-        logger.info("Constructing Google Drive ingestion pipeline...")
-        steps: List[IngestionStep] = [
+        return self._get_pipeline("Google Drive", lambda: [
             LoadDocumentsFromGDrive(self.config.gdrive),
             ParseDocuments(self.config.llamaparse),
             ExtractGraph(self.graph_extractor, self.ontology_nodes, self.ontology_edges),
-            IngestToChromaDB(self.chroma_ingester),
-            IngestToNeo4j(self.neo4j_ingester)
-        ]
-        return IngestionPipeline(steps=steps)
+            self._store_writes()
+        ])
 
     def get_local_file_pipeline(self) -> IngestionPipeline:
         """
-        Constructs the pipeline for ingesting a local file.
+        Returns the pipeline for ingesting a local file.
         This pipeline omits the document loading step, as the document is provided directly.
         """
-        logger.info("Constructing local file ingestion pipeline...")
-        steps: List[IngestionStep] = [
+        return self._get_pipeline("local file", lambda: [
             ParseDocuments(self.config.llamaparse),
             ExtractGraph(self.graph_extractor, self.ontology_nodes, self.ontology_edges),
-            IngestToChromaDB(self.chroma_ingester),
-            IngestToNeo4j(self.neo4j_ingester)
-        ]
-        return IngestionPipeline(steps=steps)
+            self._store_writes()
+        ])
 
     def get_youtube_pipeline(self) -> IngestionPipeline:
         """
-        Constructs the pipeline for ingesting a YouTube transcript.
-        This pipeline fetches the transcript, chunks it, and then performs standard extraction and ingestion.
+        Returns the pipeline for ingesting a YouTube transcript.
+        This pipeline fetches the transcript as timed chunks and then performs standard extraction and ingestion.
         """
-        logger.info("Constructing YouTube transcript ingestion pipeline...")
-        steps: List[IngestionStep] = [
-            GetYoutubeTranscript(),
-            ChunkDocument(), # Chunk the single transcript document
+        return self._get_pipeline("YouTube transcript", lambda: [
+            GetYoutubeTranscript(), # Packs the transcript's timed segments into chunks
             ExtractGraph(self.graph_extractor, self.ontology_nodes, self.ontology_edges),
-            IngestToChromaDB(self.chroma_ingester),
-            IngestToNeo4j(self.neo4j_ingester)
-        ]
-        return IngestionPipeline(steps=steps)
+            self._store_writes()
+        ])
+
+    def _ingestion_target(self) -> str:
+        """Identifies the stores a run writes to, so cached results are never reused across databases."""
+        chroma = self.config.chromadb
+        return f"{self.config.neo4j.uri}|{chroma.host}:{chroma.port}/{chroma.collection_name}"
 
-    async def run_local_file_ingestion(self, file_path: str, file_name: str) -> Dict[str, Any]:
+    async def run_local_file_ingestion(self, file_path: str, file_name: str, force: bool = False) -> Dict[str, Any]:
         """
         Runs the full ingestion process for a local file.
 
+        Files whose contents were already ingested successfully into the same stores
+        are skipped and the cached summary is returned. Runs with errors, or that stored
+        no chunks or no graph nodes, are not cached.
+
         Args:
             file_path: The path to the local file to ingest.
             file_name: The original name of the file.
+            force: Re-run the pipeline even if the file was ingested before.
 
         Returns:
             A summary of the ingestion process.
         """
+        content_hash = await asyncio.to_thread(hash_file, file_path)
+        cache_key = self.result_cache.make_key(content_hash, self._ingestion_target())
+        if not force:
+            cached_summary = await asyncio.to_thread(self.result_cache.get, cache_key)
+            if cached_summary is not None:
+                logger.info(f"'{file_name}' was already ingested (sha256 {content_hash[:12]}). Returning cached summary.")
+                return {**cached_summary, "cached": True}
+
         await self._initialize_ingesters()
         pipeline = self.get_local_file_pipeline()
         
@@ -134,19 +187,29 @@ class IngestionOrchestrator:
         
         summary = {
             "total_documents_loaded": 1, # Since it's a single file
-            "ingested_chroma_count": result_context.get("ingested_chroma_docs_count", 0),
-            "ingested_neo4j_nodes": result_context.get("ingested_neo4j_nodes", 0),
-            "ingested_neo4j_edges": result_context.get("ingested_neo4j_edges", 0),
+            "ingested_chroma_count": result_context.ingested_chroma_docs_count,
+            "ingested_neo4j_nodes": result_context.ingested_neo4j_nodes,
+            "ingested_neo4j_edges": result_context.ingested_neo4j_edges,
             "errors": [str(e) for e in result_context.errors]
         }
         
         logger.info(f"Local file ingestion run finished for '{file_name}'. Summary: {summary}")
+        # Only complete runs are cached; a run that stored no chunks or no nodes is retried next time
+        ingested = summary["ingested_chroma_count"] > 0 and summary["ingested_neo4j_nodes"] > 0
+        if not summary["errors"] and ingested:
+            await asyncio.to_thread(self.result_cache.set, cache_key, summary)
         return summary
 
     async def run_gdrive_ingestion(self, folder_id: str) -> Dict[str, Any]:
         """
         Runs the full ingestion process for a given Google Drive folder.
 
+        Files are streamed through the per-document pipeline, with its steps
+        overlapped: while one file is being extracted or ingested, the next is
+        already being downloaded and parsed. Bounded queues between the steps cap
+        how many files are in flight, and each download is removed once its file is
+        done, so memory and disk use stay flat regardless of folder size.
+
         Args:
             folder_id: The ID of the Google Drive folder to ingest.
 
@@ -154,19 +217,54 @@ class IngestionOrchestrator:
             A summary of the ingestion process.
         """
         await self._initialize_ingesters()
-        pipeline = self.get_gdrive_pipeline()
-        initial_context = {"gdrive_folder_id": folder_id}
-        
-        result_context = await pipeline.run(initial_context)
-        
+        loader = LoadDocumentsFromGDrive(self.config.gdrive)
+        pipeline = self.get_local_file_pipeline()
+
         summary = {
-            "total_documents_loaded": len(result_context.get("documents", [])),
-            "ingested_chroma_count": result_context.get("ingested_chroma_docs_count", 0),
-            "ingested_neo4j_nodes": result_context.get("ingested_neo4j_nodes", 0),
-            "ingested_neo4j_edges": result_context.get("ingested_neo4j_edges", 0),
-            "errors": [str(e) for e in result_context.errors]
+            "total_documents_loaded": 0,
+            "ingested_chroma_count": 0,
+            "ingested_neo4j_nodes": 0,
+            "ingested_neo4j_edges": 0,
+            "errors": []
         }
-        
+
+        with tempfile.TemporaryDirectory(prefix="gdrive_ingest_") as download_dir:
+            async def initial_contexts():
+                async for doc in loader.stream(folder_id, download_dir=download_dir):
+                    yield {"documents": [doc]}
+
+            def settle(file_name: str, result_context) -> None:
+                summary["ingested_neo4j_nodes"] += result_context.ingested_neo4j_nodes
+                summary["ingested_neo4j_edges"] += result_context.ingested_neo4j_edges
+                summary["errors"].extend(f"{file_name}: {e}" for e in result_context.errors)
+
+            # Contexts arrive before their buffered Neo4j rows are written; they are only
+            # counted once nothing is pending, and the stream flushes everything before it ends.
+            unsettled = []
+            try:
+                async for result_context in pipeline.run_stream(initial_contexts()):
+                    doc = result_context.documents[0]
+                    Path(doc.metadata["file_path"]).unlink(missing_ok=True)
+
+                    summary["total_documents_loaded"] += 1
+                    summary["ingested_chroma_count"] += result_context.ingested_chroma_docs_count
+                    unsettled.append((doc.metadata["file_name"], result_context))
+
+                    still_pending = []
+                    for file_name, context in unsettled:
+                        if context.pending_neo4j_nodes or context.pending_neo4j_edges:
+                            still_pending.append((file_name, context))
+                        else:
+                            settle(file_name, context)
+                    unsettled = still_pending
+            except Exception as e:
+                logger.error(f"Failed to stream documents from Google Drive folder {folder_id}: {e}", exc_info=True)
+                summary["errors"].append(str(e))
+
+            # Whatever is left was either flushed at the end of the stream or failed there
+            for file_name, context in unsettled:
+                settle(file_name, context)
+
         logger.info(f"Google Drive ingestion run finished. Summary: {summary}")
         return summary
 
@@ -188,10 +286,10 @@ class IngestionOrchestrator:
         
         summary = {
             "total_documents_loaded": 1, # A single transcript
-            "total_chunks_created": len(result_context.get("parsed_llama_docs", [])),
-            "ingested_chroma_count": result_context.get("ingested_chroma_docs_count", 0),
-            "ingested_neo4j_nodes": result_context.get("ingested_neo4j_nodes", 0),
-            "ingested_neo4j_edges": result_context.get("ingested_neo4j_edges", 0),
+            "total_chunks_created": len(result_context.parsed_llama_docs),
+            "ingested_chroma_count": result_context.ingested_chroma_docs_count,
+            "ingested_neo4j_nodes": result_context.ingested_neo4j_nodes,
+            "ingested_neo4j_edges": result_context.ingested_neo4j_edges,
             "errors": [str(e) for e in result_context.errors]
         }
         
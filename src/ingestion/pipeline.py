@@ -1,27 +1,90 @@
 # src/ingestion/pipeline.py
 # Defines the core modular ingestion pipeline structure.
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field, fields
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 from loguru import logger
 
+# Marks the end of the stream flowing between stages in IngestionPipeline.run_stream
+_END_OF_STREAM = object()
+
+@dataclass(slots=True)
+class ParsedSource:
+    """The parsed chunks of one source document."""
+    document_id: str
+    file_name: Optional[str]
+    docs: List[Any]
+
+
+@dataclass(slots=True)
 class IngestionContext:
     """
     A data-carrying object that flows through the ingestion pipeline.
     Each step can read from and write to this context.
+
+    The keys the built-in steps exchange are typed attributes; anything else a
+    step wants to pass along goes into `extras` via `set`/`get`.
     """
-    def __init__(self, initial_data: Optional[Dict[str, Any]] = None):
-        self._data = initial_data if initial_data is not None else {}
-        self.errors: List[Exception] = []
-        self.is_aborted = False
+    # Inputs
+    gdrive_folder_id: Optional[str] = None
+    youtube_url: Optional[str] = None
+    youtube_urls: List[str] = field(default_factory=list)
+    documents: List[Any] = field(default_factory=list)
+    # Produced by the parse/chunk steps
+    parsed_llama_docs: List[Any] = field(default_factory=list)
+    source_document_id: Optional[str] = None
+    source_file_name: Optional[str] = None
+    parsed_sources: List[ParsedSource] = field(default_factory=list)
+    # Produced by graph extraction and the ingestion steps
+    graph_extraction_data: Optional[Dict[str, Any]] = None
+    ingested_chroma_docs_count: int = 0
+    ingested_neo4j_nodes: int = 0
+    ingested_neo4j_edges: int = 0
+    # Rows buffered for a batched write that has not happened yet (streams only)
+    pending_neo4j_nodes: int = 0
+    pending_neo4j_edges: int = 0
+    extras: Dict[str, Any] = field(default_factory=dict)
+    # Per-stream step state shared by every context of one run_stream call; None for single runs
+    batch: Optional[Dict[Any, Any]] = None
+    errors: List[Exception] = field(default_factory=list)
+    is_aborted: bool = False
+
+    @classmethod
+    def from_dict(cls, initial_data: Optional[Dict[str, Any]] = None) -> "IngestionContext":
+        """Builds a context from a dict, routing unknown keys into `extras`."""
+        context = cls()
+        for key, value in (initial_data or {}).items():
+            context.set(key, value)
+        return context
 
     def set(self, key: str, value: Any):
         """Set a value in the context."""
-        self._data[key] = value
+        if key in _CONTEXT_FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extras[key] = value
 
     def get(self, key: str, default: Any = None) -> Any:
-        """Get a value from the context."""
-        return self._data.get(key, default)
+        """Get a value from the context. Prefer attribute access for the typed fields."""
+        if key in _CONTEXT_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return self.extras.get(key, default)
+
+    def iter_parsed_sources(self) -> List[ParsedSource]:
+        """
+        Returns the parsed chunks grouped by source document.
+
+        Steps that only set the flat `parsed_llama_docs` (e.g. chunking a single
+        transcript) are presented as one source built from the single-source fields.
+        """
+        if self.parsed_sources:
+            return self.parsed_sources
+        if self.parsed_llama_docs:
+            return [ParsedSource(self.source_document_id, self.source_file_name, self.parsed_llama_docs)]
+        return []
 
     def add_error(self, error: Exception):
         """Record an error that occurred during a step."""
@@ -32,7 +95,11 @@ class IngestionContext:
         self.is_aborted = True
 
     def __repr__(self):
-        return f"IngestionContext(data={self._data.keys()}, errors={len(self.errors)}, aborted={self.is_aborted})"
+        return f"IngestionContext(documents={len(self.documents)}, parsed_llama_docs={len(self.parsed_llama_docs)}, errors={len(self.errors)}, aborted={self.is_aborted})"
+
+
+# Keys served by typed attributes; bookkeeping fields are not settable through `set`
+_CONTEXT_FIELDS = frozenset(f.name for f in fields(IngestionContext)) - {"extras", "errors", "is_aborted", "batch"}
 
 
 class IngestionStep(ABC):
@@ -51,39 +118,187 @@ class IngestionStep(ABC):
         """
         pass
 
+    async def begin_batch(self, batch: Dict[Any, Any]) -> None:
+        """
+        Called before a stream of contexts is run. Steps may start buffering work across contexts.
+
+        Buffers belong in `batch`, keyed by the step, and not on the step itself: a step
+        instance can serve several streams and single runs at the same time. Every
+        context of the stream carries the same dict as `context.batch`.
+        """
+
+    async def end_batch(self, batch: Dict[Any, Any]) -> None:
+        """Called once a stream of contexts has finished. Steps must flush any buffered work."""
+
     @property
     def name(self) -> str:
         """Returns the name of the step."""
         return self.__class__.__name__
 
 
+class ParallelSteps(IngestionStep):
+    """
+    Runs several independent steps concurrently on the same context.
+
+    Meant for steps that read and write disjoint context fields, such as the
+    ChromaDB and Neo4j ingestion steps. Every step runs to completion even if a
+    sibling fails; any failure is recorded on the context and aborts it.
+    """
+
+    def __init__(self, steps: List[IngestionStep]):
+        self.steps = steps
+
+    @property
+    def name(self) -> str:
+        return f"ParallelSteps({', '.join(step.name for step in self.steps)})"
+
+    async def begin_batch(self, batch: Dict[Any, Any]) -> None:
+        await asyncio.gather(*(step.begin_batch(batch) for step in self.steps))
+
+    async def end_batch(self, batch: Dict[Any, Any]) -> None:
+        await asyncio.gather(*(step.end_batch(batch) for step in self.steps))
+
+    async def run(self, context: IngestionContext) -> IngestionContext:
+        results = await asyncio.gather(*(step.run(context) for step in self.steps), return_exceptions=True)
+        for step, result in zip(self.steps, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error during parallel step '{step.name}': {result}", exc_info=result)
+                context.add_error(result)
+                context.abort()
+        return context
+
+
 class IngestionPipeline:
     """Orchestrates a series of ingestion steps."""
 
+    # Context keys carrying the documents a pipeline works on. Once a step has run and
+    # all of them are empty (e.g. an empty GDrive folder), later steps have nothing to do.
+    PAYLOAD_KEYS = ("documents", "parsed_llama_docs")
+
     def __init__(self, steps: List[IngestionStep]):
         self.steps = steps
+        # Resolve each step's name and bound `run` once, instead of going through the
+        # `name` property and attribute lookup on every pipeline run.
+        self._run_table: List[Tuple[str, Callable[[IngestionContext], Awaitable[IngestionContext]]]] = [
+            (step.name, step.run) for step in steps
+        ]
+
+    def _has_payload(self, context: IngestionContext) -> bool:
+        """Returns True if the context still carries documents for downstream steps."""
+        return any(getattr(context, key) for key in self.PAYLOAD_KEYS)
+
+    async def _run_step(
+        self,
+        name: str,
+        run_step: Callable[[IngestionContext], Awaitable[IngestionContext]],
+        context: IngestionContext
+    ) -> IngestionContext:
+        """Runs a single step, recording any error on the context and aborting it."""
+        try:
+            logger.info(f"--- Running step: {name} ---")
+            context = await run_step(context)
+            logger.info(f"--- Finished step: {name} ---")
+        except Exception as e:
+            logger.error(f"Error during step '{name}': {e}", exc_info=True)
+            context.add_error(e)
+            context.abort() # Abort pipeline on step failure
+        return context
 
     async def run(self, initial_context: Optional[Dict[str, Any]] = None) -> IngestionContext:
         """Runs the entire pipeline, executing each step in order."""
-        context = IngestionContext(initial_data=initial_context)
-        logger.info(f"Starting ingestion pipeline with steps: {[step.name for step in self.steps]}")
+        context = IngestionContext.from_dict(initial_context)
+        run_table = self._run_table
+        logger.info(f"Starting ingestion pipeline with steps: {[name for name, _ in run_table]}")
 
-        for step in self.steps:
+        last_index = len(run_table) - 1
+        for index, (name, run_step) in enumerate(run_table):
             if context.is_aborted:
-                logger.warning(f"Pipeline aborted. Skipping remaining steps starting from '{step.name}'.")
+                logger.warning(f"Pipeline aborted. Skipping remaining steps starting from '{name}'.")
                 break
             
-            try:
-                logger.info(f"--- Running step: {step.name} ---")
-                context = await step.run(context)
-                logger.info(f"--- Finished step: {step.name} ---")
-            except Exception as e:
-                logger.error(f"Error during step '{step.name}': {e}", exc_info=True)
-                context.add_error(e)
-                context.abort() # Abort pipeline on step failure
+            context = await self._run_step(name, run_step, context)
+            if context.is_aborted:
+                continue
+
+            if index < last_index and not self._has_payload(context):
+                logger.info(f"No documents to process after '{name}'. Skipping {last_index - index} remaining step(s).")
+                break
 
         logger.info("Ingestion pipeline finished.")
         if context.errors:
             logger.error(f"Pipeline completed with {len(context.errors)} errors.")
         
         return context
+
+    async def run_stream(
+        self,
+        initial_contexts: AsyncIterable[Dict[str, Any]],
+        queue_size: int = 8
+    ) -> AsyncIterator[IngestionContext]:
+        """
+        Runs the pipeline over a stream of inputs with the steps overlapped.
+
+        Each step runs as its own task, connected to the next by a bounded queue, so
+        step N can work on one input while step N+1 handles the previous one. Inputs
+        keep their order, and the bounded queues apply backpressure to the producer.
+        Per-input behaviour matches `run`: a failed or empty context skips the
+        remaining steps. Steps are told about the stream through `begin_batch` and
+        `end_batch`, so they can batch work across inputs. A context may be yielded
+        while some of its work is still buffered; steps update it in place once that
+        work is written (see `pending_neo4j_nodes`), at the latest before the
+        stream finishes.
+
+        Args:
+            initial_contexts: Async iterable of initial context data, one per input.
+            queue_size: Maximum number of contexts buffered between two steps.
+
+        Yields:
+            The final context for each input, in input order.
+        """
+        run_table = self._run_table
+        logger.info(f"Starting streaming ingestion pipeline with steps: {[name for name, _ in run_table]}")
+        queues: List[asyncio.Queue] = [asyncio.Queue(maxsize=queue_size) for _ in range(len(run_table) + 1)]
+        batch: Dict[Any, Any] = {}
+
+        async def feed() -> None:
+            try:
+                async for initial_data in initial_contexts:
+                    context = IngestionContext.from_dict(initial_data)
+                    context.batch = batch
+                    await queues[0].put(context)
+            finally:
+                # Always terminate the stream, so a failing producer cannot stall the stages
+                await queues[0].put(_END_OF_STREAM)
+
+        async def stage(index: int, name: str, run_step) -> None:
+            in_queue, out_queue = queues[index], queues[index + 1]
+            while True:
+                context = await in_queue.get()
+                if context is _END_OF_STREAM:
+                    await out_queue.put(_END_OF_STREAM)
+                    return
+                if not context.is_aborted and (index == 0 or self._has_payload(context)):
+                    context = await self._run_step(name, run_step, context)
+                await out_queue.put(context)
+
+        for step in self.steps:
+            await step.begin_batch(batch)
+
+        tasks = [asyncio.create_task(feed())]
+        tasks.extend(asyncio.create_task(stage(index, name, run_step)) for index, (name, run_step) in enumerate(run_table))
+        try:
+            while True:
+                context = await queues[-1].get()
+                if context is _END_OF_STREAM:
+                    break
+                yield context
+            # Surfaces an exception raised by the producer
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Flush work steps buffered across contexts, even if the stream stopped early
+            for step in self.steps:
+                await step.end_batch(batch)
+
+        logger.info("Streaming ingestion pipeline finished.")
@@ -0,0 +1,150 @@
+# src/ingestion/result_cache.py
+# Memoization of ingestion run summaries and graph extraction results, keyed by content.
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Type, Union
+
+from pydantic import BaseModel
+
+from loguru import logger
+
+try:
+    import orjson
+
+    def _dumps(payload: Any) -> bytes:
+        return orjson.dumps(payload)
+
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(payload: Any) -> bytes:
+        return json.dumps(payload).encode("utf-8")
+
+    _loads = json.loads
+
+# Default location for cached run summaries; override with INGEST_CACHE_DIR.
+DEFAULT_CACHE_DIR = os.environ.get("INGEST_CACHE_DIR", ".cache/ingest")
+# Parsed LlamaParse pages are kept in their own subdirectory.
+DEFAULT_PARSE_CACHE_DIR = os.path.join(DEFAULT_CACHE_DIR, "llamaparse")
+HASH_CHUNK_SIZE = 1024 * 1024
+# Default number of extraction results kept in memory by an ExtractionResultCache.
+DEFAULT_EXTRACTION_CACHE_SIZE = 1024
+
+
+def hash_file(file_path: Union[str, Path]) -> str:
+    """Returns the SHA-256 hex digest of a file's contents, read in 1 MiB chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_texts(texts: Iterable[str]) -> str:
+    """Returns the SHA-256 hex digest of a sequence of texts, in order."""
+    digest = hashlib.sha256()
+    for text in texts:
+        digest.update(text.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class IngestionResultCache:
+    """
+    Stores the summary of a successful ingestion run on disk, keyed by content hash
+    and ingestion target, so re-ingesting an unchanged file can skip parsing and
+    graph extraction entirely. Entries survive process restarts.
+
+    ParseDocuments uses a second instance, keyed by content hash and parser
+    settings, to keep LlamaParse output.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+
+    @staticmethod
+    def make_key(content_hash: str, target: str) -> str:
+        """Combines a content hash with the ingestion target (e.g. database URIs) into a cache key."""
+        return hashlib.sha256(f"{content_hash}|{target}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached summary for `key`, or None on a miss or unreadable entry."""
+        path = self._path(key)
+        try:
+            return _loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable ingestion cache entry '{path}': {e}")
+            return None
+
+    def set(self, key: str, summary: Dict[str, Any]) -> None:
+        """Atomically writes `summary` for `key`."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_bytes(_dumps(summary))
+        os.replace(tmp_path, path)
+
+
+def _describe_model(model: Type[BaseModel]) -> list:
+    """Returns a model's qualified name and its fields (name, annotation, default, description)."""
+    return [f"{model.__module__}.{model.__qualname__}", [[name, repr(field)] for name, field in model.model_fields.items()]]
+
+
+def hash_ontology(ontology_nodes: Sequence[Type[BaseModel]], ontology_edges: Sequence[Type[BaseModel]]) -> str:
+    """
+    Returns a SHA-256 hex digest of the node and edge types and their fields.
+
+    Only the field definitions collected at class creation are read, so ontology
+    models declared with `defer_build=True` do not have their schemas built.
+    """
+    ontology = {
+        "nodes": [_describe_model(model) for model in ontology_nodes],
+        "edges": [_describe_model(model) for model in ontology_edges],
+    }
+    return hashlib.sha256(json.dumps(ontology, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ExtractionResultCache:
+    """
+    Keeps recent graph extraction results in memory, keyed by ontology hash, Graphiti
+    group and the SHA-256 of the extracted text, so extracting the same text again
+    within a group (retries, repeated chunks) skips the LLM call. Results are never
+    shared across groups: a hit skips `add_episode`, and the cached nodes carry the
+    original group's id and uuids. Changing the ontology changes every key. The least
+    recently used entry is evicted once `max_entries` is reached.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_EXTRACTION_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(ontology_hash: str, group_id: Optional[str], text: str) -> str:
+        """Combines an ontology hash, the Graphiti group id and the SHA-256 of `text` into a cache key."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{ontology_hash}:{group_id or ''}:{text_hash}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached extraction result for `key`, or None on a miss."""
+        result = self._entries.get(key)
+        if result is not None:
+            self._entries.move_to_end(key)
+        return result
+
+    def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Stores `result` for `key`, evicting the least recently used entry if full."""
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -2,44 +2,113 @@
 # Concrete implementations of ingestion pipeline steps.
 
 from loguru import logger
-from typing import List, Any
+from typing import List, Any, AsyncIterator, Literal, Optional, Sequence
+from concurrent.futures import Executor
 
-from src.ingestion.pipeline import IngestionStep, IngestionContext
+from src.ingestion.pipeline import IngestionStep, IngestionContext, ParsedSource
 from utils.gdrive_reader import GDriveReader, GDriveReaderConfig
 from utils.document_parser import DocumentParser, LlamaParseConfig
 from utils.chroma_ingester import ChromaIngester
 from src.ingestion.utils import convert_llama_docs_to_chroma_docs
+from src.ingestion.result_cache import (
+    DEFAULT_PARSE_CACHE_DIR,
+    ExtractionResultCache,
+    IngestionResultCache,
+    hash_file,
+    hash_ontology,
+    hash_texts,
+)
 from src.graph_extraction.extractor import GraphExtractor
 from pydantic import BaseModel
 from typing import Type
-from utils.neo4j_ingester import Neo4jIngester, DocumentIngestionData
+from utils.neo4j_ingester import (
+    BatchingNeo4jIngester,
+    DEFAULT_FLUSH_THRESHOLD,
+    Neo4jIngester,
+    graph_edge_to_row,
+    graph_node_to_row
+)
 
 # Note: LlamaIndex documents are not directly JSON serializable, so we handle them carefully.
-from llama_index.core.schema import Document as LlamaDocument
-from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import Document as LlamaDocument, TextNode
+from llama_index.core.node_parser import SentenceSplitter, TokenTextSplitter
 from youtube_transcript_api import YouTubeTranscriptApi
+from pathlib import Path
+import asyncio
+import functools
+import operator
+import re
 import uuid
 
+# Upper bound on concurrent LlamaParse requests issued by one ParseDocuments step
+DEFAULT_PARSE_CONCURRENCY = 8
+# Bump when the parsed page format changes, so older cached parses are ignored
+PARSE_CACHE_VERSION = 1
+# Documents from these sources, or files with these suffixes, are read as-is instead of via LlamaParse
+PLAIN_TEXT_SOURCES = frozenset({"youtube", "plaintext"})
+PLAIN_TEXT_SUFFIXES = frozenset({".txt", ".md", ".markdown"})
+# Upper bound on concurrent per-chunk extraction calls issued by one ExtractGraph step
+DEFAULT_EXTRACTION_CONCURRENCY = 8
+# Upper bound on concurrent transcript fetches issued by one GetYoutubeTranscript step
+DEFAULT_TRANSCRIPT_CONCURRENCY = 4
+# Characters packed into one transcript chunk (roughly ChunkDocument's 1024 tokens)
+DEFAULT_TRANSCRIPT_CHUNK_CHARS = 4096
+# Matches the 11-character video ID in watch, youtu.be, embed and shorts URLs
+_YT_ID_RE = re.compile(r"(?:v=|youtu\.be/|/embed/|/shorts/)([A-Za-z0-9_-]{11})")
+_get_text = operator.attrgetter("text")
+
 class LoadDocumentsFromGDrive(IngestionStep):
     """An ingestion step to load documents from a Google Drive folder."""
 
-    def __init__(self, config: GDriveReaderConfig):
+    # Native Google Docs/Sheets/etc. cannot be downloaded with get_media, and folders have no content.
+    GOOGLE_APPS_MIME_PREFIX = "application/vnd.google-apps."
+
+    def __init__(self, config: GDriveReaderConfig, download_dir: str = "data/gdrive_downloads"):
         self.config = config
+        self.download_dir = download_dir
+
+    async def stream(self, folder_id: str, download_dir: Optional[str] = None) -> AsyncIterator[LlamaDocument]:
+        """
+        Yields one LlamaDocument per file in the folder, downloading each file only
+        when the consumer asks for it, so at most one file is in flight at a time.
+
+        Each document carries 'file_path' and 'file_name' metadata, as ParseDocuments expects.
+        """
+        reader = GDriveReader(self.config)
+        target_dir = Path(download_dir or self.download_dir)
+
+        files = await asyncio.to_thread(reader.list_files, folder_id)
+        for file_info in files:
+            if file_info.get("mimeType", "").startswith(self.GOOGLE_APPS_MIME_PREFIX):
+                logger.info(f"Skipping Google Drive item '{file_info['name']}' of type {file_info['mimeType']}.")
+                continue
+
+            target_path = target_dir / f"{file_info['id']}_{file_info['name']}"
+            file_path = await asyncio.to_thread(reader.download_file_to_path, file_info["id"], target_path)
+            yield LlamaDocument(
+                id_=str(uuid.uuid4()),
+                metadata={
+                    "file_path": file_path,
+                    "file_name": file_info["name"],
+                    "gdrive_file_id": file_info["id"],
+                    "mime_type": file_info.get("mimeType")
+                }
+            )
 
     async def run(self, context: IngestionContext) -> IngestionContext:
-        folder_id = context.get("gdrive_folder_id")
+        folder_id = context.gdrive_folder_id
         if not folder_id:
             logger.warning("No 'gdrive_folder_id' found in context. Skipping GDrive document loading.")
-            context.set("documents", [])
+            context.documents = []
             return context
 
         self.config.folder_id = folder_id
         logger.info(f"Loading documents from Google Drive folder: {self.config.folder_id}")
 
         try:
-            reader = GDriveReader(self.config)
-            documents = await reader.load_data()
-            context.set("documents", documents)
+            # Materializes the whole folder; prefer `stream` for large folders.
+            documents = [doc async for doc in self.stream(folder_id)]
+            context.documents = documents
             logger.success(f"Successfully loaded {len(documents)} documents from Google Drive.")
         except Exception as e:
             logger.error(f"Failed to load documents from Google Drive: {e}", exc_info=True)
@@ -49,139 +118,326 @@ class LoadDocumentsFromGDrive(IngestionStep):
         return context
 
 
-class ChunkDocument(IngestionStep):
-    """An ingestion step to chunk a single document into multiple smaller documents."""
+ChunkingStrategy = Literal["sentence", "token"]
 
-    def __init__(self, chunk_size=1024, chunk_overlap=20):
-        self.text_splitter = SentenceSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+_SPLITTERS = {
+    "sentence": SentenceSplitter,  # Packs whole sentences, so chunks rarely end mid-sentence
+    "token": TokenTextSplitter,    # Splits on token count alone
+}
 
-    async def run(self, context: IngestionContext) -> IngestionContext:
-        documents: List[LlamaDocument] = context.get("documents")
-        if not documents or len(documents) != 1:
-            logger.warning(f"ChunkDocument step expects a single document in the context, but found {len(documents) if documents else 0}. Skipping chunking.")
-            # Pass through the original documents if they exist
-            if documents:
-                context.set("parsed_llama_docs", documents)
-            return context
 
-        doc = documents[0]
-        logger.info(f"Chunking document: {doc.metadata.get('file_name', doc.id_)}")
+@functools.lru_cache(maxsize=16)
+def _get_splitter(strategy: ChunkingStrategy, chunk_size: int, chunk_overlap: int):
+    """Returns a splitter shared by every ChunkDocument step with the same settings.
 
-        try:
-            nodes = self.text_splitter.get_nodes_from_documents([doc])
-            
-            # Convert nodes back to LlamaDocument objects for compatibility
-            chunked_docs = [LlamaDocument(text=node.get_content(), metadata=node.metadata) for node in nodes]
+    Building one loads its tokenizer, which is far more expensive than splitting a document.
+    """
+    try:
+        splitter_cls = _SPLITTERS[strategy]
+    except KeyError:
+        raise ValueError(f"Unknown chunking strategy '{strategy}'. Expected one of {sorted(_SPLITTERS)}.") from None
+    return splitter_cls(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
 
-            context.set("parsed_llama_docs", chunked_docs)
-            logger.success(f"Successfully chunked document into {len(chunked_docs)} smaller documents.")
 
-        except Exception as e:
-            logger.error(f"Failed to chunk document {doc.id_}: {e}", exc_info=True)
-            context.add_error(e)
-            context.abort()
+class ChunkDocument(IngestionStep):
+    """An ingestion step to chunk each document in the context into smaller documents."""
+
+    # 25% overlap keeps passages that straddle a chunk boundary retrievable from either side.
+    def __init__(self, chunk_size: int = 1024, chunk_overlap: int = 256, strategy: ChunkingStrategy = "sentence"):
+        self.text_splitter = _get_splitter(strategy, chunk_size, chunk_overlap)
+
+    async def run(self, context: IngestionContext) -> IngestionContext:
+        documents: List[LlamaDocument] = context.documents
+        if not documents:
+            logger.warning("ChunkDocument step found no documents in the context. Skipping chunking.")
+            return context
 
+        for doc in documents:
+            logger.info(f"Chunking document: {doc.metadata.get('file_name', doc.id_)}")
+            try:
+                # TextNodes expose the same .text/.metadata/.id_ interface downstream steps use,
+                # so they are passed on as-is rather than copied into new Documents.
+                nodes = self.text_splitter.get_nodes_from_documents([doc])
+            except Exception as e:
+                logger.error(f"Failed to chunk document {doc.id_}: {e}", exc_info=True)
+                context.add_error(e)
+                context.abort()
+                return context
+            context.parsed_sources.append(ParsedSource(doc.id_, doc.metadata.get('file_name'), nodes))
+
+        context.parsed_llama_docs = [chunk for source in context.parsed_sources for chunk in source.docs]
+        logger.success(f"Successfully chunked {len(documents)} document(s) into {len(context.parsed_llama_docs)} smaller documents.")
         return context
 
 
 class ParseDocuments(IngestionStep):
-    """An ingestion step to parse documents using LlamaParse."""
-
-    def __init__(self, config: LlamaParseConfig):
+    """
+    An ingestion step to parse documents using LlamaParse.
+
+    Documents that already carry text, or are plain-text files, are passed through
+    without a LlamaParse round-trip.
+    """
+
+    def __init__(
+        self,
+        config: LlamaParseConfig,
+        max_concurrency: int = DEFAULT_PARSE_CONCURRENCY,
+        cache: Optional[IngestionResultCache] = None
+    ):
         self.parser = DocumentParser(config)
+        self.max_concurrency = max_concurrency
+        # Parsed pages keyed by file content, so unchanged files are never sent to LlamaParse twice.
+        self.cache = cache if cache is not None else IngestionResultCache(DEFAULT_PARSE_CACHE_DIR)
+        self._parser_fingerprint = f"llamaparse:v{PARSE_CACHE_VERSION}:{config.base_url or ''}"
+
+    @staticmethod
+    def _pages_from_cache(cached: dict, file_path: str) -> List[LlamaDocument]:
+        """Rebuilds parsed pages from a cache entry, pointing them at the file being ingested now."""
+        location = {'file_path': str(file_path), 'file_name': Path(file_path).name}
+        return [LlamaDocument(text=page['text'], metadata={**page['metadata'], **location}) for page in cached['pages']]
+
+    def _store_pages(self, cache_key: str, pages: List[LlamaDocument]) -> None:
+        try:
+            self.cache.set(cache_key, {'pages': [{'text': page.text, 'metadata': page.metadata} for page in pages]})
+        except (TypeError, ValueError, OSError) as e:
+            logger.warning(f"Could not cache LlamaParse output: {e}")
+
+    @staticmethod
+    def _is_plain_text(doc: LlamaDocument) -> bool:
+        """Returns True if the document needs no layout parsing."""
+        if doc.text or doc.metadata.get('source') in PLAIN_TEXT_SOURCES:
+            return True
+        return Path(doc.metadata.get('file_path', '')).suffix.lower() in PLAIN_TEXT_SUFFIXES
+
+    @staticmethod
+    async def _load_plain_text(doc: LlamaDocument) -> List[LlamaDocument]:
+        """Returns the document itself if it has text, otherwise its file read as UTF-8."""
+        if doc.text:
+            return [doc]
+        file_path = Path(doc.metadata['file_path'])
+        logger.info(f"Reading plain-text document without LlamaParse: {doc.metadata.get('file_name')}")
+        text = await asyncio.to_thread(file_path.read_text, encoding="utf-8", errors="replace")
+        return [LlamaDocument(text=text, metadata={**doc.metadata, 'file_path': str(file_path)})]
 
     async def run(self, context: IngestionContext) -> IngestionContext:
-        raw_docs: List[LlamaDocument] = context.get("documents")
+        raw_docs: List[LlamaDocument] = context.documents
         if not raw_docs:
             logger.warning("No 'documents' found in context to parse. Skipping parsing step.")
             return context
 
-        # This example processes one document at a time for simplicity.
-        # A batching mechanism would be more efficient for production.
-        doc_to_parse = raw_docs[0] # Assuming one document for now
-        file_path = doc_to_parse.metadata.get('file_path')
-
-        if not file_path:
+        if any(not doc.text and not doc.metadata.get('file_path') for doc in raw_docs):
             msg = "Document in context is missing 'file_path' in metadata for parsing."
             logger.error(msg)
             context.add_error(ValueError(msg))
             context.abort()
             return context
 
-        logger.info(f"Parsing document: {doc_to_parse.metadata.get('file_name')}")
-        try:
-            # Use the more flexible method that returns LlamaIndex Documents
-            parsed_llama_docs = await self.parser.aparse_file(file_path)
-            
-            # Set context for downstream steps
-            context.set("parsed_llama_docs", parsed_llama_docs)
-            context.set("source_document_id", doc_to_parse.id_)
-            context.set("source_file_name", doc_to_parse.metadata.get('file_name'))
-
-            logger.success(f"Successfully parsed document into {len(parsed_llama_docs)} chunks.")
-
-        except Exception as e:
-            logger.error(f"Failed to parse document {file_path}: {e}", exc_info=True)
-            context.add_error(e)
+        # LlamaParse calls are I/O bound, so all documents are parsed concurrently,
+        # bounded to avoid overwhelming the API.
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def parse_one(doc: LlamaDocument) -> List[LlamaDocument]:
+            if self._is_plain_text(doc):
+                return await self._load_plain_text(doc)
+
+            file_path = doc.metadata['file_path']
+            content_hash = await asyncio.to_thread(hash_file, file_path)
+            cache_key = self.cache.make_key(content_hash, self._parser_fingerprint)
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+            if cached is not None:
+                logger.info(f"Reusing cached LlamaParse output for: {doc.metadata.get('file_name')}")
+                return self._pages_from_cache(cached, file_path)
+
+            async with semaphore:
+                logger.info(f"Parsing document: {doc.metadata.get('file_name')}")
+                # Use the more flexible method that returns LlamaIndex Documents
+                pages = await self.parser.aparse_file(file_path)
+            # aparse_file returns an empty list when parsing failed, which must not be cached
+            if pages:
+                await asyncio.to_thread(self._store_pages, cache_key, pages)
+            return pages
+
+        results = await asyncio.gather(*(parse_one(doc) for doc in raw_docs), return_exceptions=True)
+
+        for doc, result in zip(raw_docs, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to parse document {doc.metadata['file_path']}: {result}", exc_info=result)
+                context.add_error(result)
+                continue
+            if not result:
+                # DocumentParser logs and swallows LlamaParse failures, returning no pages
+                msg = f"No content was parsed from document {doc.metadata['file_path']}."
+                logger.error(msg)
+                context.add_error(ValueError(msg))
+                continue
+            context.parsed_sources.append(ParsedSource(doc.id_, doc.metadata.get('file_name'), result))
+
+        if not context.parsed_sources:
             context.abort()
+            return context
+
+        # Flat view and single-source fields for downstream steps that handle one document
+        context.parsed_llama_docs = [chunk for source in context.parsed_sources for chunk in source.docs]
+        context.source_document_id = context.parsed_sources[0].document_id
+        context.source_file_name = context.parsed_sources[0].file_name
 
+        logger.success(
+            f"Successfully parsed {len(context.parsed_sources)} of {len(raw_docs)} document(s) "
+            f"into {len(context.parsed_llama_docs)} chunks."
+        )
         return context
 
 
 class ExtractGraph(IngestionStep):
-    """An ingestion step to extract graph data from text."""
-
-    def __init__(self, extractor: GraphExtractor, ontology_nodes: List[Type[BaseModel]], ontology_edges: List[Type[BaseModel]]):
+    """An ingestion step to extract graph data from text, one chunk per extraction call."""
+
+    def __init__(
+        self,
+        extractor: GraphExtractor,
+        ontology_nodes: Sequence[Type[BaseModel]],
+        ontology_edges: Sequence[Type[BaseModel]],
+        max_concurrency: int = DEFAULT_EXTRACTION_CONCURRENCY,
+        cache: Optional[ExtractionResultCache] = None
+    ):
         self.extractor = extractor
-        self.ontology_nodes = ontology_nodes
-        self.ontology_edges = ontology_edges
+        # Tuples are hashable, which lets the extractor reuse its prompt ontology across calls.
+        self.ontology_nodes = tuple(ontology_nodes)
+        self.ontology_edges = tuple(ontology_edges)
+        self.max_concurrency = max_concurrency
+        # Results are reused for identical chunk text under the same ontology and group.
+        self.cache = cache if cache is not None else ExtractionResultCache()
+        self._ontology_hash = hash_ontology(self.ontology_nodes, self.ontology_edges)
+
+    @staticmethod
+    def _merge_extractions(extractions: List[dict]) -> dict:
+        """
+        Merges several extraction results into one.
+
+        Graphiti has already saved every node and edge it returns, so both are passed
+        on as saved and only deduplicated by uuid (several chunks can resolve to the
+        same entity). Other list-valued entries are concatenated.
+        """
+        if len(extractions) == 1:
+            return extractions[0]
+        merged: dict = {}
+        for extraction in extractions:
+            for key, value in extraction.items():
+                if isinstance(value, list) and key not in ("nodes", "edges"):
+                    merged.setdefault(key, []).extend(value)
+
+        for key in ("nodes", "edges"):
+            by_uuid: dict = {}
+            for extraction in extractions:
+                for item in extraction.get(key) or ():
+                    by_uuid.setdefault(item["uuid"], item)
+            merged[key] = list(by_uuid.values())
+        return merged
 
     async def run(self, context: IngestionContext) -> IngestionContext:
-        parsed_docs: List[LlamaDocument] = context.get("parsed_llama_docs")
-        source_id = context.get("source_document_id")
-        source_name = context.get("source_file_name")
-
-        if not parsed_docs:
+        sources = context.iter_parsed_sources()
+        if not sources:
             logger.warning("No 'parsed_llama_docs' found in context. Skipping graph extraction.")
             return context
 
-        # Concatenate text from all chunks for a holistic extraction
-        full_text_content = "\n\n---\n\n".join([doc.text for doc in parsed_docs])
-        logger.info(f"Starting graph extraction from {len(full_text_content)} characters of text for '{source_name}'.")
-
+        # Every chunk is its own episode, so extraction latency is bounded by the slowest
+        # chunk rather than the length of the document. The semaphore caps concurrent LLM calls.
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        # Document ids are generated per run, so each source's Graphiti group is derived from
+        # its text instead. Re-extracting unchanged content then hits the cache, and the
+        # cached nodes already belong to the group they are written under.
+        group_ids = {id(source): hash_texts(doc.text for doc in source.docs) for source in sources}
+
+        async def extract_chunk(source: ParsedSource, chunk_text: str) -> dict:
+            group_id = group_ids[id(source)]
+            cache_key = self.cache.make_key(self._ontology_hash, group_id, chunk_text)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Reusing cached graph extraction for a chunk of '{source.file_name}'.")
+                return cached
+            async with semaphore:
+                extraction = await self.extractor.extract(
+                    text_content=chunk_text,
+                    ontology_nodes=self.ontology_nodes,
+                    ontology_edges=self.ontology_edges,
+                    group_id=group_id,
+                    episode_name_prefix=source.file_name[:50]
+                )
+            self.cache.set(cache_key, extraction)
+            return extraction
+
+        chunks = [(source, doc.text) for source in sources for doc in source.docs]
+        logger.info(f"Starting graph extraction from {len(chunks)} chunks across {len(sources)} source(s).")
+        tasks = [asyncio.ensure_future(extract_chunk(source, text)) for source, text in chunks]
         try:
-            extraction_dict = await self.extractor.extract(
-                text_content=full_text_content,
-                ontology_nodes=self.ontology_nodes,
-                ontology_edges=self.ontology_edges,
-                group_id=source_id,
-                episode_name_prefix=source_name[:50]
-            )
-
-            # The result from the extractor is already a dictionary.
-            context.set("graph_extraction_data", extraction_dict)
-
-            nodes_count = len(extraction_dict.get("nodes", []))
-            edges_count = len(extraction_dict.get("edges", []))
-            logger.success(f"Graph extraction complete. Found {nodes_count} nodes and {edges_count} edges.")
-
+            extractions = await asyncio.gather(*tasks)
         except Exception as e:
-            logger.error(f"Failed during graph extraction for '{source_name}': {e}", exc_info=True)
+            for task in tasks:
+                task.cancel()
+            logger.error(f"Failed during graph extraction: {e}", exc_info=True)
             context.add_error(e)
             context.abort()
+            return context
+
+        context.graph_extraction_data = self._merge_extractions(extractions)
+
+        nodes_count = len(context.graph_extraction_data.get("nodes", []))
+        edges_count = len(context.graph_extraction_data.get("edges", []))
+        logger.success(f"Graph extraction complete. Found {nodes_count} nodes and {edges_count} edges.")
 
         return context
 
 
 class IngestToNeo4j(IngestionStep):
-    """An ingestion step to ingest graph data into Neo4j."""
-
-    def __init__(self, ingester: Neo4jIngester):
+    """
+    An ingestion step to ingest graph data into Neo4j.
+
+    Within a stream, rows are buffered across documents and written together.
+    A document's buffered rows are reported as `pending_neo4j_nodes`/`_edges`
+    until they have been written, and only then move to `ingested_neo4j_*`.
+    """
+
+    def __init__(
+        self,
+        ingester: Neo4jIngester,
+        executor: Optional[Executor] = None,
+        flush_threshold: int = DEFAULT_FLUSH_THRESHOLD
+    ):
         self.ingester = ingester
+        # Optional pool used to write independent node batches as concurrent transactions.
+        self.executor = executor
+        self.flush_threshold = flush_threshold
+
+    async def begin_batch(self, batch: dict) -> None:
+        batch[self] = BatchingNeo4jIngester(self.ingester, self.flush_threshold, self.executor)
+
+    async def end_batch(self, batch: dict) -> None:
+        batcher = batch.pop(self, None)
+        if batcher is None or not batcher.pending:
+            return
+        try:
+            await self._flush(batcher)
+        except Exception as e:
+            contexts = batcher.owners
+            logger.error(f"Failed to write buffered graph data from {len(contexts)} document(s) into Neo4j: {e}", exc_info=True)
+            for context in contexts:
+                context.add_error(e)
+                context.abort()
+
+    @staticmethod
+    async def _flush(batcher: BatchingNeo4jIngester) -> None:
+        """Writes the buffered rows, then marks every document they came from as ingested."""
+        contexts = batcher.owners
+        nodes_count, edges_count = await asyncio.to_thread(batcher.flush)
+        for context in contexts:
+            context.ingested_neo4j_nodes += context.pending_neo4j_nodes
+            context.ingested_neo4j_edges += context.pending_neo4j_edges
+            context.pending_neo4j_nodes = context.pending_neo4j_edges = 0
+        logger.success(f"Flushed {nodes_count} nodes and {edges_count} edges from {len(contexts)} document(s) into Neo4j.")
 
     async def run(self, context: IngestionContext) -> IngestionContext:
-        graph_data = context.get("graph_extraction_data")
-        source_name = context.get("source_file_name")
+        graph_data = context.graph_extraction_data
+        source_name = context.source_file_name
 
         if not graph_data:
             logger.warning("No 'graph_extraction_data' found in context. Skipping Neo4j ingestion.")
@@ -189,16 +445,32 @@ class IngestToNeo4j(IngestionStep):
 
         logger.info(f"Ingesting graph data from '{source_name}' into Neo4j.")
         try:
-            ingestion_data = DocumentIngestionData(
-                nodes=graph_data.get('nodes', []),
-                relationships=graph_data.get('edges', [])
-            )
-            await self.ingester.ingest_document(ingestion_data)
-
-            nodes_count = len(ingestion_data.nodes)
-            edges_count = len(ingestion_data.relationships)
-            context.set("ingested_neo4j_nodes", nodes_count)
-            context.set("ingested_neo4j_edges", edges_count)
+            # Collect everything up front so the ingester can write it with a handful of
+            # UNWIND queries rather than one round-trip per node/edge.
+            node_rows = [graph_node_to_row(node) for node in graph_data.get('nodes', [])]
+            edge_rows = [graph_edge_to_row(edge) for edge in graph_data.get('edges', [])]
+
+            batcher = context.batch.get(self) if context.batch is not None else None
+            if batcher is not None:
+                # Within a stream, rows are written once enough have accumulated (or at end_batch).
+                context.pending_neo4j_nodes = len(node_rows)
+                context.pending_neo4j_edges = len(edge_rows)
+                if batcher.add(node_rows, edge_rows, owner=context):
+                    try:
+                        await self._flush(batcher)
+                    except Exception as e:
+                        # The rows stay buffered and are retried by the next flush. If the last
+                        # flush also fails, end_batch records the error on every waiting document.
+                        logger.warning(f"Buffered Neo4j write failed, retrying with the next flush: {e}")
+                logger.info(f"Buffered {len(node_rows)} nodes and {len(edge_rows)} edges from '{source_name}' for Neo4j.")
+                return context
+
+            # Nodes must land before edges, since edges MATCH on their endpoints.
+            nodes_count = await asyncio.to_thread(self.ingester.bulk_upsert_nodes, node_rows, executor=self.executor)
+            edges_count = await asyncio.to_thread(self.ingester.bulk_upsert_edges, edge_rows)
+
+            context.ingested_neo4j_nodes = nodes_count
+            context.ingested_neo4j_edges = edges_count
             logger.success(f"Successfully ingested {nodes_count} nodes and {edges_count} edges into Neo4j.")
 
         except Exception as e:
@@ -216,32 +488,33 @@ class IngestToChromaDB(IngestionStep):
         self.ingester = ingester
 
     async def run(self, context: IngestionContext) -> IngestionContext:
-        parsed_docs: List[LlamaDocument] = context.get("parsed_llama_docs")
-        source_id = context.get("source_document_id")
-        source_name = context.get("source_file_name")
+        sources = context.iter_parsed_sources()
 
-        if not parsed_docs:
+        if not sources:
             logger.warning("No 'parsed_llama_docs' found in context. Skipping ChromaDB ingestion.")
             return context
         
-        if not source_id or not source_name:
+        if any(not source.document_id or not source.file_name for source in sources):
             msg = "Context is missing 'source_document_id' or 'source_file_name' for ChromaDB ingestion."
             logger.error(msg)
             context.add_error(ValueError(msg))
             context.abort()
             return context
 
-        logger.info(f"Preparing {len(parsed_docs)} chunks from '{source_name}' for ChromaDB ingestion.")
+        source_names = ", ".join(f"'{source.file_name}'" for source in sources)
+        logger.info(f"Preparing {sum(len(source.docs) for source in sources)} chunks from {source_names} for ChromaDB ingestion.")
         try:
-            chroma_documents = convert_llama_docs_to_chroma_docs(
-                llama_docs=parsed_docs,
-                source_document_id=source_id,
-                source_file_name=source_name
-            )
+            chroma_documents = []
+            for source in sources:
+                chroma_documents.extend(convert_llama_docs_to_chroma_docs(
+                    llama_docs=source.docs,
+                    source_document_id=source.document_id,
+                    source_file_name=source.file_name
+                ))
             
             await self.ingester.ingest_documents(chroma_documents)
             
-            context.set("ingested_chroma_docs_count", len(chroma_documents))
+            context.ingested_chroma_docs_count = len(chroma_documents)
             logger.success(f"Successfully ingested {len(chroma_documents)} chunks into ChromaDB.")
 
         except Exception as e:
@@ -252,53 +525,118 @@ class IngestToChromaDB(IngestionStep):
         return context
 
 
-class GetYoutubeTranscript(IngestionStep):
-    """An ingestion step to load a transcript from a YouTube URL."""
-
-    async def run(self, context: IngestionContext) -> IngestionContext:
-        youtube_url = context.get("youtube_url")
-        if not youtube_url:
-            logger.warning("No 'youtube_url' found in context. Skipping YouTube transcript loading.")
-            return context
-
-        logger.info(f"Loading transcript from YouTube URL: {youtube_url}")
+def _pack_transcript_segments(segments: Sequence[Any], max_chars: int, overlap_chars: int) -> List[List[Any]]:
+    """
+    Groups consecutive transcript segments into windows of at most `max_chars` characters.
+
+    Each window after the first starts with the trailing segments of the previous one,
+    up to `overlap_chars` characters. A single segment longer than `max_chars` forms
+    its own window.
+    """
+    windows: List[List[Any]] = []
+    window: List[Any] = []
+    size = 0
+    for segment in segments:
+        segment_size = len(segment.text) + 1
+        if window and size + segment_size > max_chars:
+            windows.append(window)
+            carried: List[Any] = []
+            carried_size = 0
+            for previous in reversed(window):
+                previous_size = len(previous.text) + 1
+                if carried_size + previous_size > overlap_chars:
+                    break
+                carried.append(previous)
+                carried_size += previous_size
+            carried.reverse()
+            window, size = carried, carried_size
+        window.append(segment)
+        size += segment_size
+    if window:
+        windows.append(window)
+    return windows
 
-        try:
-            # Extract video ID from URL
-            if "v=" in youtube_url:
-                video_id = youtube_url.split("v=")[1].split("&")[0]
-            elif "youtu.be/" in youtube_url:
-                video_id = youtube_url.split("youtu.be/")[1].split("?")[0]
-            else:
-                raise ValueError("Invalid YouTube URL format.")
-
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id)
-            
-            # Combine transcript parts into a single text block
-            transcript_text = " ".join([item['text'] for item in transcript_list])
 
-            # Create a LlamaDocument. This will be chunked by a subsequent step.
-            doc = LlamaDocument(
+class GetYoutubeTranscript(IngestionStep):
+    """
+    An ingestion step to load transcripts from one or more YouTube URLs.
+
+    Transcripts arrive already split into short timed segments, so they are packed
+    straight into chunks that keep their start and end times, instead of being joined
+    into one text and re-split by ChunkDocument.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_TRANSCRIPT_CONCURRENCY,
+        chunk_chars: int = DEFAULT_TRANSCRIPT_CHUNK_CHARS,
+        chunk_overlap_chars: int = DEFAULT_TRANSCRIPT_CHUNK_CHARS // 4
+    ):
+        # One client per step, so every fetch reuses the same HTTP session and its connection pool.
+        self.transcript_api = YouTubeTranscriptApi()
+        self.max_concurrency = max_concurrency
+        self.chunk_chars = chunk_chars
+        self.chunk_overlap_chars = chunk_overlap_chars
+
+    async def _load_transcript(self, youtube_url: str) -> ParsedSource:
+        """Fetches the transcript of one video and packs its segments into timed chunks."""
+        # Extract video ID from URL
+        match = _YT_ID_RE.search(youtube_url)
+        if not match:
+            raise ValueError("Invalid YouTube URL format.")
+        video_id = match.group(1)
+
+        # The fetch is a blocking HTTP call, so it runs off the event loop.
+        transcript = await asyncio.to_thread(self.transcript_api.fetch, video_id)
+
+        document_id = str(uuid.uuid4())
+        file_name = f"youtube_{video_id}.txt" # for compatibility with downstream steps
+        chunks = []
+        for window in _pack_transcript_segments(transcript, self.chunk_chars, self.chunk_overlap_chars):
+            last = window[-1]
+            chunks.append(TextNode(
                 id_=str(uuid.uuid4()),
-                text=transcript_text,
+                text=" ".join(map(_get_text, window)),
                 metadata={
                     "source": "youtube",
                     "video_id": video_id,
                     "youtube_url": youtube_url,
-                    "file_name": f"youtube_{video_id}.txt" # for compatibility with downstream steps
+                    "file_name": file_name,
+                    "start": window[0].start,
+                    "end": last.start + last.duration
                 }
-            )
-            
-            # Set the single, raw document in the context
-            context.set("documents", [doc])
-            context.set("source_document_id", doc.id_) # for compatibility
-            context.set("source_file_name", doc.metadata["file_name"]) # for compatibility
+            ))
+        return ParsedSource(document_id, file_name, chunks)
 
-            logger.success(f"Successfully loaded transcript for video ID: {video_id}")
+    async def run(self, context: IngestionContext) -> IngestionContext:
+        youtube_urls = context.youtube_urls or ([context.youtube_url] if context.youtube_url else [])
+        if not youtube_urls:
+            logger.warning("No 'youtube_url' or 'youtube_urls' found in context. Skipping YouTube transcript loading.")
+            return context
 
-        except Exception as e:
-            logger.error(f"Failed to load transcript from YouTube URL {youtube_url}: {e}", exc_info=True)
-            context.add_error(e)
+        logger.info(f"Loading transcripts from {len(youtube_urls)} YouTube URL(s).")
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def load_one(youtube_url: str) -> ParsedSource:
+            async with semaphore:
+                return await self._load_transcript(youtube_url)
+
+        results = await asyncio.gather(*(load_one(url) for url in youtube_urls), return_exceptions=True)
+
+        for youtube_url, result in zip(youtube_urls, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to load transcript from YouTube URL {youtube_url}: {result}", exc_info=result)
+                context.add_error(result)
+                continue
+            context.parsed_sources.append(result)
+            logger.success(f"Successfully loaded transcript '{result.file_name}' as {len(result.docs)} chunks.")
+
+        if not context.parsed_sources:
             context.abort()
+            return context
 
-        return context
+        # Flat view and single-source fields for downstream steps that handle one document
+        context.parsed_llama_docs = [chunk for source in context.parsed_sources for chunk in source.docs]
+        context.source_document_id = context.parsed_sources[0].document_id
+        context.source_file_name = context.parsed_sources[0].file_name
+        return context
\ No newline at end of file
@@ -2,39 +2,41 @@
 # Utility functions for the ingestion pipeline.
 
 from typing import List
-from llama_index.core.schema import Document as LlamaDocument
+from llama_index.core.schema import BaseNode
 
 
 def convert_llama_docs_to_chroma_docs(
-    llama_docs: List[LlamaDocument],
+    llama_docs: List[BaseNode],
     source_document_id: str,
     source_file_name: str
 ) -> List[dict]:
-    """Converts a list of LlamaIndex Document objects to ChromaDocument models.
+    """Converts a list of LlamaIndex Documents or nodes to ChromaDocument models.
 
     Args:
-        llama_docs: The list of documents from LlamaParse.
+        llama_docs: The documents from LlamaParse, or the nodes from chunking.
         source_document_id: The unique ID of the source document (e.g., GDrive file ID).
         source_file_name: The original filename of the source document.
 
     Returns:
         A list of document dictionaries ready for ingestion.
     """
-    chroma_docs = []
-    for doc in llama_docs:
+    # Every chunk's metadata starts from the same source fields; copying this template
+    # and updating it in C is cheaper than re-splatting both dicts per chunk.
+    base_metadata = {
+        "source_document_id": source_document_id,
+        "source_file_name": source_file_name,
+    }
+    id_prefix = f"{source_document_id}_"
+
+    chroma_docs: List[dict] = [None] * len(llama_docs)
+    for index, doc in enumerate(llama_docs):
+        metadata = base_metadata.copy()
+        metadata.update(doc.metadata)
+
         # Create a unique ID for each chunk by combining source ID and the chunk's ID
-        chunk_id = f"{source_document_id}_{doc.id_}"
-        
-        # Combine metadata
-        metadata = {
-            "source_document_id": source_document_id,
-            "source_file_name": source_file_name,
-            **doc.metadata
-        }
-        
-        chroma_docs.append({
-            "id": chunk_id,
-            "text": doc.text,
+        chroma_docs[index] = {
+            "id": id_prefix + doc.id_,
+            "document": doc.text,
             "metadata": metadata
-        })
+        }
     return chroma_docs
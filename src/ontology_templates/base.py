@@ -0,0 +1,17 @@
+# Ontology modules import pydantic names from their defining submodules
+# (pydantic.main, pydantic.fields, pydantic.config) rather than the package root,
+# which resolves every public name through a lazy module-level __getattr__.
+from pydantic.config import ConfigDict
+from pydantic.main import BaseModel
+
+
+class OntologyModel(BaseModel):
+    """
+    Base for ontology entity and relationship types.
+
+    These classes are schemas handed to Graphiti rather than records built in bulk,
+    and most of them are never used in a given process. Deferring the build means a
+    type's validator and serializer are only compiled the first time it is used
+    (e.g. when Graphiti requests its JSON schema), instead of for every type at import.
+    """
+    model_config = ConfigDict(defer_build=True)
@@ -1,6 +1,6 @@
 # src/ontology_templates/financial_report_ontology.py
 from typing import List, Optional
-from pydantic import Field
+from pydantic.fields import Field
 from .generic_ontology import BaseNode, BaseRelationship
 
 # --- Entity Types (Nodes) ---
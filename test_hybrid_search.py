@@ -37,27 +37,32 @@ async def test_hybrid_search():
                 "data science methodologies"
             ]
             
-            for query in test_queries:
-                logger.info(f"\n--- Testing Query: '{query}' ---")
-                
+            # Run the queries concurrently and report each one as soon as it finishes
+            async def run_query(query):
                 try:
-                    # Test hybrid search
-                    results = await search_system.hybrid_search(query, limit=5)
-                    
-                    logger.info(f"✅ Hybrid search successful! Found {len(results)} results")
-                    
-                    # Display results summary
-                    if results:
-                        logger.info("Top results:")
-                        formatted_results = search_system.format_search_results(results)
-                        for i, result in enumerate(formatted_results[:3], 1):
-                            logger.info(f"  {i}. {result['fact']}")
-                    else:
-                        logger.warning("No results found for this query")
-                        
+                    return query, await search_system.hybrid_search(query, limit=5), None
                 except Exception as e:
-                    logger.error(f"❌ Hybrid search failed for query '{query}': {str(e)}")
-                    logger.exception("Exception details:")
+                    return query, None, e
+            
+            for next_result in asyncio.as_completed([run_query(query) for query in test_queries]):
+                query, results, error = await next_result
+                logger.info(f"\n--- Testing Query: '{query}' ---")
+                
+                if error is not None:
+                    logger.error(f"❌ Hybrid search failed for query '{query}': {str(error)}")
+                    logger.opt(exception=error).error("Exception details:")
+                    continue
+                
+                logger.info(f"✅ Hybrid search successful! Found {len(results)} results")
+                
+                # Display results summary
+                if results:
+                    logger.info("Top results:")
+                    formatted_results = search_system.format_search_results(results)
+                    for i, result in enumerate(formatted_results[:3], 1):
+                        logger.info(f"  {i}. {result['fact']}")
+                else:
+                    logger.warning("No results found for this query")
             
             # Test entity-focused search
             logger.info(f"\n--- Testing Entity-Focused Search ---")
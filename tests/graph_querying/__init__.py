@@ -0,0 +1 @@
+# This file makes Python treat the 'graph_querying' directory within 'tests' as a package.
@@ -0,0 +1,111 @@
+"""
+Unit tests for the SemanticSearchCache used by GraphitiNativeSearcher.
+"""
+import os
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path to ensure imports work
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.graph_querying.semantic_cache import SemanticSearchCache
+
+# Mark all tests in this file as unit tests
+pytestmark = pytest.mark.unit
+
+
+class TestSemanticSearchCache:
+    """Test cases for SemanticSearchCache."""
+
+    def test_exact_hit(self):
+        """Test an exact key lookup returns the cached value."""
+        cache = SemanticSearchCache()
+        cache.put("hybrid_search:5", "What is AI?", [1.0, 0.0, 0.0], {"results": [1]})
+
+        assert cache.get_exact("hybrid_search:5", "What is AI?") == {"results": [1]}
+        assert cache.get_exact("hybrid_search:5", "What is ML?") is None
+
+    def test_semantic_hit_above_threshold(self):
+        """Test a near-duplicate embedding is served from the cache."""
+        cache = SemanticSearchCache(similarity_threshold=0.97)
+        cache.put("hybrid_search:5", "What is AI?", [1.0, 0.0, 0.0], {"results": [1]})
+
+        assert cache.get_similar("hybrid_search:5", [0.99, 0.05, 0.0]) == {"results": [1]}
+
+    def test_semantic_miss_below_threshold(self):
+        """Test a dissimilar embedding misses."""
+        cache = SemanticSearchCache(similarity_threshold=0.97)
+        cache.put("hybrid_search:5", "What is AI?", [1.0, 0.0, 0.0], {"results": [1]})
+
+        assert cache.get_similar("hybrid_search:5", [0.0, 1.0, 0.0]) is None
+
+    def test_namespaces_are_isolated(self):
+        """Test results cached for one search configuration do not satisfy another."""
+        cache = SemanticSearchCache()
+        cache.put("hybrid_search:5", "What is AI?", [1.0, 0.0, 0.0], {"results": [1]})
+
+        assert cache.get_exact("hybrid_search:10", "What is AI?") is None
+        assert cache.get_similar("hybrid_search:10", [1.0, 0.0, 0.0]) is None
+
+    def test_ttl_expiry(self):
+        """Test entries expire after the TTL."""
+        cache = SemanticSearchCache(ttl_seconds=300.0)
+        with patch("src.graph_querying.semantic_cache.time.monotonic", return_value=1000.0):
+            cache.put("ns", "q", [1.0, 0.0], "value")
+        with patch("src.graph_querying.semantic_cache.time.monotonic", return_value=1301.0):
+            assert cache.get_exact("ns", "q") is None
+            assert cache.get_similar("ns", [1.0, 0.0]) is None
+
+    def test_eviction_of_oldest_entry(self):
+        """Test the oldest entry is evicted once the cache is full."""
+        cache = SemanticSearchCache(max_entries=2)
+        cache.put("ns", "a", [1.0, 0.0, 0.0], "A")
+        cache.put("ns", "b", [0.0, 1.0, 0.0], "B")
+        cache.put("ns", "c", [0.0, 0.0, 1.0], "C")
+
+        assert len(cache) == 2
+        assert cache.get_exact("ns", "a") is None
+        assert cache.get_similar("ns", [1.0, 0.0, 0.0]) is None
+        assert cache.get_exact("ns", "c") == "C"
+
+    def test_put_ignores_zero_and_mismatched_embeddings(self):
+        """Test degenerate embeddings are not cached."""
+        cache = SemanticSearchCache()
+        cache.put("ns", "zero", [0.0, 0.0], "Z")
+        cache.put("ns", "ok", [1.0, 0.0], "OK")
+        cache.put("ns", "wrong_dim", [1.0, 0.0, 0.0], "W")
+
+        assert cache.get_exact("ns", "zero") is None
+        assert cache.get_exact("ns", "wrong_dim") is None
+        assert cache.get_similar("ns", [1.0, 0.0, 0.0]) is None
+        assert cache.get_exact("ns", "ok") == "OK"
+
+
+@pytest.mark.asyncio
+class TestSearchCacheSharing:
+    """Test cases for the search cache shared between GraphitiNativeSearcher instances."""
+
+    async def test_hit_across_searcher_instances(self):
+        """Test a result cached by one searcher is served to the next one created."""
+        from src.graph_querying.graphiti_native_search import GraphitiNativeSearcher
+
+        env = {
+            "NEO4J_URI": "bolt://cache-sharing-test:7687",
+            "NEO4J_USERNAME": "neo4j",
+            "NEO4J_PASSWORD": "password",
+            "GOOGLE_CLOUD_PROJECT": "test-project"
+        }
+        with patch.dict(os.environ, env):
+            first = GraphitiNativeSearcher()
+            first.search_cache.put("hybrid_search:5", "What is AI?", [1.0, 0.0, 0.0], {"results": [1]})
+
+            second = GraphitiNativeSearcher()
+            cached, query_embedding = await second._lookup_cache("hybrid_search:5", "What is AI?")
+
+        assert second.search_cache is first.search_cache
+        assert cached == {"results": [1], "query": "What is AI?"}
+        assert query_embedding is None
@@ -0,0 +1 @@
+# This file makes Python treat the 'ingestion' directory within 'tests' as a package.
@@ -0,0 +1,299 @@
+"""
+Unit tests for the modular ingestion pipeline core (IngestionContext, IngestionPipeline).
+"""
+import asyncio
+import sys
+import pytest
+from pathlib import Path
+
+# Add project root to path to ensure imports work
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.ingestion.pipeline import IngestionPipeline, IngestionStep, IngestionContext, ParallelSteps, ParsedSource
+
+# Mark all tests in this file as unit tests
+pytestmark = pytest.mark.unit
+
+
+class RecordingStep(IngestionStep):
+    """Step that records its invocation and optionally writes to the context."""
+
+    def __init__(self, calls, updates=None, error=None):
+        self.calls = calls
+        self.updates = updates or {}
+        self.error = error
+
+    async def run(self, context: IngestionContext) -> IngestionContext:
+        self.calls.append(self)
+        if self.error:
+            raise self.error
+        for key, value in self.updates.items():
+            context.set(key, value)
+        return context
+
+
+class TestIngestionContext:
+    """Test cases for IngestionContext."""
+
+    def test_from_dict_routes_known_and_extra_keys(self):
+        """Test known keys become attributes and unknown keys land in extras."""
+        context = IngestionContext.from_dict({"documents": ["doc"], "custom_flag": True})
+
+        assert context.documents == ["doc"]
+        assert context.extras == {"custom_flag": True}
+        assert context.get("custom_flag") is True
+
+    def test_get_set_shim_matches_attributes(self):
+        """Test the get/set shim reads and writes the typed attributes."""
+        context = IngestionContext()
+        context.set("ingested_neo4j_nodes", 3)
+
+        assert context.ingested_neo4j_nodes == 3
+        assert context.get("ingested_neo4j_nodes") == 3
+        assert context.get("graph_extraction_data", {}) == {}
+        assert context.get("missing", "fallback") == "fallback"
+
+    def test_iter_parsed_sources(self):
+        """Test grouped sources win, and flat single-source fields are wrapped as one source."""
+        assert IngestionContext().iter_parsed_sources() == []
+
+        flat = IngestionContext(parsed_llama_docs=["chunk"], source_document_id="id", source_file_name="a.pdf")
+        assert flat.iter_parsed_sources() == [ParsedSource("id", "a.pdf", ["chunk"])]
+
+        grouped = [ParsedSource("1", "a.pdf", ["a"]), ParsedSource("2", "b.pdf", ["b"])]
+        assert IngestionContext(parsed_sources=grouped).iter_parsed_sources() == grouped
+
+    def test_slots_reject_unknown_attributes(self):
+        """Test the context does not grow ad-hoc attributes."""
+        with pytest.raises(AttributeError):
+            IngestionContext().unknown_key = 1
+
+
+@pytest.mark.asyncio
+class TestIngestionPipeline:
+    """Test cases for IngestionPipeline."""
+
+    async def test_runs_all_steps_in_order(self):
+        """Test every step runs when documents are present."""
+        calls = []
+        first = RecordingStep(calls, updates={"documents": ["doc"]})
+        second = RecordingStep(calls, updates={"parsed_llama_docs": ["chunk"]})
+        third = RecordingStep(calls)
+
+        context = await IngestionPipeline([first, second, third]).run()
+
+        assert calls == [first, second, third]
+        assert context.get("parsed_llama_docs") == ["chunk"]
+        assert not context.errors
+
+    async def test_short_circuits_when_no_documents(self):
+        """Test remaining steps are skipped when a step yields no documents."""
+        calls = []
+        loader = RecordingStep(calls, updates={"documents": []})
+        downstream = RecordingStep(calls)
+
+        context = await IngestionPipeline([loader, downstream]).run({"gdrive_folder_id": "folder"})
+
+        assert calls == [loader]
+        assert not context.errors
+        assert not context.is_aborted
+
+    async def test_aborts_on_step_error(self):
+        """Test a failing step records the error and stops the pipeline."""
+        calls = []
+        failing = RecordingStep(calls, error=ValueError("boom"))
+        downstream = RecordingStep(calls)
+
+        context = await IngestionPipeline([failing, downstream]).run({"documents": ["doc"]})
+
+        assert calls == [failing]
+        assert context.is_aborted
+        assert len(context.errors) == 1
+
+
+async def _contexts(*items):
+    for item in items:
+        yield item
+
+
+class GatedStep(IngestionStep):
+    """Step that records start/finish events and waits on an optional gate."""
+
+    def __init__(self, label, events, gate=None):
+        self.label = label
+        self.events = events
+        self.gate = gate
+
+    async def run(self, context: IngestionContext) -> IngestionContext:
+        doc = context.get("documents")[0]
+        self.events.append((self.label, doc, "start"))
+        if self.gate is not None and doc == "doc1":
+            await self.gate.wait()
+        self.events.append((self.label, doc, "end"))
+        return context
+
+
+@pytest.mark.asyncio
+class TestIngestionPipelineStream:
+    """Test cases for IngestionPipeline.run_stream."""
+
+    async def test_preserves_input_order(self):
+        """Test every input comes out once, in input order, after all steps."""
+        calls = []
+        pipeline = IngestionPipeline([RecordingStep(calls), RecordingStep(calls)])
+
+        results = [ctx async for ctx in pipeline.run_stream(_contexts(*({"documents": [i]} for i in range(5))))]
+
+        assert [ctx.get("documents") for ctx in results] == [[i] for i in range(5)]
+        assert len(calls) == 10
+
+    async def test_steps_overlap_across_inputs(self):
+        """Test the first step handles the next input while a later step is still busy."""
+        events = []
+        gate = asyncio.Event()
+        first = GatedStep("first", events)
+        second = GatedStep("second", events, gate=gate)
+        pipeline = IngestionPipeline([first, second])
+
+        async def release_when_overlapped():
+            while ("first", "doc2", "end") not in events:
+                await asyncio.sleep(0)
+            gate.set()
+
+        releaser = asyncio.create_task(release_when_overlapped())
+        results = [ctx async for ctx in pipeline.run_stream(_contexts({"documents": ["doc1"]}, {"documents": ["doc2"]}))]
+        await releaser
+
+        assert len(results) == 2
+        assert events.index(("first", "doc2", "end")) < events.index(("second", "doc1", "end"))
+
+    async def test_failure_is_isolated_to_its_input(self):
+        """Test a failing input skips its remaining steps without affecting the others."""
+        calls = []
+
+        class FailOnBadDoc(IngestionStep):
+            async def run(self, context: IngestionContext) -> IngestionContext:
+                if context.get("documents") == ["bad"]:
+                    raise ValueError("boom")
+                return context
+
+        downstream = RecordingStep(calls)
+        pipeline = IngestionPipeline([FailOnBadDoc(), downstream])
+
+        results = [ctx async for ctx in pipeline.run_stream(_contexts({"documents": ["bad"]}, {"documents": ["good"]}))]
+
+        assert results[0].is_aborted and len(results[0].errors) == 1
+        assert not results[1].errors
+        assert len(calls) == 1
+
+    async def test_batch_hooks_wrap_the_stream(self):
+        """Test every step is told when the stream starts and ends."""
+        events = []
+
+        class BatchingStep(RecordingStep):
+            async def begin_batch(self, batch):
+                events.append("begin")
+
+            async def end_batch(self, batch):
+                events.append("end")
+
+        calls = []
+        step = BatchingStep(calls)
+        results = [ctx async for ctx in IngestionPipeline([step]).run_stream(_contexts({"documents": ["doc"]}))]
+
+        assert len(results) == 1
+        assert events == ["begin", "end"]
+
+    async def test_batch_state_is_scoped_to_the_stream(self):
+        """Test streamed contexts share the stream's batch dict, and single runs get none."""
+        seen = []
+
+        class BatchingStep(RecordingStep):
+            async def begin_batch(self, batch):
+                batch[self] = "stream state"
+
+            async def run(self, context):
+                seen.append(context.batch.get(self) if context.batch is not None else None)
+                return context
+
+        step = BatchingStep([])
+        pipeline = IngestionPipeline([step])
+        results = [ctx async for ctx in pipeline.run_stream(_contexts({"documents": ["a"]}, {"documents": ["b"]}))]
+        await pipeline.run({"documents": ["c"]})
+
+        assert seen == ["stream state", "stream state", None]
+        assert results[0].batch is results[1].batch
+
+    async def test_producer_error_propagates(self):
+        """Test an exception from the input stream is raised to the consumer."""
+        async def failing_inputs():
+            yield {"documents": ["doc"]}
+            raise RuntimeError("listing failed")
+
+        pipeline = IngestionPipeline([RecordingStep([])])
+        with pytest.raises(RuntimeError, match="listing failed"):
+            async for _ in pipeline.run_stream(failing_inputs()):
+                pass
+
+
+@pytest.mark.asyncio
+class TestParallelSteps:
+    """Test cases for running independent steps concurrently."""
+
+    async def test_steps_run_concurrently(self):
+        """Test both steps are in flight at the same time and both write to the context."""
+        both_started = asyncio.Event()
+        started = []
+
+        class WaitingStep(IngestionStep):
+            def __init__(self, key):
+                self.key = key
+
+            async def run(self, context):
+                started.append(self.key)
+                if len(started) == 2:
+                    both_started.set()
+                await asyncio.wait_for(both_started.wait(), timeout=5)
+                context.set(self.key, 1)
+                return context
+
+        step = ParallelSteps([WaitingStep("ingested_neo4j_nodes"), WaitingStep("ingested_chroma_docs_count")])
+        context = await step.run(IngestionContext())
+
+        assert context.ingested_neo4j_nodes == 1
+        assert context.ingested_chroma_docs_count == 1
+
+    async def test_failure_is_recorded_without_cancelling_siblings(self):
+        """Test a failing step aborts the context while its sibling still completes."""
+        calls = []
+        step = ParallelSteps([
+            RecordingStep(calls, error=RuntimeError("chroma down")),
+            RecordingStep(calls, updates={"ingested_neo4j_nodes": 2}),
+        ])
+
+        context = await step.run(IngestionContext())
+
+        assert len(calls) == 2
+        assert context.is_aborted
+        assert [str(e) for e in context.errors] == ["chroma down"]
+        assert context.ingested_neo4j_nodes == 2
+
+    async def test_batch_hooks_reach_children(self):
+        """Test begin_batch/end_batch are forwarded to every child step."""
+        events = []
+
+        class BatchingStep(RecordingStep):
+            async def begin_batch(self, batch):
+                events.append("begin")
+
+            async def end_batch(self, batch):
+                events.append("end")
+
+        step = ParallelSteps([BatchingStep([]), BatchingStep([])])
+        await step.begin_batch({})
+        await step.end_batch({})
+
+        assert events == ["begin", "begin", "end", "end"]
+        assert step.name == "ParallelSteps(BatchingStep, BatchingStep)"
@@ -0,0 +1,108 @@
+"""
+Unit tests for the persistent ingestion result cache.
+"""
+import hashlib
+import sys
+import pytest
+from pathlib import Path
+
+# Add project root to path to ensure imports work
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from src.ingestion.result_cache import ExtractionResultCache, IngestionResultCache, hash_file, hash_ontology, hash_texts
+
+# Mark all tests in this file as unit tests
+pytestmark = pytest.mark.unit
+
+
+class TestIngestionResultCache:
+    """Test cases for IngestionResultCache and hash_file."""
+
+    def test_hash_file_matches_sha256(self, tmp_path):
+        """Test the file hash is the SHA-256 of its contents."""
+        file_path = tmp_path / "doc.txt"
+        file_path.write_bytes(b"hello graph")
+
+        assert hash_file(file_path) == hashlib.sha256(b"hello graph").hexdigest()
+
+    def test_round_trip_persists_across_instances(self, tmp_path):
+        """Test a stored summary is readable from a fresh cache instance."""
+        key = IngestionResultCache.make_key("abc", "bolt://localhost:7687")
+        IngestionResultCache(tmp_path).set(key, {"ingested_neo4j_nodes": 3, "errors": []})
+
+        assert IngestionResultCache(tmp_path).get(key) == {"ingested_neo4j_nodes": 3, "errors": []}
+
+    def test_key_depends_on_target(self):
+        """Test the same content ingested into different stores gets different keys."""
+        assert IngestionResultCache.make_key("abc", "bolt://a") != IngestionResultCache.make_key("abc", "bolt://b")
+
+    def test_hash_texts_is_stable_and_ordered(self):
+        """Test the texts hash only depends on the texts and their order."""
+        assert hash_texts(["a", "b"]) == hash_texts(iter(["a", "b"]))
+        assert hash_texts(["a", "b"]) != hash_texts(["b", "a"])
+        assert hash_texts(["ab"]) != hash_texts(["a", "b"])
+
+    def test_miss_and_corrupt_entry(self, tmp_path):
+        """Test missing and unreadable entries are treated as misses."""
+        cache = IngestionResultCache(tmp_path)
+        assert cache.get("missing") is None
+
+        (tmp_path / "corrupt.json").write_text("{not json")
+        assert cache.get("corrupt") is None
+
+
+class Person(BaseModel):
+    name: str
+
+
+class Company(BaseModel):
+    name: str
+
+
+class TestExtractionResultCache:
+    """Test cases for ExtractionResultCache and hash_ontology."""
+
+    def test_ontology_hash_changes_with_ontology(self):
+        """Test a different ontology produces a different hash."""
+        assert hash_ontology((Person,), ()) == hash_ontology((Person,), ())
+        assert hash_ontology((Person,), ()) != hash_ontology((Person, Company), ())
+
+    def test_ontology_hash_tracks_fields_without_building_schemas(self):
+        """Test field changes alter the hash and deferred models stay unbuilt."""
+        def make_model(description: str):
+            class Item(BaseModel):
+                model_config = ConfigDict(defer_build=True)
+                name: str = Field(..., description=description)
+            return Item
+
+        first, same, other = make_model("The name."), make_model("The name."), make_model("Another description.")
+
+        assert hash_ontology((first,), ()) == hash_ontology((same,), ())
+        assert hash_ontology((first,), ()) != hash_ontology((other,), ())
+        assert not first.__pydantic_complete__
+
+    def test_key_depends_on_ontology_group_and_text(self):
+        """Test keys differ when the ontology, the group or the text differs."""
+        key = ExtractionResultCache.make_key("onto-a", "doc-1", "some text")
+        assert key == ExtractionResultCache.make_key("onto-a", "doc-1", "some text")
+        assert key != ExtractionResultCache.make_key("onto-b", "doc-1", "some text")
+        assert key != ExtractionResultCache.make_key("onto-a", "doc-2", "some text")
+        assert key != ExtractionResultCache.make_key("onto-a", "doc-1", "other text")
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently read entry is evicted first once full."""
+        cache = ExtractionResultCache(max_entries=2)
+        cache.set("a", {"nodes": [1]})
+        cache.set("b", {"nodes": [2]})
+        assert cache.get("a") == {"nodes": [1]}
+
+        cache.set("c", {"nodes": [3]})
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == {"nodes": [1]}
+        assert cache.get("c") == {"nodes": [3]}
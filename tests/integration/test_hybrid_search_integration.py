@@ -34,13 +34,25 @@ pytestmark = pytest.mark.skipif(
     reason="Integration tests require .env file with valid credentials"
 )
 
+# Load environment variables once for all fixtures
+load_dotenv()
+
 
 @pytest.fixture(scope="module")
-def neo4j_driver():
-    """Create a real Neo4j driver instance for testing."""
-    # Load environment variables
-    load_dotenv()
+def vcr_config():
+    """Cassette settings for @pytest.mark.vcr tests; cassettes live under tests/integration/cassettes/."""
+    return {
+        # Keep API keys out of recorded cassettes
+        "filter_headers": ["authorization", "x-goog-api-key"],
+        "filter_query_parameters": ["key"],
+        # Gemini calls are all POSTs to the same path, so the body tells the queries apart
+        "match_on": ["method", "scheme", "host", "path", "body"],
+    }
+
 
+@pytest.fixture(scope="session")
+def neo4j_driver():
+    """Create a real Neo4j driver instance, shared by all tests in the session."""
     uri = os.getenv("NEO4J_URI")
     user = os.getenv("NEO4J_USER")
     password = os.getenv("NEO4J_PASSWORD")
@@ -49,15 +61,19 @@ def neo4j_driver():
     if not all([uri, user, password]):
         pytest.skip("Neo4j credentials not configured in .env file")
 
-    # Create driver
-    driver = GraphDatabase.driver(uri, auth=(user, password))
+    # Create driver with a pool sized for concurrent test queries
+    driver = GraphDatabase.driver(
+        uri,
+        auth=(user, password),
+        max_connection_pool_size=int(os.getenv("NEO4J_POOL_SIZE", "50")),
+        connection_acquisition_timeout=30.0,
+        max_connection_lifetime=1800,
+        keep_alive=True
+    )
 
     # Verify connection
     try:
-        with driver.session() as session:
-            result = session.run("RETURN 1 as test").single()
-            if result["test"] != 1:
-                pytest.skip("Failed to connect to Neo4j")
+        driver.verify_connectivity()
     except Exception as e:
         pytest.skip(f"Error connecting to Neo4j: {e}")
 
@@ -67,12 +83,9 @@ def neo4j_driver():
     driver.close()
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def gemini_models():
-    """Create real Gemini model instances for testing."""
-    # Load environment variables
-    load_dotenv()
-
+    """Create real Gemini model instances, verified once per test session."""
     api_key = os.getenv("GOOGLE_API_KEY")
 
     # Skip if API key is missing
@@ -138,6 +151,9 @@ def hybrid_search_engine(neo4j_driver, gemini_models):
     return engine
 
 
+# Keep these tests on one xdist worker (with --dist loadgroup) so they share the
+# session-scoped driver and model fixtures instead of rebuilding them per worker.
+@pytest.mark.xdist_group("hybrid_search")
 class TestHybridSearchIntegration:
     """Integration tests for HybridSearchEngine with real services."""
 
@@ -173,8 +189,9 @@ class TestHybridSearchIntegration:
             assert isinstance(item["score"], float)
             assert 0 <= item["score"] <= 1
 
+    @pytest.mark.vcr
     def test_full_query_pipeline(self, hybrid_search_engine):
-        """Test the complete query pipeline with real services."""
+        """Test the complete query pipeline, replaying recorded Gemini responses."""
         query = "What is hybrid search?"
 
         # Call the full query method
@@ -6,10 +6,14 @@ testing the interaction between components with external APIs mocked.
 """
 import os
 import sys
+import numpy as np
 import pytest
+from chromadb.errors import InternalError
 from datetime import datetime
 from pathlib import Path
-from unittest.mock import MagicMock, patch, ANY
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch, ANY
+from tenacity import wait_none
 
 # Add project root to path to ensure imports work
 project_root = str(Path(__file__).parent.parent.parent)
@@ -25,6 +29,20 @@ from utils.config_models import LlamaParseConfig, ChromaDBConfig
 # Mark all tests in this file as integration tests
 pytestmark = pytest.mark.integration
 
+# 500-dim float32 vector returned by the mocked embedding client
+_MOCK_EMBEDDING = np.tile(np.array([0.1, 0.2, 0.3, 0.4, 0.5], dtype=np.float32), 100)
+
+@pytest.fixture(scope="session", autouse=True)
+def google_api_key_env():
+    """Set a test Google API key once for the whole session, restoring the original afterwards."""
+    original_key = os.environ.get("GOOGLE_API_KEY")
+    os.environ["GOOGLE_API_KEY"] = "test-api-key"
+    yield
+    if original_key is None:
+        del os.environ["GOOGLE_API_KEY"]
+    else:
+        os.environ["GOOGLE_API_KEY"] = original_key
+
 @pytest.fixture
 def mock_llama_parser():
     """Mock LlamaParse client."""
@@ -32,12 +50,11 @@ def mock_llama_parser():
         mock_parser = MagicMock()
         mock_parser_class.return_value = mock_parser
         
-        # Setup mock parse response
-        mock_response = [
-            {"text": "Sample document content page 1.", "page_or_section_index": 0, "metadata": {"page": 1}},
-            {"text": "Sample document content page 2.", "page_or_section_index": 1, "metadata": {"page": 2}}
-        ]
-        mock_parser.parse_document.return_value = mock_response
+        # DocumentParser.parse_file calls parse() and reads the pages of the returned JobResult
+        mock_parser.parse.return_value = SimpleNamespace(pages=[
+            SimpleNamespace(page=1, text="Sample document content page 1."),
+            SimpleNamespace(page=2, text="Sample document content page 2.")
+        ])
         
         yield mock_parser
 
@@ -49,22 +66,22 @@ def mock_embedding_client():
         mock_client_class.return_value = mock_client
         
         # Mock embeddings response
-        mock_embeddings = [0.1, 0.2, 0.3, 0.4, 0.5] * 100  # 500-dim vector
-        mock_response = {"embeddings": [mock_embeddings]}
+        mock_response = {"embeddings": [_MOCK_EMBEDDING]}
         mock_client.models.embed_content.return_value = mock_response
         
         yield mock_client
 
 @pytest.fixture
 def mock_chromadb_client():
-    """Mock ChromaDB client."""
-    with patch("utils.chroma_ingester.chromadb.HttpClient") as mock_client_class:
+    """Mock ChromaDB async client."""
+    with patch("utils.chroma_ingester.chromadb.AsyncHttpClient", new_callable=AsyncMock) as mock_client_class:
         mock_client = MagicMock()
         mock_client_class.return_value = mock_client
         
         # Mock collection
         mock_collection = MagicMock()
-        mock_client.get_or_create_collection.return_value = mock_collection
+        mock_collection.upsert = AsyncMock()
+        mock_client.get_or_create_collection = AsyncMock(return_value=mock_collection)
         
         yield mock_client
 
@@ -88,48 +105,55 @@ def mock_neo4j_driver():
     
     return mock_driver
 
-@pytest.fixture
-def sample_document_path(tmp_path):
-    """Create a sample document file for testing."""
-    doc_path = tmp_path / "test_document.txt"
-    with open(doc_path, 'w') as f:
-        f.write("This is a test document.\nIt has multiple lines of content.")
+@pytest.fixture(scope="session")
+def sample_document_path(tmp_path_factory):
+    """Create a sample document file once per session; tests only read it."""
+    doc_path = tmp_path_factory.mktemp("docs") / "test_document.txt"
+    doc_path.write_text("This is a test document.\nIt has multiple lines of content.")
     return doc_path
 
+@pytest.fixture
+def pipeline_components(mock_llama_parser, mock_embedding_client, mock_chromadb_client, mock_neo4j_driver):
+    """Parser, embedding model and both ingesters, built against the mocked clients."""
+    # The genai client picks GOOGLE_API_KEY up from the environment (see google_api_key_env)
+    embedding_model = CustomGeminiEmbedding(
+        model_name="models/gemini-embedding-test-model",
+        output_dimensionality=500
+    )
+    return SimpleNamespace(
+        parser=DocumentParser(config=LlamaParseConfig(api_key="test-llama-api-key")),
+        embedding_model=embedding_model,
+        chroma_ingester=ChromaIngester(
+            config=ChromaDBConfig(
+                host="localhost",
+                port=8000,
+                collection_name="test_collection",
+                auth_enabled=False
+            ),
+            embedding_model=embedding_model
+        ),
+        neo4j_ingester=Neo4jIngester(mock_neo4j_driver)
+    )
+
 
 class TestDocumentProcessingPipeline:
     """Integration tests for the full document processing pipeline."""
 
-    def test_end_to_end_document_processing(
+    @pytest.mark.asyncio
+    async def test_end_to_end_document_processing(
         self, 
         sample_document_path, 
         mock_llama_parser, 
         mock_embedding_client, 
         mock_chromadb_client, 
         mock_neo4j_driver, 
-        monkeypatch
+        pipeline_components
     ):
         """Test the full pipeline from document parsing to storage."""
-        # Set environment variable for API key
-        monkeypatch.setenv("GOOGLE_API_KEY", "test-api-key")
-        
-        # Initialize components
-        parser_config = LlamaParseConfig(api_key="test-llama-api-key")
-        parser = DocumentParser(config=parser_config)
-        
-        embedding_model = CustomGeminiEmbedding(
-            google_api_key="test-api-key",
-            model_name="gemini-embedding-test-model"
-        )
-        
-        chroma_config = ChromaDBConfig(
-            host="localhost",
-            port=8000,
-            collection_name="test_collection"
-        )
-        chroma_ingester = ChromaIngester(config=chroma_config)
-        
-        neo4j_ingester = Neo4jIngester(mock_neo4j_driver)
+        parser = pipeline_components.parser
+        embedding_model = pipeline_components.embedding_model
+        chroma_ingester = pipeline_components.chroma_ingester
+        neo4j_ingester = pipeline_components.neo4j_ingester
         
         # Process document: Parse -> Embed -> Store
         
@@ -142,13 +166,13 @@ class TestDocumentProcessingPipeline:
         
         # 2. Generate embedding
         embedding = embedding_model._get_text_embedding(concatenated_text)
-        assert len(embedding) > 0
+        assert embedding.shape[0] == 500
         
         # Check that the embedding API was called with the right parameters
         mock_embedding_client.models.embed_content.assert_called_once()
         args, kwargs = mock_embedding_client.models.embed_content.call_args
         assert "Sample document content page" in kwargs["contents"]
-        assert kwargs["model"] == "gemini-embedding-test-model"
+        assert kwargs["model"] == "models/gemini-embedding-test-model"
         
         # 3. Ingest to ChromaDB
         doc_id = "test_doc_001"
@@ -158,22 +182,25 @@ class TestDocumentProcessingPipeline:
             "mime_type": "text/plain"
         }
         
-        chroma_ingester.ingest_document(
-            doc_id=doc_id, 
-            content=concatenated_text, 
-            embedding=embedding, 
-            metadata=metadata
-        )
+        await chroma_ingester.async_init()
+        await chroma_ingester.ingest_documents([
+            {"id": doc_id, "document": concatenated_text, "metadata": metadata}
+        ])
         
         # Check that ChromaDB collection was created and document added
-        mock_chromadb_client.get_or_create_collection.assert_called_once_with(
+        mock_chromadb_client.get_or_create_collection.assert_awaited_once_with(
             name="test_collection",
-            metadata=ANY
+            metadata=ANY,
+            embedding_function=None
         )
         
-        # Get the mock collection and check upsert was called
+        # Get the mock collection and check the document was upserted with its embedding
         mock_collection = mock_chromadb_client.get_or_create_collection.return_value
-        mock_collection.upsert.assert_called_once()
+        mock_collection.upsert.assert_awaited_once()
+        upsert_kwargs = mock_collection.upsert.call_args.kwargs
+        assert upsert_kwargs["ids"] == [doc_id]
+        assert upsert_kwargs["documents"] == [concatenated_text]
+        assert len(upsert_kwargs["embeddings"][0]) == 500
         
         # 4. Ingest to Neo4j
         document_data = DocumentIngestionData(
@@ -187,126 +214,115 @@ class TestDocumentProcessingPipeline:
             metadata=metadata
         )
         
-        neo4j_ingester.ingest_document(document_data)
+        neo4j_ingester.ingest_documents([document_data])
         
-        # Check that Neo4j session.run was called
+        # Check that Neo4j session.run was called once for the whole batch
         mock_session = mock_neo4j_driver.session.return_value.__enter__.return_value
         mock_session.run.assert_called_once()
         
-        # Get the query and params used for Neo4j
+        # Get the query and rows used for Neo4j
         args, kwargs = mock_session.run.call_args
         query = args[0]
-        params = kwargs
+        rows = kwargs["rows"]
         
-        # Check that query contains MERGE operation
-        assert "MERGE (d:Document {doc_id: $doc_id})" in query
-        assert params["doc_id"] == "test_doc_001"
-        assert "Sample document content" in params["content"]
+        # Check that query is an UNWIND-batched MERGE
+        assert query.startswith("UNWIND")
+        assert "MERGE (d:Document {doc_id: row.doc_id})" in query
+        assert rows[0]["doc_id"] == "test_doc_001"
+        assert "Sample document content" in rows[0]["props"]["content"]
 
-    def test_error_recovery_between_components(
+    def test_page_embeddings_use_one_request(
         self, 
         sample_document_path, 
         mock_llama_parser, 
-        mock_embedding_client, 
-        mock_chromadb_client, 
-        mock_neo4j_driver, 
-        monkeypatch
+        mock_embedding_client
     ):
-        """Test error recovery and retries between pipeline components."""
-        # Set environment variable for API key
-        monkeypatch.setenv("GOOGLE_API_KEY", "test-api-key")
+        """Test parsed pages are embedded together in a single embed_content call."""
+        parser = DocumentParser(config=LlamaParseConfig(api_key="test-llama-api-key"))
+        embedding_model = CustomGeminiEmbedding(model_name="models/gemini-embedding-test-model", output_dimensionality=500)
         
-        # Initialize components
-        parser_config = LlamaParseConfig(api_key="test-llama-api-key")
-        parser = DocumentParser(config=parser_config)
+        mock_embedding_client.models.embed_content.return_value = {"embeddings": [_MOCK_EMBEDDING, _MOCK_EMBEDDING]}
         
-        embedding_model = CustomGeminiEmbedding(
-            google_api_key="test-api-key",
-            model_name="gemini-embedding-test-model"
-        )
-        
-        chroma_config = ChromaDBConfig(
-            host="localhost",
-            port=8000,
-            collection_name="test_collection"
-        )
-        chroma_ingester = ChromaIngester(config=chroma_config)
+        # parse_file returns one dict per page
+        parsed_content = parser.parse_file(sample_document_path)
+        assert [item["page_or_section_index"] for item in parsed_content] == [1, 2]
+        embeddings = embedding_model.get_text_embedding_batch([item["text"] for item in parsed_content])
         
-        neo4j_ingester = Neo4jIngester(mock_neo4j_driver)
+        assert len(embeddings) == 2
+        assert mock_embedding_client.models.embed_content.call_count == 1
+        args, kwargs = mock_embedding_client.models.embed_content.call_args
+        assert kwargs["contents"] == ["Sample document content page 1.", "Sample document content page 2."]
+
+    @pytest.mark.asyncio
+    async def test_error_recovery_between_components(
+        self, 
+        sample_document_path, 
+        mock_llama_parser, 
+        mock_embedding_client, 
+        mock_chromadb_client, 
+        mock_neo4j_driver, 
+        pipeline_components
+    ):
+        """Test how each component surfaces a failure and recovers on the next attempt."""
+        parser = pipeline_components.parser
+        embedding_model = pipeline_components.embedding_model
+        chroma_ingester = pipeline_components.chroma_ingester
         
-        # Simulate parse error first, then success on retry
-        mock_llama_parser.parse_document.side_effect = [
+        # Simulate parse error first, then success
+        mock_llama_parser.parse.side_effect = [
             Exception("Temporary parsing error"),
-            [
-                {"text": "Sample document content.", "page_or_section_index": 0, "metadata": {"page": 1}}
-            ]
+            SimpleNamespace(pages=[SimpleNamespace(page=1, text="Sample document content.")])
         ]
         
-        # Process document
+        # parse_file logs a failed parse and returns no pages; the caller tries again
         with patch("utils.document_parser.logger.error") as mock_error_log:
-            parsed_content = parser.parse_file(sample_document_path)
-            
-            # Should have logged the first error
+            assert parser.parse_file(sample_document_path) == []
             mock_error_log.assert_called_once()
             assert "Temporary parsing error" in str(mock_error_log.call_args)
             
-            # Should have succeeded on retry
+            parsed_content = parser.parse_file(sample_document_path)
             assert len(parsed_content) == 1
+            mock_error_log.assert_called_once()
         
         # Simulate embedding API error, then success
-        original_embed_content = mock_embedding_client.models.embed_content
         mock_embedding_client.models.embed_content.side_effect = [
             Exception("API rate limit"),
-            {"embeddings": [[0.1, 0.2, 0.3, 0.4, 0.5] * 100]}
+            {"embeddings": [_MOCK_EMBEDDING]}
         ]
         
-        # Try to embed - with patched retry mechanism
-        with patch("utils.embedding.logger.warning") as mock_warning_log:
-            embedding = embedding_model._get_text_embedding(parsed_content[0]["text"])
+        # Embedding errors are logged and re-raised, not retried
+        with patch("utils.embedding.logger.error") as mock_error_log:
+            with pytest.raises(Exception, match="API rate limit"):
+                embedding_model._get_text_embedding(parsed_content[0]["text"])
+            assert mock_error_log.called
             
-            # Should have logged the warning about retry
-            assert mock_warning_log.called
-            assert len(embedding) > 0
+            embedding = embedding_model._get_text_embedding(parsed_content[0]["text"])
+            assert embedding.shape[0] == 500
         
-        # Reset side effect
-        mock_embedding_client.models.embed_content = original_embed_content
+        mock_embedding_client.models.embed_content.side_effect = None
         
-        # Simulate ChromaDB error then success
+        # Simulate a ChromaDB error, then success
+        await chroma_ingester.async_init()
         mock_collection = mock_chromadb_client.get_or_create_collection.return_value
-        original_upsert = mock_collection.upsert
         mock_collection.upsert.side_effect = [
-            Exception("ChromaDB temporary error"),
+            InternalError("ChromaDB temporary error"),
             None
         ]
+        documents = [{"id": "test_doc_001", "document": parsed_content[0]["text"], "metadata": {"filename": "test.txt"}}]
         
-        # Try to ingest to ChromaDB - with patched retry mechanism
-        with patch("utils.chroma_ingester.retry") as mock_retry:
-            # Configure mock retry to still call the target function
-            def fake_retry(func):
-                return func
-            mock_retry.side_effect = fake_retry
+        # ingest_documents retries ChromaDB errors; skip the backoff between attempts
+        with patch.object(ChromaIngester.ingest_documents.retry, "wait", wait_none()), \
+                patch("utils.chroma_ingester.logger.error") as mock_error_log:
+            assert await chroma_ingester.ingest_documents(documents) is True
             
-            with patch("utils.chroma_ingester.logger.warning") as mock_warning_log:
-                try:
-                    # First call should fail
-                    chroma_ingester.ingest_document(
-                        doc_id="test_doc_001",
-                        content=parsed_content[0]["text"],
-                        embedding=embedding,
-                        metadata={"filename": "test.txt"}
-                    )
-                except Exception:
-                    pass
-                
-                # Reset the side effect for second call
-                mock_collection.upsert = original_upsert
-                
-                # Second call should succeed
-                chroma_ingester.ingest_document(
-                    doc_id="test_doc_001",
-                    content=parsed_content[0]["text"],
-                    embedding=embedding,
-                    metadata={"filename": "test.txt"}
-                )
-                
-                assert mock_warning_log.called
+            assert mock_collection.upsert.await_count == 2
+            mock_error_log.assert_called_once()
+            assert "ChromaDB temporary error" in str(mock_error_log.call_args)
+        
+        # Any other error is raised straight away
+        mock_collection.upsert.reset_mock()
+        mock_collection.upsert.side_effect = Exception("ChromaDB connection lost")
+        
+        with pytest.raises(Exception, match="ChromaDB connection lost"):
+            await chroma_ingester.ingest_documents(documents)
+        mock_collection.upsert.assert_awaited_once()
@@ -6,6 +6,7 @@ that combines knowledge graph traversal with vector similarity search.
 """
 import os
 import sys
+import threading
 import unittest
 import pytest
 from pathlib import Path
@@ -244,6 +245,28 @@ class TestHybridSearchEngine(unittest.TestCase):
                     self.assertEqual(result.graph_results, [])
                     self.assertEqual(result.vector_results, self.mock_vector_results)
 
+    def test_vector_search_overlaps_graph_search(self):
+        """Test the vector search runs while the graph search is still in progress."""
+        vector_started = threading.Event()
+        
+        def slow_extract(query_text):
+            # Only returns if the vector search started without waiting for us
+            if not vector_started.wait(timeout=5):
+                raise TimeoutError("vector search did not start concurrently")
+            return {"entities": [], "relationships": []}
+        
+        def vector_search(query_text):
+            vector_started.set()
+            return self.mock_vector_results
+        
+        with patch.object(self.engine, '_extract_query_structure', side_effect=slow_extract):
+            with patch.object(self.engine, '_vector_search', side_effect=vector_search):
+                with patch.object(self.engine, '_synthesize_response', return_value="Answer"):
+                    result = self.engine.query(self.test_query)
+        
+        self.assertIsNone(result.error)
+        self.assertEqual(result.vector_results, self.mock_vector_results)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,14 +8,14 @@ import os
 import sys
 import pytest
 from pathlib import Path
-from unittest.mock import MagicMock, patch, ANY
+from unittest.mock import AsyncMock, MagicMock, patch, ANY
 
 # Add project root to path to ensure imports work
 project_root = str(Path(__file__).parent.parent.parent)
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from utils.chroma_ingester import ChromaIngester
+from utils.chroma_ingester import ChromaIngester, get_chroma_async_client
 from utils.config_models import ChromaDBConfig
 from utils.embedding import CustomGeminiEmbedding
 
@@ -330,3 +330,21 @@ class TestChromaIngester:
         assert call_args["where"] == filters
         assert "embeddings" in call_args["include"]
         assert result == mock_query_result
+
+
+@pytest.mark.asyncio
+class TestGetChromaAsyncClient:
+    """Test cases for the shared ChromaDB async client."""
+
+    async def test_client_is_shared_per_config(self, chroma_config, auth_chroma_config):
+        """Test the same settings reuse one client and different settings get their own."""
+        with patch("utils.chroma_ingester.chromadb.AsyncHttpClient", new_callable=AsyncMock) as mock_client_cls:
+            mock_client_cls.side_effect = lambda **kwargs: MagicMock()
+
+            first = await get_chroma_async_client(chroma_config)
+            second = await get_chroma_async_client(chroma_config.model_copy())
+            other = await get_chroma_async_client(auth_chroma_config)
+
+        assert first is second
+        assert other is not first
+        assert mock_client_cls.await_count == 2
@@ -7,6 +7,8 @@ and error handling.
 """
 import os
 import sys
+import asyncio
+import threading
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock, patch, ANY
@@ -16,7 +18,7 @@ project_root = str(Path(__file__).parent.parent.parent)
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from utils.embedding import CustomGeminiEmbedding
+from utils.embedding import CustomGeminiEmbedding, EmbeddingBatcher, get_embedding_model
 
 # Mark all tests in this file as unit tests
 pytestmark = pytest.mark.unit
@@ -323,3 +325,173 @@ class TestCustomGeminiEmbedding:
         embedding_model = CustomGeminiEmbedding(google_api_key="test-api-key")
         with pytest.raises(Exception, match="API error"):
             embedding_model._get_embedding("Test text")
+
+
+    def test_rejected_batches_are_remembered(self, mock_genai_client):
+        """Test a model that rejects multi-input requests is not sent another batch."""
+        from google.genai import errors as genai_errors
+
+        embedding_model = CustomGeminiEmbedding(model_name="models/gemini-embedding-001", output_dimensionality=4)
+        batcher = embedding_model._get_batcher("RETRIEVAL_DOCUMENT")
+        rejection = genai_errors.ClientError(400, {"error": {"message": "batch not supported", "status": "INVALID_ARGUMENT"}})
+        with patch.object(CustomGeminiEmbedding, "_get_embeddings", side_effect=rejection) as mock_batch, \
+                patch.object(CustomGeminiEmbedding, "_get_embedding", side_effect=lambda text, task_type=None: [float(len(text))]):
+            assert embedding_model._get_text_embeddings(["a", "bb"]) == [[1.0], [2.0]]
+            assert embedding_model._get_text_embeddings(["ccc", "d"]) == [[3.0], [1.0]]
+
+        mock_batch.assert_called_once()
+        assert batcher.batch_supported is False
+        assert embedding_model._get_batcher("RETRIEVAL_QUERY").batch_supported is False
+
+
+class TestGetEmbeddingModel:
+    """Test cases for the shared embedding model accessor."""
+
+    def test_instances_are_shared_per_settings(self):
+        """Test the same settings return the same instance without rebuilding the client."""
+        get_embedding_model.cache_clear()
+        with patch("utils.embedding.CustomGeminiEmbedding") as mock_embedding_class:
+            mock_embedding_class.side_effect = lambda **kwargs: MagicMock()
+            first = get_embedding_model("gemini-embedding-001", 1536)
+            second = get_embedding_model("gemini-embedding-001", 1536)
+            other = get_embedding_model("gemini-embedding-001", 768)
+
+        assert first is second
+        assert other is not first
+        assert mock_embedding_class.call_count == 2
+        get_embedding_model.cache_clear()
+
+
+@pytest.mark.asyncio
+class TestEmbeddingBatcher:
+    """Test cases for coalescing concurrent embedding requests."""
+
+    async def test_concurrent_requests_share_one_call(self):
+        """Test concurrent aembed calls are served by a single batched request."""
+        model = MagicMock()
+        model._get_embeddings.side_effect = lambda texts, task_type: [[float(len(t))] for t in texts]
+        batcher = EmbeddingBatcher(model, task_type="RETRIEVAL_DOCUMENT", coalesce_delay=0.01)
+
+        results = await asyncio.gather(*[batcher.aembed(text) for text in ["a", "bb", "ccc"]])
+
+        assert results == [[1.0], [2.0], [3.0]]
+        model._get_embeddings.assert_called_once_with(["a", "bb", "ccc"], "RETRIEVAL_DOCUMENT")
+        model._get_embedding.assert_not_called()
+
+    async def test_full_batch_flushes_immediately(self):
+        """Test a full batch is flushed without waiting for the coalesce delay."""
+        model = MagicMock()
+        model._get_embeddings.side_effect = lambda texts, task_type: [[0.0] for _ in texts]
+        batcher = EmbeddingBatcher(model, max_batch_size=2, coalesce_delay=60)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.aembed("a"), batcher.aembed("b")), timeout=5
+        )
+
+        assert results == [[0.0], [0.0]]
+
+    async def test_single_request_uses_single_call(self):
+        """Test a lone request uses the single-text path."""
+        model = MagicMock()
+        model._get_embedding.return_value = [0.5]
+        batcher = EmbeddingBatcher(model, task_type="RETRIEVAL_QUERY", coalesce_delay=0.001)
+
+        assert await batcher.aembed("query") == [0.5]
+        model._get_embedding.assert_called_once_with("query", "RETRIEVAL_QUERY")
+        model._get_embeddings.assert_not_called()
+
+    async def test_falls_back_when_batches_rejected(self):
+        """Test the batcher downgrades to single-text calls when the model rejects batches."""
+        from google.genai import errors as genai_errors
+
+        model = MagicMock()
+        model._get_embeddings.side_effect = genai_errors.ClientError(400, {"error": {"message": "batch not supported"}})
+        model._get_embedding.side_effect = lambda text, task_type: [float(len(text))]
+        batcher = EmbeddingBatcher(model, coalesce_delay=0.001)
+
+        results = await asyncio.gather(batcher.aembed("a"), batcher.aembed("bb"))
+
+        assert results == [[1.0], [2.0]]
+        assert batcher.batch_supported is False
+
+    async def test_rate_limit_does_not_disable_batching(self):
+        """Test a throttled batch falls back on its own without turning batching off."""
+        from google.genai import errors as genai_errors
+
+        model = MagicMock()
+        model._get_embeddings.side_effect = [
+            genai_errors.ClientError(429, {"error": {"message": "quota", "status": "RESOURCE_EXHAUSTED"}}),
+            [[3.0], [4.0]]
+        ]
+        model._get_embedding.side_effect = lambda text, task_type: [float(len(text))]
+        batcher = EmbeddingBatcher(model, coalesce_delay=0.001)
+
+        assert await asyncio.gather(batcher.aembed("a"), batcher.aembed("bb")) == [[1.0], [2.0]]
+        assert batcher.batch_supported is True
+
+        assert await asyncio.gather(batcher.aembed("c"), batcher.aembed("d")) == [[3.0], [4.0]]
+        assert model._get_embeddings.call_count == 2
+
+    async def test_errors_propagate_to_all_waiters(self):
+        """Test a failing request fails every queued caller."""
+        model = MagicMock()
+        model._get_embeddings.side_effect = RuntimeError("network down")
+        batcher = EmbeddingBatcher(model, coalesce_delay=0.001)
+
+        results = await asyncio.gather(batcher.aembed("a"), batcher.aembed("b"), return_exceptions=True)
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    async def test_aembed_many_uses_one_call(self):
+        """Test a known list of texts is embedded with one batched request, bypassing the queue."""
+        model = MagicMock()
+        model._get_embeddings.side_effect = lambda texts, task_type: [[float(len(t))] for t in texts]
+        batcher = EmbeddingBatcher(model, task_type="RETRIEVAL_DOCUMENT", max_batch_size=2)
+
+        results = await batcher.aembed_many(["a", "bb", "ccc"])
+
+        assert results == [[1.0], [2.0], [3.0]]
+        model._get_embeddings.assert_called_once_with(["a", "bb", "ccc"], "RETRIEVAL_DOCUMENT")
+        assert await batcher.aembed_many([]) == []
+
+    async def test_flush_tasks_are_kept_until_done(self):
+        """Test in-flight flush tasks are strongly referenced and released once finished."""
+        release = threading.Event()
+
+        def embed(texts, task_type):
+            release.wait(timeout=5)
+            return [[0.0] for _ in texts]
+
+        model = MagicMock()
+        model._get_embeddings.side_effect = embed
+        batcher = EmbeddingBatcher(model, max_batch_size=2, coalesce_delay=60)
+
+        waiters = asyncio.gather(batcher.aembed("a"), batcher.aembed("b"))
+        await asyncio.sleep(0.01)
+        assert len(batcher._flush_tasks) == 1
+
+        release.set()
+        assert await asyncio.wait_for(waiters, timeout=5) == [[0.0], [0.0]]
+        assert not batcher._flush_tasks
+
+
+class TestEmbeddingBatcherEventLoops:
+    """Test cases for reusing one batcher across event loops."""
+
+    def test_state_from_a_closed_loop_is_discarded(self):
+        """Test a timer left behind by a closed loop does not stall requests on the next loop."""
+        model = MagicMock()
+        model._get_embedding.side_effect = lambda text, task_type: [float(len(text))]
+        batcher = EmbeddingBatcher(model, coalesce_delay=60)
+
+        async def queue_and_leave():
+            # The request's 60 s timer is still pending when this loop closes
+            asyncio.ensure_future(batcher.aembed("stale"))
+            await asyncio.sleep(0)
+
+        asyncio.run(queue_and_leave())
+        assert batcher._flush_handle is not None
+
+        batcher.coalesce_delay = 0.001
+        assert asyncio.run(asyncio.wait_for(batcher.aembed("fresh"), timeout=5)) == [5.0]
+        model._get_embedding.assert_called_once_with("fresh", None)
@@ -16,7 +16,16 @@ project_root = str(Path(__file__).parent.parent.parent)
 if project_root not in sys.path:
     sys.path.append(project_root)
 
-from utils.neo4j_ingester import Neo4jIngester, DocumentIngestionData
+from utils.neo4j_ingester import (
+    BatchingNeo4jIngester,
+    Neo4jIngester,
+    DocumentIngestionData,
+    graph_node_to_row,
+    graph_edge_to_row,
+    merge_node_rows,
+    get_neo4j_driver,
+    _INGEST_DOCUMENT_QUERY
+)
 
 # Mark all tests in this file as unit tests
 pytestmark = pytest.mark.unit
@@ -91,7 +100,8 @@ class TestNeo4jIngester:
         query = args[0]
         params = kwargs
         
-        # Check that query contains MERGE operation on doc_id
+        # Check that the shared module-level query is used, with MERGE on doc_id
+        assert query is _INGEST_DOCUMENT_QUERY
         assert "MERGE (d:Document {doc_id: $doc_id})" in query
         assert params["doc_id"] == "test_doc_001"
         assert params["filename"] == "test_document.pdf"
@@ -110,24 +120,22 @@ class TestNeo4jIngester:
         params = kwargs
         
         # Check metadata fields are properly extracted
-        assert params["metadata_author"] == "Test Author"
-        assert params["metadata_pages"] == 5
-        assert params["metadata_importance"] == "high"
+        metadata_properties = params["metadata_properties"]
+        assert metadata_properties["metadata_author"] == "Test Author"
+        assert metadata_properties["metadata_pages"] == 5
+        assert metadata_properties["metadata_importance"] == "high"
         # Complex types should be stringified
-        assert isinstance(params["metadata_tags"], str)
-        assert "test" in params["metadata_tags"]
-        assert "document" in params["metadata_tags"]
+        assert isinstance(metadata_properties["metadata_tags"], str)
+        assert "test" in metadata_properties["metadata_tags"]
+        assert "document" in metadata_properties["metadata_tags"]
         
         # Check metadata string representation
         assert "{" in params["metadata_str"]
         assert "}" in params["metadata_str"]
         
-        # Check query contains metadata property assignments
+        # Check query sets the metadata properties from the map parameter
         query = args[0]
-        assert "d.metadata_author = $metadata_author" in query
-        assert "d.metadata_pages = $metadata_pages" in query
-        assert "d.metadata_tags = $metadata_tags" in query
-        assert "d.metadata_importance = $metadata_importance" in query
+        assert "d += $metadata_properties" in query
 
     def test_ingest_document_database_error(self, mock_neo4j_driver, sample_document_data):
         """Test error handling during document ingestion."""
@@ -194,3 +202,244 @@ class TestNeo4jIngester:
             ingester.ensure_constraints_and_indices()
             mock_error.assert_called_once()
             assert "Failed to ensure Neo4j constraints/indices" in mock_error.call_args[0][0]
+
+    def test_graph_node_to_row(self):
+        """Test conversion of an extracted node into an UNWIND row."""
+        row = graph_node_to_row({
+            "uuid": "node-1",
+            "name": "OpenAI",
+            "labels": ["Entity", "Organization"],
+            "attributes": {"industry": "AI", "aliases": {"short": "OAI"}},
+            "name_embedding": [0.1, 0.2]
+        })
+
+        assert row["uuid"] == "node-1"
+        assert row["labels"] == ("Organization",)
+        assert row["props"]["name"] == "OpenAI"
+        assert row["props"]["industry"] == "AI"
+        # Maps are not valid Neo4j properties and are stringified
+        assert isinstance(row["props"]["aliases"], str)
+        assert row["props"]["name_embedding"] == [0.1, 0.2]
+        assert "uuid" not in row["props"]
+        assert "attributes" not in row["props"]
+
+    def test_graph_edge_to_row(self):
+        """Test conversion of an extracted edge into an UNWIND row."""
+        row = graph_edge_to_row({
+            "uuid": "edge-1",
+            "source_node_uuid": "node-1",
+            "target_node_uuid": "node-2",
+            "name": "CREATES",
+            "fact": "OpenAI created GPT-4"
+        })
+
+        assert row == {
+            "uuid": "edge-1",
+            "src": "node-1",
+            "dst": "node-2",
+            "props": {"name": "CREATES", "fact": "OpenAI created GPT-4"}
+        }
+
+    def test_ingest_documents_unwinds_rows(self, mock_neo4j_driver, sample_document_data):
+        """Test documents are written with one UNWIND query per batch."""
+        ingester = Neo4jIngester(mock_neo4j_driver)
+        other = sample_document_data.model_copy(update={"doc_id": "test_doc_002", "metadata": {}})
+
+        written = ingester.ingest_documents([sample_document_data, other], batch_size=1)
+
+        assert written == 2
+        mock_session = mock_neo4j_driver.session.return_value.__enter__.return_value
+        calls = mock_session.run.call_args_list
+        assert len(calls) == 2
+        query = calls[0][0][0]
+        assert query.startswith("UNWIND $rows AS row")
+        assert "MERGE (d:Document {doc_id: row.doc_id})" in query
+        row = calls[0][1]["rows"][0]
+        assert row["doc_id"] == "test_doc_001"
+        assert row["parsed_timestamp"] == "2023-01-01T12:00:00"
+        assert row["create_props"] == {"source_type": "google_drive", "gdrive_id": "gdrive_test_id_001"}
+        assert row["props"]["metadata_author"] == "Test Author"
+        assert row["props"]["metadata_tags"] == "['test', 'document']"
+        assert calls[1][1]["rows"][0]["props"]["metadata_str"] == "{}"
+
+    def test_bulk_upsert_nodes_batches_by_label(self, mock_neo4j_driver):
+        """Test nodes are written with one UNWIND query per label group and batch."""
+        ingester = Neo4jIngester(mock_neo4j_driver)
+        rows = [
+            {"uuid": f"p{i}", "labels": ("Person",), "props": {"name": f"Person {i}"}} for i in range(3)
+        ] + [
+            {"uuid": "o1", "labels": ("Organization",), "props": {"name": "OpenAI"}}
+        ]
+
+        written = ingester.bulk_upsert_nodes(rows, batch_size=2)
+
+        assert written == 4
+        mock_session = mock_neo4j_driver.session.return_value.__enter__.return_value
+        calls = mock_session.run.call_args_list
+        # 1 index creation + 2 Person batches + 1 Organization batch
+        assert len(calls) == 4
+        assert "CREATE INDEX" in calls[0][0][0]
+        assert "UNWIND $rows AS row" in calls[1][0][0]
+        assert "MERGE (n:`Entity` {uuid: row.uuid})" in calls[1][0][0]
+        assert "SET n:`Person`" in calls[1][0][0]
+        assert [r["uuid"] for r in calls[1][1]["rows"]] == ["p0", "p1"]
+        assert [r["uuid"] for r in calls[2][1]["rows"]] == ["p2"]
+        assert "SET n:`Organization`" in calls[3][0][0]
+
+    def test_merge_node_rows_unions_labels(self):
+        """Test rows sharing a uuid collapse into one row with the union of their labels."""
+        rows = [
+            {"uuid": "n1", "labels": ("Person",), "props": {"name": "Ada", "summary": "old"}},
+            {"uuid": "n2", "labels": (), "props": {"name": "Other"}},
+            {"uuid": "n1", "labels": ("Scientist", "Person"), "props": {"summary": "new"}},
+        ]
+
+        merged = merge_node_rows(rows)
+
+        assert [r["uuid"] for r in merged] == ["n1", "n2"]
+        assert merged[0]["labels"] == ("Person", "Scientist")
+        assert merged[0]["props"] == {"name": "Ada", "summary": "new"}
+        assert merged[1] is rows[1]
+
+    def test_bulk_upsert_nodes_writes_each_uuid_once(self, mock_neo4j_driver):
+        """Test a uuid seen with different labels is written by a single batch."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        ingester = Neo4jIngester(mock_neo4j_driver)
+        rows = [
+            {"uuid": "n1", "labels": ("Person",), "props": {}},
+            {"uuid": "n1", "labels": ("Scientist",), "props": {}},
+            {"uuid": "n2", "labels": ("Person",), "props": {}},
+        ]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            written = ingester.bulk_upsert_nodes(rows, executor=executor)
+
+        assert written == 2
+        mock_session = mock_neo4j_driver.session.return_value.__enter__.return_value
+        batches = [c[1]["rows"] for c in mock_session.run.call_args_list if "rows" in c[1]]
+        assert sorted(r["uuid"] for batch in batches for r in batch) == ["n1", "n2"]
+
+    def test_bulk_upsert_edges(self, mock_neo4j_driver):
+        """Test edges are written with a single UNWIND MATCH/MERGE query."""
+        ingester = Neo4jIngester(mock_neo4j_driver)
+        rows = [
+            {"uuid": "e1", "src": "n1", "dst": "n2", "props": {"fact": "n1 knows n2"}},
+            {"uuid": "e2", "src": "n2", "dst": "n3", "props": {"fact": "n2 knows n3"}}
+        ]
+
+        written = ingester.bulk_upsert_edges(rows)
+
+        assert written == 2
+        mock_session = mock_neo4j_driver.session.return_value.__enter__.return_value
+        args, kwargs = mock_session.run.call_args
+        assert "MATCH (s:`Entity` {uuid: row.src})" in args[0]
+        assert "MERGE (s)-[r:`RELATES_TO` {uuid: row.uuid}]->(t)" in args[0]
+        assert kwargs["rows"] == rows
+
+    def test_bulk_upsert_nodes_with_executor(self, mock_neo4j_driver):
+        """Test node batches are written concurrently when an executor is provided."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        ingester = Neo4jIngester(mock_neo4j_driver)
+        rows = [{"uuid": f"n{i}", "labels": (), "props": {}} for i in range(5)]
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            written = ingester.bulk_upsert_nodes(rows, batch_size=2, executor=executor)
+
+        assert written == 5
+        mock_session = mock_neo4j_driver.session.return_value.__enter__.return_value
+        # 1 index creation + 3 batches, each in its own session
+        assert mock_session.run.call_count == 4
+        assert mock_neo4j_driver.session.call_count == 4
+
+    def test_bulk_upsert_empty_rows(self, mock_neo4j_driver):
+        """Test no queries are issued for empty input."""
+        ingester = Neo4jIngester(mock_neo4j_driver)
+
+        assert ingester.bulk_upsert_nodes([]) == 0
+        assert ingester.bulk_upsert_edges([]) == 0
+        mock_neo4j_driver.session.assert_not_called()
+
+    def test_node_key_index_created_once(self, mock_neo4j_driver):
+        """Test the uuid index is only created once per label."""
+        ingester = Neo4jIngester(mock_neo4j_driver)
+
+        ingester.ensure_node_key_index("Entity")
+        ingester.ensure_node_key_index("Entity")
+
+        mock_session = mock_neo4j_driver.session.return_value.__enter__.return_value
+        assert mock_session.run.call_count == 1
+
+    def test_get_neo4j_driver_is_shared(self):
+        """Test the driver is created once per connection settings."""
+        get_neo4j_driver.cache_clear()
+        with patch("utils.neo4j_ingester.GraphDatabase.driver") as mock_driver_factory:
+            first = get_neo4j_driver("neo4j://localhost:7687", "neo4j", "pw")
+            second = get_neo4j_driver("neo4j://localhost:7687", "neo4j", "pw")
+            other = get_neo4j_driver("neo4j://other:7687", "neo4j", "pw")
+
+        assert first is second
+        assert mock_driver_factory.call_count == 2
+        mock_driver_factory.assert_any_call("neo4j://localhost:7687", auth=("neo4j", "pw"))
+        get_neo4j_driver.cache_clear()
+
+
+class TestBatchingNeo4jIngester:
+    """Test cases for BatchingNeo4jIngester."""
+
+    def test_add_reports_threshold(self):
+        """Test add() signals once the buffered rows reach the flush threshold."""
+        batcher = BatchingNeo4jIngester(MagicMock(), flush_threshold=3)
+
+        assert batcher.add([{"uuid": "n1"}], []) is False
+        assert batcher.add([{"uuid": "n2"}], [{"uuid": "e1"}]) is True
+        assert batcher.pending == 3
+
+    def test_flush_writes_nodes_then_edges_and_clears(self):
+        """Test flush() writes all buffered rows, nodes first, and empties the buffers."""
+        ingester = MagicMock()
+        order = []
+        ingester.bulk_upsert_nodes.side_effect = lambda rows, **kwargs: order.append("nodes") or len(rows)
+        ingester.bulk_upsert_edges.side_effect = lambda rows, **kwargs: order.append("edges") or len(rows)
+        batcher = BatchingNeo4jIngester(ingester)
+
+        batcher.add([{"uuid": "n1"}], [])
+        batcher.add([{"uuid": "n2"}], [{"uuid": "e1"}])
+
+        assert batcher.flush() == (2, 1)
+        assert order == ["nodes", "edges"]
+        assert [r["uuid"] for r in ingester.bulk_upsert_nodes.call_args[0][0]] == ["n1", "n2"]
+        assert batcher.pending == 0
+
+    def test_flush_keeps_rows_when_write_fails(self):
+        """Test a failed flush leaves every buffered row in place for the next flush."""
+        ingester = MagicMock()
+        ingester.bulk_upsert_nodes.return_value = 1
+        ingester.bulk_upsert_edges.side_effect = [RuntimeError("Neo4j unavailable"), 1]
+        batcher = BatchingNeo4jIngester(ingester)
+        batcher.add([{"uuid": "n1"}], [{"uuid": "e1"}])
+
+        with pytest.raises(RuntimeError, match="Neo4j unavailable"):
+            batcher.flush()
+        assert batcher.pending == 2
+
+        assert batcher.flush() == (1, 1)
+        assert batcher.pending == 0
+        assert [r["uuid"] for r in ingester.bulk_upsert_edges.call_args[0][0]] == ["e1"]
+
+    def test_owners_are_tracked_until_written(self):
+        """Test owners stay listed through a failed flush and are cleared by a successful one."""
+        ingester = MagicMock()
+        ingester.bulk_upsert_nodes.side_effect = [RuntimeError("Neo4j unavailable"), 2]
+        ingester.bulk_upsert_edges.return_value = 0
+        batcher = BatchingNeo4jIngester(ingester)
+        batcher.add([{"uuid": "n1"}], [], owner="doc-a")
+        batcher.add([{"uuid": "n2"}], [], owner="doc-b")
+
+        with pytest.raises(RuntimeError):
+            batcher.flush()
+        assert batcher.owners == ["doc-a", "doc-b"]
+
+        batcher.flush()
+        assert batcher.owners == []
@@ -0,0 +1,85 @@
+"""
+Unit tests for the similarity kernels in utils.sim.
+"""
+import sys
+import pytest
+import numpy as np
+from pathlib import Path
+
+# Add project root to path to ensure imports work
+project_root = str(Path(__file__).parent.parent.parent)
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from utils.sim import cosine_scores, cosine_topk, int8_cosine_scores, l2_normalize, quantize_int8
+
+# Mark all tests in this file as unit tests
+pytestmark = pytest.mark.unit
+
+
+def _normalized(rows):
+    matrix = np.asarray(rows, dtype=np.float32)
+    return matrix / np.linalg.norm(matrix, axis=-1, keepdims=True)
+
+
+class TestSimilarityKernels:
+    """Test cases for cosine similarity helpers."""
+
+    def test_cosine_scores_match_numpy(self):
+        """Test kernel output matches a plain NumPy dot product."""
+        rng = np.random.default_rng(0)
+        matrix = _normalized(rng.standard_normal((50, 1536)))
+        query = _normalized(rng.standard_normal(1536))
+
+        np.testing.assert_allclose(cosine_scores(matrix, query), matrix @ query, rtol=1e-4, atol=1e-5)
+
+    def test_cosine_scores_empty_matrix(self):
+        """Test an empty matrix yields no scores."""
+        scores = cosine_scores(np.empty((0, 3), dtype=np.float32), _normalized([1.0, 0.0, 0.0]))
+        assert scores.shape == (0,)
+
+    def test_cosine_topk_orders_results(self):
+        """Test top-k returns the most similar rows first."""
+        matrix = _normalized([[1.0, 0.0], [0.0, 1.0], [0.7, 0.7]])
+        indices, scores = cosine_topk(matrix, _normalized([1.0, 0.1]), k=2)
+
+        assert list(indices) == [0, 2]
+        assert scores[0] >= scores[1]
+
+    def test_cosine_topk_clamps_k(self):
+        """Test k larger than the matrix returns every row."""
+        matrix = _normalized([[1.0, 0.0], [0.0, 1.0]])
+        indices, _ = cosine_topk(matrix, _normalized([1.0, 0.0]), k=10)
+        assert sorted(indices) == [0, 1]
+
+    def test_int8_scores_approximate_float32(self):
+        """Test int8-quantized scores stay close to the float32 result."""
+        rng = np.random.default_rng(1)
+        matrix = _normalized(rng.standard_normal((50, 1536)))
+        query = _normalized(rng.standard_normal(1536))
+
+        matrix_int8, scales = quantize_int8(matrix)
+        query_int8, query_scale = quantize_int8(query)
+        scores = int8_cosine_scores(matrix_int8, scales, query_int8, float(query_scale))
+
+        assert matrix_int8.dtype == np.int8
+        np.testing.assert_allclose(scores, matrix @ query, atol=1e-2)
+
+    def test_quantize_int8_zero_vector(self):
+        """Test a zero vector quantizes without dividing by zero."""
+        quantized, scale = quantize_int8(np.zeros(4, dtype=np.float32))
+        assert not quantized.any()
+        assert float(scale) == 1.0
+
+    def test_l2_normalize_vector_and_matrix(self):
+        """Test 1-D and 2-D inputs are normalized, leaving zero rows at zero."""
+        np.testing.assert_allclose(l2_normalize([3.0, 4.0]), [0.6, 0.8], rtol=1e-6)
+
+        normalized = l2_normalize([[3.0, 4.0], [0.0, 0.0]])
+        np.testing.assert_allclose(normalized, [[0.6, 0.8], [0.0, 0.0]], rtol=1e-6)
+        assert normalized.dtype == np.float32
+
+    def test_l2_normalize_rejects_higher_rank(self):
+        """Test 3-D input raises ValueError."""
+        with pytest.raises(ValueError):
+            l2_normalize(np.ones((2, 2, 2)))
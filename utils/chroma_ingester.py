@@ -2,6 +2,7 @@
 
 import os
 import asyncio
+import weakref
 from typing import Dict, List, Optional, Any, Union, Sequence
 
 import chromadb
@@ -27,6 +28,49 @@ except ImportError:
         return embedding_str[:max_length] + '...'
 
 
+# Texts embedded in one request and written in one upsert. Gemini accepts up to 100
+# inputs per embedding request.
+DEFAULT_INGEST_BATCH_SIZE = 100
+
+# AsyncHttpClient instances are bound to the event loop they were created on, so they are
+# shared per loop and per connection settings rather than globally.
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, Any]]" = weakref.WeakKeyDictionary()
+_async_client_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+async def _create_async_client(config: ChromaDBConfig) -> chromadb.AsyncClientAPI:
+    """Creates a new ChromaDB AsyncHttpClient for the given configuration."""
+    if config.auth_enabled:
+        settings = chromadb.Settings(
+            chroma_client_auth_provider="chromadb.auth.basic_authn.BasicAuthClientProvider",
+            chroma_client_auth_credentials=f"{config.username}:{config.password}"
+        )
+        return await chromadb.AsyncHttpClient(host=config.host, port=config.port, settings=settings)
+    return await chromadb.AsyncHttpClient(host=config.host, port=config.port)
+
+
+async def get_chroma_async_client(config: ChromaDBConfig) -> chromadb.AsyncClientAPI:
+    """
+    Returns a ChromaDB AsyncHttpClient shared by every ingester on the running event loop.
+
+    Reusing the client keeps its HTTP connection pool warm across ingesters and
+    orchestrator instances instead of reconnecting for each one.
+    """
+    loop = asyncio.get_running_loop()
+    key = (config.host, config.port, config.auth_enabled, config.username, config.password)
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(key)
+    if client is not None:
+        return client
+
+    async with _async_client_locks.setdefault(loop, asyncio.Lock()):
+        client = clients.get(key)
+        if client is None:
+            client = await _create_async_client(config)
+            clients[key] = client
+    return client
+
+
 class ChromaIngester:
     """Handles document ingestion into ChromaDB using an async client."""
 
@@ -55,19 +99,10 @@ class ChromaIngester:
 
         logger.info("Initializing ChromaDB async client and collection...")
         try:
-            # 1. Initialize Client
-            if self.config.auth_enabled:
-                settings = chromadb.Settings(
-                    chroma_client_auth_provider="chromadb.auth.basic_authn.BasicAuthClientProvider",
-                    chroma_client_auth_credentials=f"{self.config.username}:{self.config.password}"
-                )
-                self.client = await chromadb.AsyncHttpClient(
-                    host=self.config.host, port=self.config.port, settings=settings
-                )
-            else:
-                self.client = await chromadb.AsyncHttpClient(host=self.config.host, port=self.config.port)
+            # 1. Initialize Client (shared with other ingesters on this event loop)
+            self.client = await get_chroma_async_client(self.config)
             
-            logger.info(f"ChromaDB async client created for host {self.config.host}:{self.config.port}")
+            logger.info(f"ChromaDB async client ready for host {self.config.host}:{self.config.port}")
 
             # 2. Get or Create Collection
             self.collection = await self.client.get_or_create_collection(
@@ -93,40 +128,37 @@ class ChromaIngester:
         wait=wait_exponential(multiplier=1, min=1, max=10),
         retry=retry_if_exception_type((chromadb.errors.ChromaError))
     )
-    async def ingest_documents(self, documents: List[Dict[str, Any]]) -> bool:
-        """Asynchronously ingest documents into ChromaDB."""
+    async def ingest_documents(self, documents: List[Dict[str, Any]], batch_size: int = DEFAULT_INGEST_BATCH_SIZE) -> bool:
+        """Asynchronously ingest documents into ChromaDB, embedding and upserting `batch_size` at a time."""
         if not self.collection:
             raise RuntimeError("ChromaIngester not initialized. Call async_init() before using.")
 
         try:
-            texts = [doc['document'] for doc in documents]
-            metadatas = [doc['metadata'] for doc in documents]
-            ids = [doc['id'] for doc in documents]
-
-            embeddings = await self.batch_embed_documents(texts)
-            
-            await self.collection.upsert(
-                documents=texts,
-                embeddings=embeddings,
-                metadatas=metadatas,
-                ids=ids
-            )
+            # Each batch is embedded with one request and written with one upsert, so
+            # neither the embedding API nor ChromaDB sees per-chunk calls.
+            for start in range(0, len(documents), batch_size):
+                batch = documents[start:start + batch_size]
+                texts = [doc['document'] for doc in batch]
+                embeddings = await self.batch_embed_documents(texts, batch_size=batch_size)
+
+                await self.collection.upsert(
+                    documents=texts,
+                    embeddings=embeddings,
+                    metadatas=[doc['metadata'] for doc in batch],
+                    ids=[doc['id'] for doc in batch]
+                )
             logger.info(f"Successfully ingested {len(documents)} documents into ChromaDB")
             return True
         except Exception as e:
             logger.error(f"Failed to ingest documents into ChromaDB: {e}")
             raise
 
-    async def batch_embed_documents(self, texts: List[str]) -> List[List[float]]:
-        """Asynchronously batch embed multiple texts for efficiency."""
-        batch_size = 10
+    async def batch_embed_documents(self, texts: List[str], batch_size: int = DEFAULT_INGEST_BATCH_SIZE) -> List[List[float]]:
+        """Asynchronously embed texts with one embedding request per `batch_size` texts."""
         all_embeddings = []
         
         for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i+batch_size]
-            # Use the async embedding method
-            embedding_tasks = [self.embedding_model._aget_text_embedding(text) for text in batch_texts]
-            batch_embeddings = await asyncio.gather(*embedding_tasks)
+            batch_embeddings = await self.embedding_model._aget_text_embeddings(texts[i:i+batch_size])
             all_embeddings.extend(batch_embeddings)
             
             if batch_embeddings:
@@ -3,6 +3,7 @@
 
 from loguru import logger
 from typing import Optional
+import functools
 import os
 import dotenv
 from dotenv import find_dotenv
@@ -19,10 +20,14 @@ from .config_models import (
     IngestionOrchestratorConfig
 )
 
+@functools.lru_cache(maxsize=1)
 def get_config(env_file: Optional[str] = None) -> IngestionOrchestratorConfig:
     """
     Load configuration from both the .env file (for secrets and environment-specific settings)
     and the config.yaml file (for model IDs and other application parameters).
+
+    The result is cached, so repeated calls (e.g. one per orchestrator) reuse the same
+    object instead of re-reading the environment. Call `get_config.cache_clear()` to reload.
     """
     # Load environment variables from .env file. Pydantic's BaseSettings will use these.
     dotenv.load_dotenv(env_file or find_dotenv() or '.env')
@@ -2,9 +2,11 @@
 Embedding utility for the Graph-RAG project.
 Provides embedding functionality using Google's Generative AI.
 """
+import asyncio
+import functools
 import os
 import sys
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Set, Union, Tuple
 from google import genai
 
 from llama_index.core.embeddings import BaseEmbedding
@@ -41,6 +43,150 @@ except ImportError:
         # Truncate and add ellipsis
         return embedding_str[:max_length] + '...'
 
+def _rejects_batch_requests(error: Exception) -> bool:
+    """
+    Returns True if an API error means the model does not accept multi-input requests.
+
+    Such requests fail with 400 INVALID_ARGUMENT. Rate limits (429) and other client
+    errors are transient or unrelated to batching, so they must not disable it.
+    """
+    return isinstance(error, genai.errors.ClientError) and (
+        error.status == "INVALID_ARGUMENT" or error.code == 400
+    )
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embedding requests into batched API calls.
+
+    Requests are queued until either `max_batch_size` texts are waiting or
+    `coalesce_delay` seconds have passed since the first one, then embedded with a
+    single `embed_content` call. If the model rejects multi-input requests (as some
+    Gemini embedding models do), the batcher falls back to concurrent single-text
+    calls for the rest of its lifetime. Other client errors, such as rate limits,
+    only make the batch that hit them fall back.
+
+    Queued requests and timers belong to one event loop. The batcher lives on the
+    shared embedding model, so whenever it is used from a different loop (e.g. a new
+    `asyncio.run`), state left behind by the previous loop is discarded.
+    """
+
+    def __init__(
+        self,
+        embedding_model: "CustomGeminiEmbedding",
+        task_type: Optional[str] = None,
+        max_batch_size: int = 64,
+        coalesce_delay: float = 0.008,
+    ) -> None:
+        """
+        Args:
+            embedding_model: The model used to issue embedding requests.
+            task_type: Task type applied to every text in the batch.
+            max_batch_size: Flush as soon as this many texts are queued.
+            coalesce_delay: Seconds to wait for more texts before flushing a partial batch.
+        """
+        self.embedding_model = embedding_model
+        self.task_type = task_type
+        self.max_batch_size = max_batch_size
+        self.coalesce_delay = coalesce_delay
+        self.batch_supported = True
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # The loop only keeps weak references to tasks, so in-flight flushes are held here
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+    def _bind_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Drops queued requests and timers that belong to a previous event loop."""
+        if loop is self._loop:
+            return
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # Futures of a previous loop can no longer be awaited by anyone
+        self._pending = []
+        self._flush_tasks = set()
+        self._loop = loop
+
+    async def aembed(self, text: str) -> List[float]:
+        """Queue a text for embedding and wait for its vector."""
+        loop = asyncio.get_running_loop()
+        self._bind_loop(loop)
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._schedule_flush(loop, immediate=True)
+        elif self._flush_handle is None:
+            self._schedule_flush(loop, immediate=False)
+
+        return await future
+
+    async def aembed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embed a known list of texts directly, in one request when the model accepts batches."""
+        if not texts:
+            return []
+        return await self._embed(texts)
+
+    def _schedule_flush(self, loop: asyncio.AbstractEventLoop, immediate: bool) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if immediate:
+            batch, self._pending = self._pending, []
+            self._start_flush(loop, batch)
+        else:
+            self._flush_handle = loop.call_later(self.coalesce_delay, self._on_timer, loop)
+
+    def _on_timer(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._flush_handle = None
+        batch, self._pending = self._pending, []
+        if batch:
+            self._start_flush(loop, batch)
+
+    def _start_flush(self, loop: asyncio.AbstractEventLoop, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        task = loop.create_task(self._flush(batch))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            embeddings = await self._embed(texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+    async def _embed(self, texts: List[str]) -> List[List[float]]:
+        if len(texts) > 1 and self.batch_supported:
+            try:
+                return await asyncio.to_thread(self.embedding_model._get_embeddings, texts, self.task_type)
+            except genai.errors.ClientError as e:
+                if _rejects_batch_requests(e):
+                    logger.warning(
+                        f"Model '{self.embedding_model.model_name}' rejected a batch of {len(texts)} texts ({e}). "
+                        "Falling back to concurrent single-text requests."
+                    )
+                    self.batch_supported = False
+                    # Sync calls and the model's other batchers skip batches from now on too
+                    self.embedding_model._disable_batching()
+                else:
+                    logger.warning(
+                        f"Batch of {len(texts)} texts failed for model '{self.embedding_model.model_name}' ({e}). "
+                        "Embedding this batch with single-text requests."
+                    )
+
+        return list(await asyncio.gather(*[
+            asyncio.to_thread(self.embedding_model._get_embedding, text, self.task_type) for text in texts
+        ]))
+
+
 class CustomGeminiEmbedding(BaseEmbedding):
     """
     Custom embedding class that uses Google's Gemini embedding models.
@@ -106,6 +252,10 @@ class CustomGeminiEmbedding(BaseEmbedding):
             "title": title,
             "task_type": task_type
         }
+        # One request batcher per task type, created on first async use
+        self._batchers: Dict[str, EmbeddingBatcher] = {}
+        # Cleared once the model rejects a multi-input request; shared by sync calls and batchers
+        self._batch_supported = True
 
         # Initialize the genai.Client based on whether we're using Vertex AI or not.
         if is_vertex_ai:
@@ -255,6 +405,64 @@ class CustomGeminiEmbedding(BaseEmbedding):
             logger.error(error_log_message, exc_info=True)
             raise # Re-raise to ensure failure is propagated
 
+    def _get_embeddings(
+        self,
+        texts: List[str],
+        task_type: Optional[str] = None,
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for several texts with a single API request.
+
+        Args:
+            texts: The texts to create embeddings for
+            task_type: Optional task type for embedding optimization (see `_get_embedding`)
+
+        Returns:
+            One embedding vector per input text, in input order
+        """
+        config_params = {}
+        effective_task_type = task_type if task_type else self._gemini_config.get("task_type")
+        if effective_task_type:
+            config_params["task_type"] = effective_task_type
+        if self._gemini_config.get("output_dimensionality"):
+            config_params["output_dimensionality"] = self._gemini_config["output_dimensionality"]
+        if self._gemini_config.get("title"):
+            config_params["title"] = self._gemini_config["title"]
+        embed_config_obj = genai.types.EmbedContentConfig(**config_params)
+
+        logger.info(f"Requesting {len(texts)} Gemini embeddings in one request for model: '{self.model_name}'")
+        response = self._client.models.embed_content(
+            model=self.model_name,
+            contents=texts,
+            config=embed_config_obj
+        )
+
+        if hasattr(response, 'embeddings'):
+            embeddings = [embedding.values for embedding in response.embeddings]
+        elif isinstance(response, dict) and 'embeddings' in response:
+            embeddings = list(response['embeddings'])
+        else:
+            raise ValueError(f"Could not extract embeddings from response: {response}")
+
+        if len(embeddings) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings but received {len(embeddings)}")
+        logger.debug(f"Received {len(embeddings)} embeddings. Sample (truncated): {truncate_embedding(embeddings[0] if embeddings else None)}")
+        return embeddings
+
+    def _get_batcher(self, task_type: str) -> EmbeddingBatcher:
+        """Get (or lazily create) the request batcher for a task type."""
+        if task_type not in self._batchers:
+            batcher = EmbeddingBatcher(self, task_type=task_type)
+            batcher.batch_supported = self._batch_supported
+            self._batchers[task_type] = batcher
+        return self._batchers[task_type]
+
+    def _disable_batching(self) -> None:
+        """Remembers that the model rejects multi-input requests, for sync calls and every batcher."""
+        self._batch_supported = False
+        for batcher in self._batchers.values():
+            batcher.batch_supported = False
+
     def _get_text_embedding(self, text: str) -> List[float]:
         """
         Get embedding for a single text.
@@ -262,6 +470,32 @@ class CustomGeminiEmbedding(BaseEmbedding):
         """
         return self._get_embedding(text, task_type="RETRIEVAL_DOCUMENT")
 
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Get embeddings for several document texts with a single API request.
+        Used by `get_text_embedding_batch`, which calls this once per `embed_batch_size` texts.
+
+        Falls back to one request per text if the model rejects multi-input requests,
+        and keeps doing so for later calls. Other client errors, such as rate limits,
+        only make this call fall back.
+        """
+        if len(texts) > 1 and self._batch_supported:
+            try:
+                return self._get_embeddings(texts, task_type="RETRIEVAL_DOCUMENT")
+            except genai.errors.ClientError as e:
+                if _rejects_batch_requests(e):
+                    logger.warning(
+                        f"Model '{self.model_name}' rejected a batch of {len(texts)} texts ({e}). "
+                        "Embedding texts one by one from now on."
+                    )
+                    self._disable_batching()
+                else:
+                    logger.warning(
+                        f"Batch of {len(texts)} texts failed for model '{self.model_name}' ({e}). "
+                        "Embedding them one by one."
+                    )
+        return [self._get_text_embedding(text) for text in texts]
+
     def get_embedding(self, text: str) -> List[float]:
         """
         Public method to get embedding for text.
@@ -294,7 +528,9 @@ class CustomGeminiEmbedding(BaseEmbedding):
 
     async def _aget_query_embedding(self, query: str) -> List[float]:
         """
-        Async version of query embedding (delegates to sync version for now).
+        Async version of query embedding.
+
+        Concurrent calls are coalesced into batched API requests.
 
         Args:
             query: Query text to embed
@@ -302,12 +538,13 @@ class CustomGeminiEmbedding(BaseEmbedding):
         Returns:
             List of embedding values
         """
-        # For now, we use the synchronous version
-        return self._get_query_embedding(query)
+        return await self._get_batcher("RETRIEVAL_QUERY").aembed(query)
 
     async def _aget_text_embedding(self, text: str) -> List[float]:
         """
-        Async version of text embedding (delegates to sync version for now).
+        Async version of text embedding.
+
+        Concurrent calls are coalesced into batched API requests.
 
         Args:
             text: Text to embed
@@ -315,5 +552,42 @@ class CustomGeminiEmbedding(BaseEmbedding):
         Returns:
             List of embedding values
         """
-        # For now, we use the synchronous version
-        return self._get_text_embedding(text)
+        return await self._get_batcher("RETRIEVAL_DOCUMENT").aembed(text)
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async version of embedding several document texts.
+
+        The texts are sent as a single batched API request rather than queued one by one.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One embedding vector per input text, in input order
+        """
+        return await self._get_batcher("RETRIEVAL_DOCUMENT").aembed_many(texts)
+
+
+@functools.lru_cache(maxsize=4)
+def get_embedding_model(
+    model_name: Optional[str] = None,
+    output_dimensionality: Optional[int] = None,
+) -> CustomGeminiEmbedding:
+    """
+    Get a shared CustomGeminiEmbedding instance for the given model settings.
+
+    Building the model initializes a genai.Client, so long-lived callers such as the
+    ingestion orchestrator reuse one instance per (model, dimensionality) pair.
+
+    Args:
+        model_name: Google embedding model name. Defaults to value from config.yaml.
+        output_dimensionality: Desired dimension of embedding output vector. Defaults to value from config.yaml.
+
+    Returns:
+        The cached embedding model.
+    """
+    return CustomGeminiEmbedding(
+        model_name=model_name,
+        output_dimensionality=output_dimensionality
+    )
@@ -15,9 +15,10 @@ import sys
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the parent directory to sys.path to enable imports from project modules
 project_root = str(Path(__file__).parent.parent)
@@ -109,36 +110,25 @@ class HybridSearchEngine:
             Either a SearchResponse object with full metadata or a string answer
         """
         self.logger.info(f"Processing query: {query_text}")
-        graph_results = []
         vector_results = []
-        error = None
         
-        # 1. Try graph-based approach with entity extraction
-        try:
-            # Extract entities and relationships
-            structured_info = self._extract_query_structure(query_text)
-            self.logger.info(f"Extracted structure: {structured_info}")
+        # The vector search does not depend on the graph results, so it runs in the
+        # background while the LLM extracts the query structure and the graph is queried.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="vector-search") as executor:
+            vector_future = executor.submit(self._vector_search, query_text)
+            graph_results, error = self._graph_search(query_text)
             
-            # Query the knowledge graph
-            if structured_info and structured_info.get("entities"):
-                graph_results = self._query_knowledge_graph(structured_info)
-                self.logger.info(f"Graph search returned {len(graph_results)} results")
-        except Exception as e:
-            error = str(e)
-            self.logger.error(f"Error in graph-based search: {e}")
-            self.logger.debug(traceback.format_exc())
-        
-        # 2. Always perform vector search (as backup or complement)
-        try:
-            vector_results = self._vector_search(query_text)
-            self.logger.info(f"Vector search returned {len(vector_results)} results")
-        except Exception as e:
-            if not graph_results:  # Only log as error if we have no graph results
-                error = f"{error}; Vector search error: {str(e)}" if error else str(e)
-                self.logger.error(f"Error in vector search: {e}")
-                self.logger.debug(traceback.format_exc())
-            else:
-                self.logger.warning(f"Vector search failed but graph results available: {e}")
+            # 2. Always perform vector search (as backup or complement)
+            try:
+                vector_results = vector_future.result()
+                self.logger.info(f"Vector search returned {len(vector_results)} results")
+            except Exception as e:
+                if not graph_results:  # Only log as error if we have no graph results
+                    error = f"{error}; Vector search error: {str(e)}" if error else str(e)
+                    self.logger.error(f"Error in vector search: {e}")
+                    self.logger.debug(traceback.format_exc())
+                else:
+                    self.logger.warning(f"Vector search failed but graph results available: {e}")
         
         # 3. Synthesize response using all available information
         answer = self._synthesize_response(query_text, graph_results, vector_results)
@@ -158,6 +148,36 @@ class HybridSearchEngine:
         
         return response
     
+    def _graph_search(self, query_text: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Run the graph-based half of a query: entity extraction, then graph traversal.
+        
+        Args:
+            query_text: The natural language query from the user
+            
+        Returns:
+            The graph results and an error message, if the graph search failed
+        """
+        graph_results = []
+        error = None
+        
+        # 1. Try graph-based approach with entity extraction
+        try:
+            # Extract entities and relationships
+            structured_info = self._extract_query_structure(query_text)
+            self.logger.info(f"Extracted structure: {structured_info}")
+            
+            # Query the knowledge graph
+            if structured_info and structured_info.get("entities"):
+                graph_results = self._query_knowledge_graph(structured_info)
+                self.logger.info(f"Graph search returned {len(graph_results)} results")
+        except Exception as e:
+            error = str(e)
+            self.logger.error(f"Error in graph-based search: {e}")
+            self.logger.debug(traceback.format_exc())
+        
+        return graph_results, error
+    
     def _extract_query_structure(self, query_text: str) -> Dict[str, Any]:
         """
         Extract entities and relationships from the query using Gemini function calling.
@@ -1,9 +1,11 @@
 # Neo4j Ingester for kev-graph-rag
 
-from typing import List, Dict, Any, Optional
+import functools
+from concurrent.futures import Executor
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
-from neo4j import Driver
+from neo4j import Driver, GraphDatabase
 from pydantic import BaseModel, Field
 from loguru import logger
 
@@ -22,6 +24,148 @@ class DocumentIngestionData(BaseModel):
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Other arbitrary metadata")
 
 
+# Rows per UNWIND transaction. Large enough to amortize round-trips, small enough
+# to keep each transaction well under the server's transaction memory limit.
+DEFAULT_BULK_BATCH_SIZE = 5000
+
+# Buffered rows that trigger a write when batching across ingestion runs.
+DEFAULT_FLUSH_THRESHOLD = 1000
+
+# Graphiti writes every extracted entity as (:Entity {uuid}) and every fact as
+# [:RELATES_TO {uuid}], so bulk upserts key on the same label/type to stay idempotent.
+DEFAULT_NODE_LABEL = "Entity"
+DEFAULT_RELATIONSHIP_TYPE = "RELATES_TO"
+
+_PRIMITIVE_TYPES = (str, int, float, bool, datetime)
+
+# Document upserts are fixed strings, with metadata passed as a map parameter, so
+# every call sends identical Cypher and the server reuses one cached query plan.
+# `source_type` and `gdrive_id` are only set when the node is created.
+_INGEST_DOCUMENT_QUERY = (
+    "MERGE (d:Document {doc_id: $doc_id}) "
+    "ON CREATE SET d.source_type = $source_type, d.gdrive_id = $gdrive_id, d.created_at = datetime() "
+    "ON MATCH SET d.updated_at = datetime() "
+    "SET d.filename = $filename, "
+    "  d.content = $content, "
+    "  d.embedding = $embedding, "
+    "  d.mime_type = $mime_type, "
+    "  d.gdrive_webview_link = $gdrive_webview_link, "
+    "  d.parsed_timestamp = datetime($parsed_timestamp), "
+    "  d.metadata_str = $metadata_str, "
+    "  d += $metadata_properties "
+    "RETURN d.doc_id AS id, d.updated_at AS updatedAt, d.created_at AS createdAt"
+)
+
+_INGEST_DOCUMENTS_QUERY = (
+    "UNWIND $rows AS row "
+    "MERGE (d:Document {doc_id: row.doc_id}) "
+    "ON CREATE SET d += row.create_props, d.created_at = datetime() "
+    "ON MATCH SET d.updated_at = datetime() "
+    "SET d += row.props, d.parsed_timestamp = datetime(row.parsed_timestamp)"
+)
+
+
+def _quote_identifier(name: str) -> str:
+    """Backtick-quotes a label or relationship type for safe interpolation into Cypher."""
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _to_neo4j_property(value: Any) -> Any:
+    """Converts a value into something Neo4j can store as a property."""
+    if value is None or isinstance(value, _PRIMITIVE_TYPES):
+        return value
+    if isinstance(value, (list, tuple)) and all(isinstance(v, _PRIMITIVE_TYPES) for v in value):
+        return list(value)
+    # Neo4j cannot store maps or mixed lists as properties; keep them readable as strings.
+    return str(value)
+
+
+def _to_neo4j_properties(data: Dict[str, Any], exclude: Tuple[str, ...] = ()) -> Dict[str, Any]:
+    """Builds a flat property map, promoting nested 'attributes' to top-level properties."""
+    props = {}
+    for key, value in data.items():
+        if key in exclude:
+            continue
+        if key == "attributes" and isinstance(value, dict):
+            for attr_key, attr_value in value.items():
+                props[attr_key] = _to_neo4j_property(attr_value)
+            continue
+        props[key] = _to_neo4j_property(value)
+    return props
+
+
+def graph_node_to_row(node: Dict[str, Any], base_label: str = DEFAULT_NODE_LABEL) -> Dict[str, Any]:
+    """Converts an extracted graph node (e.g. a dumped Graphiti EntityNode) into an UNWIND row.
+
+    Args:
+        node: The node dictionary. Must contain a 'uuid'.
+        base_label: The label every node is merged under.
+
+    Returns:
+        A dict with 'uuid', the extra 'labels' to apply, and flattened 'props'.
+    """
+    labels = tuple(label for label in node.get("labels") or [] if label != base_label)
+    return {
+        "uuid": node["uuid"],
+        "labels": labels,
+        "props": _to_neo4j_properties(node, exclude=("uuid", "labels")),
+    }
+
+
+def graph_edge_to_row(edge: Dict[str, Any]) -> Dict[str, Any]:
+    """Converts an extracted graph edge (e.g. a dumped Graphiti EntityEdge) into an UNWIND row.
+
+    Args:
+        edge: The edge dictionary. Must contain 'uuid', 'source_node_uuid' and 'target_node_uuid'.
+
+    Returns:
+        A dict with 'uuid', 'src', 'dst' and flattened 'props'.
+    """
+    return {
+        "uuid": edge["uuid"],
+        "src": edge["source_node_uuid"],
+        "dst": edge["target_node_uuid"],
+        "props": _to_neo4j_properties(edge, exclude=("uuid", "source_node_uuid", "target_node_uuid")),
+    }
+
+
+def merge_node_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Collapses node rows that share a uuid into one row.
+
+    The same entity can be extracted from several documents, possibly with different
+    labels. Labels are unioned, and properties from later rows win.
+
+    Args:
+        rows: Rows as produced by `graph_node_to_row`.
+
+    Returns:
+        One row per uuid, in first-seen order.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        kept = merged.get(row["uuid"])
+        if kept is None:
+            merged[row["uuid"]] = row
+            continue
+        merged[row["uuid"]] = {
+            "uuid": row["uuid"],
+            "labels": tuple(dict.fromkeys((*(kept.get("labels") or ()), *(row.get("labels") or ())))),
+            "props": {**kept.get("props", {}), **row.get("props", {})},
+        }
+    return list(merged.values())
+
+
+@functools.lru_cache(maxsize=4)
+def get_neo4j_driver(uri: str, user: str, password: str) -> Driver:
+    """Returns a process-wide Neo4j driver for the given connection settings.
+
+    Drivers own a connection pool and are thread-safe, so they are meant to be shared
+    rather than created per ingester.
+    """
+    logger.info(f"Creating Neo4j driver for {uri}")
+    return GraphDatabase.driver(uri, auth=(user, password))
+
+
 class Neo4jIngester:
     """Handles ingestion of document data into Neo4j."""
 
@@ -34,16 +178,11 @@ class Neo4jIngester:
         if not driver:
             raise ValueError("Neo4j Driver must be provided.")
         self.driver = driver
+        self._indexed_labels: set = set()
 
-    def ingest_document(self, doc_data: DocumentIngestionData) -> None:
-        """Ingests a single document into Neo4j as a :Document node.
-
-        Uses MERGE to ensure idempotency based on doc_id.
-
-        Args:
-            doc_data: The document data to ingest.
-        """
-        # Extract metadata fields to direct properties
+    @staticmethod
+    def _document_metadata_properties(doc_data: DocumentIngestionData) -> Tuple[Dict[str, Any], str]:
+        """Flattens a document's metadata into `metadata_<key>` properties plus a readable summary string."""
         metadata_properties = {}
         metadata_parts = []
         
@@ -61,52 +200,19 @@ class Neo4jIngester:
         
         # Create a JSON-like string of the metadata for reference
         metadata_str = "{" + ", ".join(metadata_parts) + "}" if metadata_parts else "{}"
-            
-        query = (
-            "MERGE (d:Document {doc_id: $doc_id}) "
-            "ON CREATE SET "
-            "  d.filename = $filename, "
-            "  d.content = $content, "
-            "  d.embedding = $embedding, "
-            "  d.source_type = $source_type, "
-            "  d.mime_type = $mime_type, "
-            "  d.gdrive_id = $gdrive_id, "
-            "  d.gdrive_webview_link = $gdrive_webview_link, "
-            "  d.parsed_timestamp = datetime($parsed_timestamp), "
-            "  d.metadata_str = $metadata_str"
-        )
-        
-        # Add metadata fields as individual properties
-        if metadata_properties:
-            for key in metadata_properties:
-                query += f",\n  d.{key} = ${key}"
-        
-        # Complete the query
-        query += ",\n  d.created_at = datetime() "
-        
-        query += (
-            "ON MATCH SET "
-            "  d.filename = $filename, "
-            "  d.content = $content, "
-            "  d.embedding = $embedding, "
-            "  d.mime_type = $mime_type, "
-            "  d.gdrive_webview_link = $gdrive_webview_link, "
-            "  d.parsed_timestamp = datetime($parsed_timestamp), "
-            "  d.metadata_str = $metadata_str"
-        )
-        
-        # Add metadata fields as individual properties on match
-        if metadata_properties:
-            for key in metadata_properties:
-                query += f",\n  d.{key} = ${key}"
-        
-        # Complete the query
-        query += ",\n  d.updated_at = datetime() "
-        
-        query += (
-            "RETURN d.doc_id AS id, d.updated_at AS updatedAt, d.created_at AS createdAt"
-        )
+        return metadata_properties, metadata_str
 
+    def ingest_document(self, doc_data: DocumentIngestionData) -> None:
+        """Ingests a single document into Neo4j as a :Document node.
+
+        Uses MERGE to ensure idempotency based on doc_id.
+
+        Args:
+            doc_data: The document data to ingest.
+        """
+        # Extract metadata fields to direct properties
+        metadata_properties, metadata_str = self._document_metadata_properties(doc_data)
+            
         params = {
             "doc_id": doc_data.doc_id,
             "filename": doc_data.filename,
@@ -117,15 +223,13 @@ class Neo4jIngester:
             "gdrive_id": doc_data.gdrive_id or doc_data.doc_id, # Use doc_id if gdrive_id not explicitly set
             "gdrive_webview_link": doc_data.gdrive_webview_link,
             "parsed_timestamp": doc_data.parsed_timestamp.isoformat(),
-            "metadata_str": metadata_str
+            "metadata_str": metadata_str,
+            "metadata_properties": metadata_properties
         }
-        
-        # Add metadata properties to params
-        params.update(metadata_properties)
 
         try:
             with self.driver.session() as session:
-                result = session.run(query, params)
+                result = session.run(_INGEST_DOCUMENT_QUERY, **params)
                 record = result.single()
                 if record:
                     action = "updated" if record["updatedAt"] else "created"
@@ -140,6 +244,198 @@ class Neo4jIngester:
             logger.error(f"Failed to ingest document with doc_id '{doc_data.doc_id}' into Neo4j: {e}")
             raise
 
+    def ingest_documents(
+        self,
+        documents: List[DocumentIngestionData],
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE
+    ) -> int:
+        """Ingests several documents as :Document nodes with one `UNWIND ... MERGE` per batch.
+
+        Writes the same properties as `ingest_document`: `source_type` and `gdrive_id`
+        are only set when a node is created, everything else is refreshed on every write.
+
+        Args:
+            documents: The documents to ingest.
+            batch_size: Maximum number of documents per transaction.
+
+        Returns:
+            The number of documents written.
+        """
+        if not documents:
+            return 0
+
+        rows = []
+        for doc_data in documents:
+            metadata_properties, metadata_str = self._document_metadata_properties(doc_data)
+            rows.append({
+                "doc_id": doc_data.doc_id,
+                "parsed_timestamp": doc_data.parsed_timestamp.isoformat(),
+                "create_props": {
+                    "source_type": doc_data.source_type,
+                    "gdrive_id": doc_data.gdrive_id or doc_data.doc_id,
+                },
+                "props": {
+                    "filename": doc_data.filename,
+                    "content": doc_data.content,
+                    "embedding": doc_data.embedding,
+                    "mime_type": doc_data.mime_type,
+                    "gdrive_webview_link": doc_data.gdrive_webview_link,
+                    "metadata_str": metadata_str,
+                    **metadata_properties,
+                },
+            })
+
+        jobs = [(_INGEST_DOCUMENTS_QUERY, rows[start:start + batch_size]) for start in range(0, len(rows), batch_size)]
+        try:
+            written = self._run_batches(jobs)
+        except Exception as e:
+            logger.error(f"Failed to ingest {len(rows)} documents into Neo4j: {e}")
+            raise
+
+        logger.info(f"Ingested {written} :Document nodes into Neo4j.")
+        return written
+
+    def ensure_node_key_index(self, label: str = DEFAULT_NODE_LABEL) -> None:
+        """Ensures a range index on `uuid` exists for the given label so UNWIND MERGEs stay index-backed.
+
+        Only issued once per label for the lifetime of the ingester.
+
+        Args:
+            label: The node label to index.
+        """
+        if label in self._indexed_labels:
+            return
+        index_name = f"{label.lower()}_uuid_index"
+        query = f"CREATE INDEX {_quote_identifier(index_name)} IF NOT EXISTS FOR (n:{_quote_identifier(label)}) ON (n.uuid)"
+        with self.driver.session() as session:
+            session.run(query)
+        self._indexed_labels.add(label)
+        logger.debug(f"Ensured uuid index for :{label} nodes.")
+
+    def _write_batch(self, query: str, rows: List[Dict[str, Any]]) -> int:
+        """Writes one UNWIND batch in its own session (sessions are not thread-safe, the driver is)."""
+        with self.driver.session() as session:
+            session.run(query, rows=rows)
+        return len(rows)
+
+    def _run_batches(self, jobs: List[Tuple[str, List[Dict[str, Any]]]], executor: Optional[Executor] = None) -> int:
+        """Runs (query, rows) jobs sequentially on one session, or concurrently on the given executor.
+
+        Args:
+            jobs: The queries and their row batches.
+            executor: Optional pool. Batches must be independent of each other to be run this way.
+
+        Returns:
+            The total number of rows written.
+        """
+        if executor is None or len(jobs) < 2:
+            written = 0
+            with self.driver.session() as session:
+                for query, rows in jobs:
+                    session.run(query, rows=rows)
+                    written += len(rows)
+            return written
+
+        futures = [executor.submit(self._write_batch, query, rows) for query, rows in jobs]
+        # result() re-raises the first failure after all batches have been submitted.
+        return sum(future.result() for future in futures)
+
+    def bulk_upsert_nodes(
+        self,
+        rows: List[Dict[str, Any]],
+        base_label: str = DEFAULT_NODE_LABEL,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE,
+        executor: Optional[Executor] = None
+    ) -> int:
+        """Upserts graph nodes with one `UNWIND ... MERGE` per batch instead of one query per node.
+
+        Labels cannot be parameterized in Cypher, so rows are grouped by their extra labels
+        and each group is written with its own query. Rows sharing a uuid are merged first
+        (see `merge_node_rows`), so every uuid is written by exactly one batch.
+
+        Args:
+            rows: Rows as produced by `graph_node_to_row`.
+            base_label: The label nodes are merged under.
+            batch_size: Maximum number of rows per transaction.
+            executor: Optional pool to run batches as concurrent transactions. Safe because,
+                after merging, no two batches MERGE the same uuid.
+
+        Returns:
+            The number of nodes written.
+        """
+        if not rows:
+            return 0
+        self.ensure_node_key_index(base_label)
+        rows = merge_node_rows(rows)
+
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in rows:
+            groups.setdefault(tuple(row.get("labels") or ()), []).append(row)
+
+        jobs = []
+        for extra_labels, group_rows in groups.items():
+            query = (
+                "UNWIND $rows AS row "
+                f"MERGE (n:{_quote_identifier(base_label)} {{uuid: row.uuid}}) "
+                "SET n += row.props"
+            )
+            if extra_labels:
+                query += " SET n:" + ":".join(_quote_identifier(label) for label in extra_labels)
+            jobs.extend((query, group_rows[start:start + batch_size]) for start in range(0, len(group_rows), batch_size))
+
+        try:
+            written = self._run_batches(jobs, executor)
+        except Exception as e:
+            logger.error(f"Failed to bulk upsert nodes into Neo4j: {e}")
+            raise
+
+        logger.info(f"Bulk upserted {written} nodes into Neo4j in {len(groups)} label group(s).")
+        return written
+
+    def bulk_upsert_edges(
+        self,
+        rows: List[Dict[str, Any]],
+        node_label: str = DEFAULT_NODE_LABEL,
+        rel_type: str = DEFAULT_RELATIONSHIP_TYPE,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE
+    ) -> int:
+        """Upserts relationships between existing nodes with one `UNWIND ... MERGE` per batch.
+
+        Batches are always written sequentially: relationship MERGEs lock both endpoints,
+        so concurrent batches sharing a node would deadlock.
+
+        Args:
+            rows: Rows as produced by `graph_edge_to_row`.
+            node_label: The label used to look up the source and target nodes.
+            rel_type: The relationship type to merge.
+            batch_size: Maximum number of rows per transaction.
+
+        Returns:
+            The number of rows written.
+        """
+        if not rows:
+            return 0
+        self.ensure_node_key_index(node_label)
+
+        label = _quote_identifier(node_label)
+        query = (
+            "UNWIND $rows AS row "
+            f"MATCH (s:{label} {{uuid: row.src}}) "
+            f"MATCH (t:{label} {{uuid: row.dst}}) "
+            f"MERGE (s)-[r:{_quote_identifier(rel_type)} {{uuid: row.uuid}}]->(t) "
+            "SET r += row.props"
+        )
+
+        jobs = [(query, rows[start:start + batch_size]) for start in range(0, len(rows), batch_size)]
+        try:
+            written = self._run_batches(jobs)
+        except Exception as e:
+            logger.error(f"Failed to bulk upsert edges into Neo4j: {e}")
+            raise
+
+        logger.info(f"Bulk upserted {written} edges into Neo4j.")
+        return written
+
     def ensure_constraints_and_indices(self) -> None:
         """Ensures necessary constraints and indices for :Document nodes exist."""
         queries = [
@@ -160,6 +456,79 @@ class Neo4jIngester:
             logger.error(f"Failed to ensure Neo4j constraints/indices: {e}")
             # Decide if this should raise or just warn
 
+class BatchingNeo4jIngester:
+    """Buffers node and edge rows across ingestion runs and writes them in bulk.
+
+    Small documents produce only a handful of rows each, so writing them per document
+    pays a transaction commit for very little data. Rows are accumulated until
+    `flush_threshold` is reached and then written with the ingester's UNWIND queries,
+    nodes before edges.
+    """
+
+    def __init__(
+        self,
+        ingester: Neo4jIngester,
+        flush_threshold: int = DEFAULT_FLUSH_THRESHOLD,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Args:
+            ingester: The ingester used to write flushed rows.
+            flush_threshold: Number of buffered node and edge rows that triggers a flush.
+            executor: Optional pool passed through to `bulk_upsert_nodes`.
+        """
+        self.ingester = ingester
+        self.flush_threshold = flush_threshold
+        self.executor = executor
+        self._node_buf: List[Dict[str, Any]] = []
+        self._edge_buf: List[Dict[str, Any]] = []
+        self._owners: List[Any] = []
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered rows not yet written."""
+        return len(self._node_buf) + len(self._edge_buf)
+
+    @property
+    def owners(self) -> List[Any]:
+        """The owners passed to `add` whose rows are still buffered, in insertion order."""
+        return list(self._owners)
+
+    def add(self, node_rows: List[Dict[str, Any]], edge_rows: List[Dict[str, Any]], owner: Any = None) -> bool:
+        """Buffers rows, optionally tagged with the owner they came from (e.g. a document's context).
+
+        Returns True once the buffer has reached the flush threshold.
+        """
+        self._node_buf.extend(node_rows)
+        self._edge_buf.extend(edge_rows)
+        if owner is not None:
+            self._owners.append(owner)
+        return self.pending >= self.flush_threshold
+
+    def flush(self) -> Tuple[int, int]:
+        """Writes all buffered rows. If the write fails, the rows stay buffered and the error is raised.
+
+        Returns:
+            The number of node and edge rows written.
+        """
+        # Swap the buffers first so rows added while writing go into the next flush.
+        node_rows, self._node_buf = self._node_buf, []
+        edge_rows, self._edge_buf = self._edge_buf, []
+        owners, self._owners = self._owners, []
+        try:
+            # Nodes must land before edges, since edges MATCH on their endpoints.
+            nodes_written = self.ingester.bulk_upsert_nodes(node_rows, executor=self.executor)
+            edges_written = self.ingester.bulk_upsert_edges(edge_rows)
+        except Exception:
+            # Put the rows back ahead of anything added meanwhile, so the next flush
+            # retries them. Re-writing nodes that did land is harmless, since they are MERGEd.
+            self._node_buf[:0] = node_rows
+            self._edge_buf[:0] = edge_rows
+            self._owners[:0] = owners
+            raise
+        return nodes_written, edges_written
+
+
 # Example Usage (for testing purposes)
 if __name__ == '__main__':
     # This example requires a running Neo4j instance and credentials in .env
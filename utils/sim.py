@@ -0,0 +1,186 @@
+"""
+Similarity kernels for embedding vectors.
+
+Uses Numba-compiled kernels when Numba is installed (`pip install kev-graph-rag[perf]`)
+and falls back to NumPy otherwise. All functions expect inputs whose rows are already
+L2-normalized, so cosine similarity reduces to a dot product. Vectors can also be stored
+as int8 with a per-vector scale, which cuts memory and scan bandwidth by 4x.
+"""
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    # cache=True persists the compiled kernel next to this module, so only the very
+    # first process pays the compilation cost.
+    @njit(fastmath=True, parallel=True, cache=True)
+    def _dot_rows(matrix, query):
+        n_rows, dim = matrix.shape
+        scores = np.empty(n_rows, dtype=np.float32)
+        for i in prange(n_rows):
+            acc = np.float32(0.0)
+            for j in range(dim):
+                acc += matrix[i, j] * query[j]
+            scores[i] = acc
+        return scores
+
+    @njit(fastmath=True, parallel=True, cache=True)
+    def _int8_dot_rows(matrix, query):
+        n_rows, dim = matrix.shape
+        dots = np.empty(n_rows, dtype=np.int32)
+        for i in prange(n_rows):
+            acc = np.int32(0)
+            for j in range(dim):
+                acc += np.int32(matrix[i, j]) * np.int32(query[j])
+            dots[i] = acc
+        return dots
+
+    # Separate 1-D and 2-D kernels keep each signature monomorphic for Numba.
+    @njit(fastmath=True, cache=True)
+    def _normalize_1d(vector):
+        acc = np.float32(0.0)
+        for j in range(vector.shape[0]):
+            acc += vector[j] * vector[j]
+        out = np.zeros_like(vector)
+        if acc > 0.0:
+            inv_norm = np.float32(1.0) / np.sqrt(acc)
+            for j in range(vector.shape[0]):
+                out[j] = vector[j] * inv_norm
+        return out
+
+    @njit(fastmath=True, parallel=True, cache=True)
+    def _normalize_2d(matrix):
+        n_rows, dim = matrix.shape
+        out = np.zeros_like(matrix)
+        for i in prange(n_rows):
+            acc = np.float32(0.0)
+            for j in range(dim):
+                acc += matrix[i, j] * matrix[i, j]
+            if acc > 0.0:
+                inv_norm = np.float32(1.0) / np.sqrt(acc)
+                for j in range(dim):
+                    out[i, j] = matrix[i, j] * inv_norm
+        return out
+else:
+    def _dot_rows(matrix, query):
+        return matrix @ query
+
+    def _int8_dot_rows(matrix, query):
+        # Widen so the accumulation cannot overflow int8
+        return matrix @ query.astype(np.int32)
+
+    def _normalize_1d(vector):
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0.0 else np.zeros_like(vector)
+
+    def _normalize_2d(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0.0)
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalizes a vector or each row of a matrix.
+
+    Args:
+        vectors: (D,) or (N, D) float array.
+
+    Returns:
+        float32 array of the same shape; zero vectors stay zero.
+    """
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        return _normalize_1d(vectors)
+    if vectors.ndim == 2:
+        return _normalize_2d(vectors)
+    raise ValueError(f"Expected a 1-D or 2-D array, got {vectors.ndim} dimensions")
+
+
+def cosine_scores(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """
+    Cosine similarity between each row of `matrix` and `query`.
+
+    Args:
+        matrix: (N, D) float32 array of L2-normalized vectors.
+        query: (D,) float32 L2-normalized vector.
+
+    Returns:
+        (N,) float32 array of similarities.
+    """
+    if matrix.shape[0] == 0:
+        return np.empty(0, dtype=np.float32)
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    query = np.ascontiguousarray(query, dtype=np.float32)
+    return _dot_rows(matrix, query)
+
+
+def cosine_topk(matrix: np.ndarray, query: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The `k` rows of `matrix` most similar to `query`.
+
+    Args:
+        matrix: (N, D) float32 array of L2-normalized vectors.
+        query: (D,) float32 L2-normalized vector.
+        k: Number of results to return (clamped to N).
+
+    Returns:
+        Tuple of (row indices, similarities), both ordered from most to least similar.
+    """
+    scores = cosine_scores(matrix, query)
+    k = min(k, scores.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+    top = np.argpartition(-scores, k - 1)[:k]
+    order = top[np.argsort(-scores[top])]
+    return order, scores[order]
+
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-vector int8 quantization.
+
+    Args:
+        vectors: (D,) or (N, D) float array.
+
+    Returns:
+        Tuple of (int8 array with the same shape as `vectors`, float32 scales of shape () or (N,)),
+        such that `vectors ~= quantized * scales[..., None]`.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    scales = np.abs(vectors).max(axis=-1, keepdims=True) / 127.0
+    scales = np.where(scales == 0.0, 1.0, scales).astype(np.float32)
+    quantized = np.rint(vectors / scales).astype(np.int8)
+    return quantized, scales.squeeze(-1)
+
+
+def int8_cosine_scores(
+    matrix: np.ndarray,
+    scales: np.ndarray,
+    query: np.ndarray,
+    query_scale: float
+) -> np.ndarray:
+    """
+    Approximate cosine similarity between int8-quantized rows and an int8-quantized query.
+
+    Args:
+        matrix: (N, D) int8 array produced by `quantize_int8`.
+        scales: (N,) float32 per-row scales.
+        query: (D,) int8 query produced by `quantize_int8`.
+        query_scale: Scale of the quantized query.
+
+    Returns:
+        (N,) float32 array of similarities, accurate to roughly 1e-2 for normalized inputs.
+    """
+    if matrix.shape[0] == 0:
+        return np.empty(0, dtype=np.float32)
+    matrix = np.ascontiguousarray(matrix, dtype=np.int8)
+    query = np.ascontiguousarray(query, dtype=np.int8)
+    dots = _int8_dot_rows(matrix, query)
+    return dots.astype(np.float32) * scales * np.float32(query_scale)